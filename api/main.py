@@ -7,26 +7,58 @@ Fully aligned with React Control Panel
 # Imports
 # ============================================================
 
-from fastapi import FastAPI, Header, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from itertools import islice
+from typing import Iterator, List, Optional
 import asyncio
+import heapq
+import json
 import time
 
 # --- Kernel System ---
 from kernel.core.kernel import Kernel
 from kernel.adapters.mock_adapter import MockAgentAdapter
 from kernel.core.message import KernelMessage
-from kernel.core.ledger import add_claim, resolve_entity
+from kernel.core.ledger import add_claim, add_claims_bulk, resolve_entities, resolve_entity
 from kernel.core.trust import (
+    decay_all_agents,
     get_trust,
     get_all_trust,
-    decay_all_agents,
-    reward_agent,
 )
 from kernel.core.error_review import record_error_review
-from kernel.core.memory_db import get_connection
+from kernel.core.event_rollups import (
+    EVENT_RETENTION_DAYS,
+    PRUNE_BATCH_SIZE,
+    RETENTION_INTERVAL_SECONDS,
+    get_rollups,
+    prune_events,
+)
+from kernel.core.trust_cache import TRUST_CACHE
+from kernel.core.trust_leaderboard import get_trust_leaderboard, get_trust_summary
+from kernel.core.trust_timeline import TIMELINE_MAX_POINTS, get_trust_grid, get_trust_timeline
+from kernel.core.resolution_cache import RESOLUTION_CACHE
+from kernel.core.writer import WRITER, entity_writer, run_on_shard, shard_writer, stop_writers, writer_stats
+from kernel.core.archive import ArchiveJob
+from kernel.core.dirty_entities import get_clean_resolution
+from kernel.core.export import EXPORT_PAGE_SIZE, iter_claims, iter_resolutions, iter_trust_events
+from kernel.core.route_summary import (
+    LOW_CONFIDENCE_THRESHOLD,
+    get_route_summary,
+    route_entity,
+)
+from kernel.core.sweeper import SWEEP_INTERVAL_SECONDS, ResolutionSweeper
+from kernel.core.outbox import OUTBOX_RETRY_SECONDS, drain_outboxes, on_shard_commit, outbox_stats
+from kernel.core.memory_db import (
+    close_connections,
+    connection,
+    fan_out,
+    init_db,
+    shard_of,
+)
 
 # ============================================================
 # Kernel Singleton
@@ -60,7 +92,12 @@ app.add_middleware(
 INTENT_READ = "READ"
 INTENT_WRITE = "WRITE"
 
-trust_decay_lock = asyncio.Lock()
+
+# Hot/cold claim archival (batches go through each shard's writer)
+archive_job = ArchiveJob(runner=run_on_shard)
+
+# Background re-resolution of dirty entities (resolves go through each shard's writer)
+sweeper = ResolutionSweeper(runner=run_on_shard)
 
 # ============================================================
 # Models
@@ -69,6 +106,27 @@ trust_decay_lock = asyncio.Lock()
 class KernelRouteRequest(BaseModel):
     adapter_id: str
     content: str
+    # replies of one conversation share an entity; otherwise one per request
+    conversation_id: Optional[str] = None
+
+
+class ClaimBatchRequest(BaseModel):
+    # validated per item by the ledger (one bad item ≠ failed batch)
+    claims: List[dict]
+    # one claim per (agent, entity) (None = the ledger's CRE_CLAIM_UPSERT default)
+    upsert: Optional[bool] = None
+
+
+class ResolveBatchRequest(BaseModel):
+    entities: List[str]
+
+
+class TrustTimelineBatchRequest(BaseModel):
+    agents: List[str]
+    bucket_seconds: float
+    # None = the agents' whole history
+    start: Optional[float] = Field(None, alias="from")
+    end: Optional[float] = Field(None, alias="to")
 
 
 # ============================================================
@@ -83,50 +141,127 @@ def require_intent(expected: str, intent: Optional[str]):
         )
 
 # ============================================================
-# Startup (ensure tables exist)
+# Shard Routing (one writer per ledger shard)
+# ============================================================
+
+def _group_by_shard(items: list, entity_of) -> dict:
+    """
+    {shard: [item index, ...]} in item order.
+    """
+    groups: dict = {}
+    for i, item in enumerate(items):
+        groups.setdefault(shard_of(entity_of(item)), []).append(i)
+    return groups
+
+
+async def _resolve_on_writers(entities: List[str]) -> dict:
+    """
+    Resolve distinct entities: one vectorized consensus pass + one write
+    batch per shard writer. {entity: result} in input order.
+    """
+    by_shard = _group_by_shard(entities, lambda e: e)
+    parts = await asyncio.gather(*(
+        asyncio.wrap_future(shard_writer(shard).submit(resolve_entities, [entities[i] for i in indices]))
+        for shard, indices in by_shard.items()
+    ))
+
+    merged = {}
+    for part in parts:
+        merged.update(part)
+    return {e: merged[e] for e in entities}
+
+# ============================================================
+# NDJSON Streaming (constant memory, one JSON document per line)
+# ============================================================
+
+NDJSON = "application/x-ndjson"
+
+
+def _ndjson(records: Iterator[dict]) -> Iterator[str]:
+    """
+    Serialize records lazily, a page of lines per chunk.
+    """
+    while True:
+        page = list(islice(records, EXPORT_PAGE_SIZE))
+        if not page:
+            return
+        yield "".join(json.dumps(r) + "\n" for r in page)
+
+
+def _export(make, *args) -> StreamingResponse:
+    # bad cursors fail before the stream starts (a proper 400, not a cut-off body)
+    try:
+        records = make(*args)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(_ndjson(records), media_type=NDJSON)
+
+# ============================================================
+# Startup (migrate schema before the first request)
 # ============================================================
 
 @app.on_event("startup")
 async def startup():
 
-    # Ensure error_reviews table exists
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS error_reviews (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            reviewer_agent TEXT,
-            target_agent TEXT,
-            entity TEXT,
-            observed_value TEXT,
-            expected_value TEXT,
-            error_type TEXT,
-            confidence REAL,
-            evidence TEXT,
-            timestamp REAL
-        )
-    """)
+    init_db()
+
+    asyncio.create_task(trust_flush_loop())
+    asyncio.create_task(outbox_retry_loop())
+
+    if EVENT_RETENTION_DAYS > 0:
+        asyncio.create_task(event_retention_loop())
+
+    if SWEEP_INTERVAL_SECONDS > 0:
+        sweeper.start()
 
-    conn.commit()
-    conn.close()
 
-    asyncio.create_task(trust_decay_loop())
+@app.on_event("shutdown")
+async def shutdown():
+    # Stop sweeping, drain the writers, flush write-behind trust, release connections
+    sweeper.stop()
+    stop_writers()
+    close_connections()
 
 
 # ============================================================
-# Background Trust Decay
+# Background Trust Cache Flush (write-behind)
 # ============================================================
 
-async def trust_decay_loop():
+async def trust_flush_loop():
     while True:
-        await asyncio.sleep(300)
-        async with trust_decay_lock:
-            try:
-                decay_all_agents()
-                print("Trust decay applied")
-            except Exception as e:
-                print("Trust decay error:", e)
+        await asyncio.sleep(TRUST_CACHE.flush_interval)
+        try:
+            await asyncio.to_thread(TRUST_CACHE.flush)
+        except Exception as e:
+            print("Trust flush error:", e)
+
+# ============================================================
+# Global Outbox Retry (sharded: rows left by a crash or a failed apply)
+# ============================================================
+
+async def outbox_retry_loop():
+    while True:
+        try:
+            await asyncio.wrap_future(WRITER.submit(drain_outboxes))
+        except Exception as e:
+            print("Outbox drain error:", e)
+        await asyncio.sleep(OUTBOX_RETRY_SECONDS)
+
+# ============================================================
+# Event Retention (raw trust / penalty events → rollups only)
+# ============================================================
+
+async def event_retention_loop():
+    # each delete batch is one job on the global writer (event writes interleave)
+    def runner(fn, *args):
+        return WRITER.submit(fn, *args).result()
+
+    while True:
+        try:
+            await asyncio.to_thread(prune_events, EVENT_RETENTION_DAYS, PRUNE_BATCH_SIZE, runner)
+        except Exception as e:
+            print("Event retention error:", e)
+        await asyncio.sleep(RETENTION_INTERVAL_SECONDS)
 
 # ============================================================
 # Health
@@ -154,14 +289,156 @@ def kernel_status(x_intent: Optional[str] = Header(None)):
         },
     }
 
+@app.get("/kernel/metrics")
+def kernel_metrics(x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_READ, x_intent)
+
+    return {
+        "ok": True,
+        "data": {
+            "trust_cache": TRUST_CACHE.stats(),
+            "resolution_cache": RESOLUTION_CACHE.stats(),
+            "writer": writer_stats(),
+            "outbox": outbox_stats(),
+            "sweeper": sweeper.stats(),
+        },
+    }
+
+# ============================================================
+# Claim Archival (background job)
+# ============================================================
+
+@app.post("/kernel/archive")
+def start_archive(x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_WRITE, x_intent)
+
+    started = archive_job.start()
+    return {"ok": True, "data": {"started": started, **archive_job.progress()}}
+
+
+@app.get("/kernel/archive")
+def archive_progress(x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_READ, x_intent)
+    return {"ok": True, "data": archive_job.progress()}
+
+# ============================================================
+# Claims (bulk ingestion)
+# ============================================================
+
+@app.post("/claims/batch")
+async def add_claims_batch(
+    request: ClaimBatchRequest,
+    x_intent: Optional[str] = Header(None),
+):
+    require_intent(INTENT_WRITE, x_intent)
+
+    # one job per shard writer (invalid items are rejected by whichever gets them)
+    by_shard = _group_by_shard(
+        request.claims,
+        lambda c: c.get("entity") if isinstance(c, dict) and isinstance(c.get("entity"), str) else "",
+    )
+    parts = await asyncio.gather(*(
+        asyncio.wrap_future(shard_writer(shard).submit(add_claims_bulk, [request.claims[i] for i in indices], request.upsert))
+        for shard, indices in by_shard.items()
+    ))
+
+    results: List[dict] = [{}] * len(request.claims)
+    for indices, part in zip(by_shard.values(), parts):
+        for i, r in zip(indices, part):
+            results[i] = r
+
+    items = [
+        {"index": i, "id": r["id"]} if "id" in r else {"index": i, "error": r["error"]}
+        for i, r in enumerate(results)
+    ]
+    for item, r in zip(items, results):
+        if "submissions" in r:
+            item["submissions"], item["replaces"] = r["submissions"], r["replaces"]
+    failed = sum(1 for item in items if "error" in item)
+
+    return {
+        "ok": True,
+        "data": {
+            "items": items,
+            "inserted": len(items) - failed,
+            "failed": failed,
+        },
+    }
+
 # ============================================================
 # Resolution
 # ============================================================
 
 @app.get("/resolve/{entity}")
-def resolve_entity_api(entity: str, x_intent: Optional[str] = Header(None)):
+async def resolve_entity_api(entity: str, x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_READ, x_intent)
+
+    # clean entity → the sweeper's latest resolution, one indexed read
+    result = await run_in_threadpool(get_clean_resolution, entity)
+
+    if result is None:
+        # dirty / never resolved: resolving persists trust + resolution rows → shard writer
+        result = await asyncio.wrap_future(entity_writer(entity).submit(resolve_entity, entity))
+    return {"ok": True, "data": result}
+
+
+@app.post("/resolve/batch")
+async def resolve_batch_api(
+    request: ResolveBatchRequest,
+    x_intent: Optional[str] = Header(None),
+):
     require_intent(INTENT_READ, x_intent)
-    return {"ok": True, "data": resolve_entity(entity)}
+
+    entities = list(dict.fromkeys(request.entities))
+    return {"ok": True, "data": await _resolve_on_writers(entities)}
+
+
+@app.post("/resolve/stream")
+async def resolve_stream_api(
+    request: ResolveBatchRequest,
+    x_intent: Optional[str] = Header(None),
+):
+    require_intent(INTENT_READ, x_intent)
+
+    # resolved and sent a page of entities at a time; "index" is the
+    # position in the de-duplicated entity list, so a client resumes
+    # by resending the entities after the last index it received
+    entities = list(dict.fromkeys(request.entities))
+
+    async def stream():
+        for start in range(0, len(entities), EXPORT_PAGE_SIZE):
+            page = entities[start:start + EXPORT_PAGE_SIZE]
+            resolved = await _resolve_on_writers(page)
+            yield "".join(
+                json.dumps({"index": start + i, **resolved[e]}) + "\n"
+                for i, e in enumerate(page)
+            )
+
+    return StreamingResponse(stream(), media_type=NDJSON)
+
+# ============================================================
+# Export (NDJSON, resumable: pass the last record's cursor back)
+# ============================================================
+
+@app.get("/export/claims")
+def export_claims(prefix: Optional[str] = None, cursor: Optional[str] = None,
+                  x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_READ, x_intent)
+    return _export(iter_claims, prefix, cursor)
+
+
+@app.get("/export/resolutions")
+def export_resolutions(prefix: Optional[str] = None, cursor: Optional[str] = None,
+                       x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_READ, x_intent)
+    return _export(iter_resolutions, prefix, cursor)
+
+
+@app.get("/export/trust-events")
+def export_trust_events(agent: Optional[str] = None, cursor: Optional[str] = None,
+                        x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_READ, x_intent)
+    return _export(iter_trust_events, agent, cursor)
 
 # ============================================================
 # Trust
@@ -170,19 +447,48 @@ def resolve_entity_api(entity: str, x_intent: Optional[str] = Header(None)):
 @app.get("/trust")
 def read_all_trust(x_intent: Optional[str] = Header(None)):
     require_intent(INTENT_READ, x_intent)
+    # every agent in one map – dashboards use /trust/leaderboard + /trust/summary
     return {"ok": True, "data": get_all_trust()}
 
 
-@app.get("/trust/{agent}")
-def read_agent_trust(agent: str, x_intent: Optional[str] = Header(None)):
+@app.get("/trust/leaderboard")
+def trust_leaderboard(
+    limit: int = 50,
+    order: str = "desc",
+    min_trust: Optional[float] = None,
+    max_trust: Optional[float] = None,
+    cursor: Optional[str] = None,
+    x_intent: Optional[str] = Header(None),
+):
     require_intent(INTENT_READ, x_intent)
-    return {
-        "ok": True,
-        "data": {
-            "agent": agent,
-            "trust": get_trust(agent),
-        },
-    }
+
+    # top-N (desc) / bottom-N (asc), keyset-paged off idx_trust_trust
+    try:
+        page = get_trust_leaderboard(limit, order, min_trust, max_trust, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"ok": True, "data": page}
+
+
+@app.get("/trust/summary")
+def trust_summary(buckets: int = 20, x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_READ, x_intent)
+
+    # count, avg / min / max and histogram: index range counts, no flush
+    try:
+        summary = get_trust_summary(buckets)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"ok": True, "data": summary}
+
+
+@app.post("/trust/compact")
+async def compact_trust(x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_WRITE, x_intent)
+
+    # reads decay lazily; this only folds the decay into the stored rows
+    rows = await asyncio.wrap_future(WRITER.submit(decay_all_agents))
+    return {"ok": True, "data": {"compacted": rows}}
 
 # ============================================================
 # Trust Events (frontend paged)
@@ -194,24 +500,23 @@ def trust_events(limit: int = 50, offset: int = 0,
 
     require_intent(INTENT_READ, x_intent)
 
-    conn = get_connection()
-    cur = conn.cursor()
+    with connection() as conn:
+        cur = conn.cursor()
 
-    cur.execute("SELECT COUNT(*) AS total FROM trust_events")
-    total = cur.fetchone()["total"]
+        cur.execute("SELECT COUNT(*) AS total FROM trust_events")
+        total = cur.fetchone()["total"]
 
-    cur.execute(
-        """
-        SELECT agent, change, reason, timestamp
-        FROM trust_events
-        ORDER BY timestamp DESC
-        LIMIT ? OFFSET ?
-        """,
-        (limit, offset),
-    )
+        cur.execute(
+            """
+            SELECT agent, change, reason, timestamp, trust_after
+            FROM trust_events
+            ORDER BY timestamp DESC
+            LIMIT ? OFFSET ?
+            """,
+            (limit, offset),
+        )
 
-    rows = cur.fetchall()
-    conn.close()
+        rows = cur.fetchall()
 
     return {
         "ok": True,
@@ -228,47 +533,124 @@ def trust_events(limit: int = 50, offset: int = 0,
 # ============================================================
 
 @app.get("/trust/timeline")
-def trust_timeline(agent: str, x_intent: Optional[str] = Header(None)):
+def trust_timeline(
+    agent: str,
+    start: Optional[float] = Query(None, alias="from"),
+    end: Optional[float] = Query(None, alias="to"),
+    max_points: int = Query(TIMELINE_MAX_POINTS, ge=0),
+    x_intent: Optional[str] = Header(None),
+):
+    require_intent(INTENT_READ, x_intent)
+
+    # stored trust_after + checkpoints, min/max downsampled (max_points=0: every event)
+    try:
+        timeline = get_trust_timeline(agent, start, end, max_points)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"ok": True, "data": timeline}
+
 
+@app.post("/trust/timeline/batch")
+def trust_timeline_batch(req: TrustTimelineBatchRequest, x_intent: Optional[str] = Header(None)):
     require_intent(INTENT_READ, x_intent)
 
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT change, timestamp
-        FROM trust_events
-        WHERE agent = ?
-        ORDER BY timestamp ASC
-        """,
-        (agent,),
-    )
+    # every agent on one bucket grid, columnar (one request per multi-agent plot)
+    try:
+        grid = get_trust_grid(req.agents, req.bucket_seconds, req.start, req.end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"ok": True, "data": grid}
 
-    rows = cur.fetchall()
-    conn.close()
+# ============================================================
+# Event Rollups (dashboards: hourly / daily, never the raw events)
+# ============================================================
 
-    current = get_trust(agent)
+def _rollups(source: str, grain: str, agent: Optional[str], start: Optional[float], end: Optional[float]):
+    try:
+        return get_rollups(source, grain, agent, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    for r in reversed(rows):
-        current -= r["change"]
 
-    timeline = []
-    for r in rows:
-        current += r["change"]
-        timeline.append({
-            "timestamp": r["timestamp"],
-            "trust": round(current, 4),
-        })
+@app.get("/trust/rollups")
+def trust_rollups(
+    grain: str = "daily",
+    agent: Optional[str] = None,
+    start: Optional[float] = Query(None, alias="from"),
+    end: Optional[float] = Query(None, alias="to"),
+    x_intent: Optional[str] = Header(None),
+):
+    require_intent(INTENT_READ, x_intent)
+    return {"ok": True, "data": _rollups("trust_events", grain, agent, start, end)}
 
-    return {"ok": True, "data": timeline}
+
+@app.get("/audit/penalty-rollups")
+def penalty_rollups(
+    grain: str = "daily",
+    agent: Optional[str] = None,
+    start: Optional[float] = Query(None, alias="from"),
+    end: Optional[float] = Query(None, alias="to"),
+    x_intent: Optional[str] = Header(None),
+):
+    require_intent(INTENT_READ, x_intent)
+    return {"ok": True, "data": _rollups("error_penalty_events", grain, agent, start, end)}
+
+# ============================================================
+# Agent Trust (after every fixed /trust/... path it would shadow)
+# ============================================================
+
+@app.get("/trust/{agent}")
+def read_agent_trust(agent: str, x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_READ, x_intent)
+    return {
+        "ok": True,
+        "data": {
+            "agent": agent,
+            "trust": get_trust(agent),
+        },
+    }
 
 # ============================================================
 # Kernel Route (NO MORE 422)
 # ============================================================
 
+def _record_route(agent: str, entity: str, content: str, confidence: float) -> None:
+    """
+    All writes of one routed reply (runs as ONE writer job).
+    """
+
+    # auto claim (per request / conversation – never one shared hot entity)
+    claim = add_claim(
+        agent=agent,
+        entity=entity,
+        value=content,
+        confidence=confidence,
+        identity_id="system",
+        signature_verified=True,
+    )
+
+    # global store: queued with the claim (and review) on its shard
+    on_shard_commit(
+        "route_credit",
+        {"agent": agent, "entity": entity, "confidence": confidence, "timestamp": claim["timestamp"]},
+    )
+
+    if confidence < LOW_CONFIDENCE_THRESHOLD:
+        record_error_review(
+            reviewer_agent="system",
+            target_agent=agent,
+            entity=entity,
+            observed_value=content,
+            expected_value="high_confidence_response",
+            error_type="LOW_CONFIDENCE",
+            confidence=confidence,
+            evidence="auto-generated by kernel route",
+            timestamp=time.time(),
+        )
+
+
 @app.post("/kernel/route")
-def kernel_route(
+async def kernel_route(
     request: KernelRouteRequest,
     x_intent: Optional[str] = Header(None),
 ):
@@ -282,38 +664,33 @@ def kernel_route(
         confidence=0.9,
     )
 
-    routed = kernel_instance.route(request.adapter_id, msg.to_dict())
+    # adapters may block (LLM / subprocess) → keep them off the event loop
+    routed = await run_in_threadpool(
+        kernel_instance.route, request.adapter_id, msg.to_dict()
+    )
 
     returned_agent = routed.get("agent") or request.adapter_id
     adapter_content = routed.get("reply") or routed.get("content") or ""
     adapter_confidence = float(routed.get("confidence", 0.0) or 0.0)
-
-    # auto claim
-    add_claim(
-        agent=returned_agent,
-        entity="adapter_response",
-        value=str(adapter_content),
-        confidence=adapter_confidence,
-        identity_id="system",
-        signature_verified=True,
+    entity = route_entity(request.conversation_id)
+
+    await asyncio.wrap_future(
+        entity_writer(entity).submit(
+            _record_route,
+            returned_agent,
+            entity,
+            str(adapter_content),
+            adapter_confidence,
+        )
     )
 
-    reward_agent(returned_agent, adapter_confidence, reason="adapter_route_claim")
+    return {"ok": True, "data": {**routed, "entity": entity}}
 
-    if adapter_confidence < 0.5:
-        record_error_review(
-            reviewer_agent="system",
-            target_agent=returned_agent,
-            entity="adapter_response",
-            observed_value=str(adapter_content),
-            expected_value="high_confidence_response",
-            error_type="LOW_CONFIDENCE",
-            confidence=adapter_confidence,
-            evidence="auto-generated by kernel route",
-            timestamp=time.time(),
-        )
 
-    return {"ok": True, "data": routed}
+@app.get("/kernel/route/summary")
+def route_summary(adapter: Optional[str] = None, x_intent: Optional[str] = Header(None)):
+    require_intent(INTENT_READ, x_intent)
+    return {"ok": True, "data": get_route_summary(adapter)}
 
 # ============================================================
 # Adapters
@@ -348,24 +725,25 @@ def audit_error_reviews(limit: int = 50, offset: int = 0,
 
     require_intent(INTENT_READ, x_intent)
 
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute("SELECT COUNT(*) AS total FROM error_reviews")
-    total = cur.fetchone()["total"]
-
-    cur.execute(
-        """
-        SELECT *
-        FROM error_reviews
-        ORDER BY timestamp DESC
-        LIMIT ? OFFSET ?
-        """,
-        (limit, offset),
-    )
-
-    rows = cur.fetchall()
-    conn.close()
+    # reviews live in the entity shards: each returns its first
+    # offset + limit rows, merged newest first
+    def page(conn):
+        total = conn.execute("SELECT COUNT(*) AS total FROM error_reviews").fetchone()["total"]
+        rows = conn.execute(
+            """
+            SELECT *
+            FROM error_reviews
+            ORDER BY timestamp DESC
+            LIMIT ?
+            """,
+            (offset + limit,),
+        ).fetchall()
+        return total, rows
+
+    pages = fan_out(page)
+    total = sum(t for t, _ in pages)
+    merged = heapq.merge(*(rows for _, rows in pages), key=lambda r: r["timestamp"], reverse=True)
+    rows = list(merged)[offset:offset + limit]
 
     return {
         "ok": True,
@@ -0,0 +1,69 @@
+"""
+Benchmark – bulk claim ingestion throughput
+
+Claims/sec for add_claims_bulk at batch sizes 1, 10, 100, 1000,
+against the add_claim loop as the baseline.
+
+Usage:
+    python -m benchmarks.bench_bulk_claims [total_claims]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.ledger import add_claim, add_claims_bulk
+
+BATCH_SIZES = (1, 10, 100, 1000)
+
+
+def _claims(n: int):
+    return [
+        {
+            "agent": f"agent-{i % 64}",
+            "entity": f"entity-{i % 500}",
+            "value": f"value-{i % 3}",
+            "confidence": 0.8,
+        }
+        for i in range(n)
+    ]
+
+
+def _fresh_db(tmp: str, name: str) -> None:
+    memory_db.close_connections()
+    memory_db.DB_PATH = Path(tmp) / f"{name}.db"
+    memory_db.init_db()
+
+
+def main(total: int = 10000) -> None:
+    claims = _claims(total)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+
+        _fresh_db(tmp, "loop")
+        start = time.perf_counter()
+        for c in claims:
+            add_claim(c["agent"], c["entity"], c["value"], c["confidence"])
+        baseline = total / (time.perf_counter() - start)
+
+        rates = {}
+        for size in BATCH_SIZES:
+            _fresh_db(tmp, f"bulk-{size}")
+            start = time.perf_counter()
+            for i in range(0, total, size):
+                add_claims_bulk(claims[i:i + size])
+            rates[size] = total / (time.perf_counter() - start)
+
+        memory_db.close_connections()
+
+    print(f"add_claim loop: {baseline:>10.0f} claims/s")
+    print(f"{'batch size':>10}{'claims/s':>12}{'vs loop':>10}")
+    for size, rate in rates.items():
+        print(f"{size:>10}{rate:>12.0f}{rate / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,77 @@
+"""
+Benchmark – append vs upsert claims under repeated submissions
+
+N submissions by a fixed set of agents over a fixed set of entities
+(every agent re-submits its claim on every entity many times), stored
+two ways:
+- "append": every submission is a new claims row (default mode)
+- "upsert": one row per (agent, entity), latest value + submission count
+
+Reports ingest time, hot claim rows, database size and the time of one
+resolve_entities() pass over every entity (consensus + trust learning).
+
+Usage:
+    python -m benchmarks.bench_claim_upsert [submissions]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.ledger import add_claims_bulk, resolve_entities
+from kernel.core.memory_db import connection
+
+AGENTS = 100
+ENTITIES = 1000
+CHUNK = 10_000
+
+
+def _run(n: int, upsert: bool) -> tuple:
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+        memory_db.configure(Path(tmp) / "bench.db")
+        rng = random.Random(3)
+
+        start = time.perf_counter()
+        for first in range(0, n, CHUNK):
+            add_claims_bulk(
+                (
+                    {
+                        "agent": f"agent-{rng.randrange(AGENTS)}",
+                        "entity": f"entity-{rng.randrange(ENTITIES)}",
+                        "value": rng.choice(("a", "a", "b", "c")),
+                        "confidence": rng.random(),
+                    }
+                    for _ in range(first, min(n, first + CHUNK))
+                ),
+                upsert=upsert,
+            )
+        ingest = time.perf_counter() - start
+
+        start = time.perf_counter()
+        resolve_entities([f"entity-{i}" for i in range(ENTITIES)])
+        resolve = time.perf_counter() - start
+
+        with connection() as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM claims").fetchone()[0]
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size = (Path(tmp) / "bench.db").stat().st_size
+        memory_db.close_connections()
+
+    return ingest, rows, size / 1e6, resolve
+
+
+def main(n: int = 500_000) -> None:
+    results = {"append": _run(n, False), "upsert": _run(n, True)}
+
+    print(f"submissions: {n}, agents: {AGENTS}, entities: {ENTITIES}")
+    print(f"{'mode':>8}{'ingest s':>10}{'claims/s':>10}{'rows':>10}{'db MB':>8}{'resolve s':>11}")
+    for name, (ingest, rows, size, resolve) in results.items():
+        print(f"{name:>8}{ingest:>10.1f}{n / ingest:>10.0f}{rows:>10}{size:>8.1f}{resolve:>11.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
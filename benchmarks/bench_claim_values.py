@@ -0,0 +1,134 @@
+"""
+Benchmark – content-hashed claim values vs full-text values
+
+N claims whose values are LLM-sized replies (~2 KB) drawn from a small
+pool of distinct answers, spread over many entities:
+- "before": claims.value TEXT on every row (pre-v0.26 layout)
+- "after":  claims.value_hash + deduplicated claim_values (real kernel)
+
+Reports the database size and the GROUP BY (entity, value) scan that
+consensus / rebuilds run over the claim rows.
+
+Usage:
+    python -m benchmarks.bench_claim_values [claims]
+"""
+
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.ledger import add_claims_bulk
+from kernel.core.memory_db import connection
+
+DISTINCT_VALUES = 200
+VALUE_WORDS = 350
+CHUNK = 10_000
+
+_WORDS = (
+    "the service connects to the primary database on port host replica "
+    "latency timeout retry configuration cluster region failover cache "
+    "request response token budget agent kernel consensus trust value"
+).split()
+
+
+def _replies(rng: random.Random):
+    return [
+        f"Answer {i}: " + " ".join(rng.choice(_WORDS) for _ in range(VALUE_WORDS))
+        for i in range(DISTINCT_VALUES)
+    ]
+
+
+def _claims(n: int, replies, rng: random.Random):
+    return [
+        {
+            "agent": f"agent-{i % 64}",
+            "entity": f"entity-{i % 1000}",
+            "value": rng.choice(replies),
+            "confidence": 0.8,
+        }
+        for i in range(n)
+    ]
+
+
+def _size_mb(conn: sqlite3.Connection) -> float:
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    pages = conn.execute("PRAGMA page_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return pages * page_size / 1e6
+
+
+def _group_ms(conn: sqlite3.Connection, column: str, repeat: int = 3) -> float:
+    sql = f"SELECT entity, {column}, SUM(confidence * trust), COUNT(*) FROM claims GROUP BY entity, {column}"
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _before(path: Path, claims) -> tuple:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+    CREATE TABLE claims (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        agent TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        value TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        trust REAL NOT NULL,
+        timestamp REAL NOT NULL
+    )
+    """)
+    conn.execute("CREATE INDEX idx_claims_entity ON claims(entity)")
+    with conn:
+        conn.executemany(
+            "INSERT INTO claims (agent, entity, value, confidence, trust, timestamp) "
+            "VALUES (?, ?, ?, ?, 0.5, ?)",
+            ((c["agent"], c["entity"], c["value"], c["confidence"], time.time()) for c in claims),
+        )
+    result = (_size_mb(conn), _group_ms(conn, "value"))
+    conn.close()
+    return result
+
+
+def _after(path: Path, claims) -> tuple:
+    memory_db.configure(path)
+    for i in range(0, len(claims), CHUNK):
+        add_claims_bulk(claims[i:i + CHUNK])
+
+    with connection() as conn:
+        result = (_size_mb(conn), _group_ms(conn, "value_hash"))
+    memory_db.close_connections()
+    return result
+
+
+def main(n: int = 100_000) -> None:
+    rng = random.Random(7)
+    claims = _claims(n, _replies(rng), rng)
+    avg = sum(len(c["value"]) for c in claims) / n
+
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+        results = {
+            "before": _before(Path(tmp) / "before.db", claims),
+            "after": _after(Path(tmp) / "after.db", claims),
+        }
+
+    print(f"claims: {n}, distinct values: {DISTINCT_VALUES}, avg value: {avg:.0f} B")
+    print(f"{'layout':>8}{'db MB':>10}{'group by ms':>14}")
+    for layout, (size, group) in results.items():
+        print(f"{layout:>8}{size:>10.1f}{group:>14.1f}")
+
+    (size_before, group_before), (size_after, group_after) = results.values()
+    print(f"storage: {size_before / size_after:.1f}x smaller, "
+          f"group by: {group_before / group_after:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
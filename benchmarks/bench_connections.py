@@ -0,0 +1,138 @@
+"""
+Benchmark – pooled SQLite connections vs connect-per-statement
+
+Measures ops/sec for:
+- ledger.add_claim
+- trust.reward_agent
+
+"before" replays the pre-pool access pattern (sqlite3.connect + commit +
+close for every statement, default rollback journal, synchronous=FULL).
+"after" runs the real kernel code on the pooled WAL connection.
+
+Usage:
+    python -m benchmarks.bench_connections [ops]
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.claim_values import value_hash
+from kernel.core.ledger import add_claim
+from kernel.core.trust import BASE_REWARD, DEFAULT_TRUST, TRUST_CEILING, reward_agent
+
+
+# -------------------------------------------------
+# Legacy access pattern (v0.15 memory layer)
+# -------------------------------------------------
+
+def _legacy_connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _legacy_get_trust(path: Path, agent: str) -> float:
+    conn = _legacy_connect(path)
+    row = conn.execute("SELECT trust FROM trust WHERE agent = ?", (agent,)).fetchone()
+    conn.close()
+    return float(row["trust"]) if row else DEFAULT_TRUST
+
+
+def _legacy_add_claim(path: Path, agent: str, entity: str, value: str, confidence: float) -> None:
+    trust = _legacy_get_trust(path, agent)
+    conn = _legacy_connect(path)
+    conn.execute(
+        """
+        INSERT INTO claims (agent, entity, value_hash, confidence, trust, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (agent, entity, value_hash(value), confidence, trust, time.time()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _legacy_reward_agent(path: Path, agent: str, confidence: float) -> None:
+    old = _legacy_get_trust(path, agent)
+    new = round(min(old + BASE_REWARD * confidence, TRUST_CEILING), 4)
+
+    conn = _legacy_connect(path)
+    conn.execute(
+        """
+        INSERT INTO trust (agent, trust, last_updated)
+        VALUES (?, ?, strftime('%s','now'))
+        ON CONFLICT(agent) DO UPDATE SET
+            trust = excluded.trust, last_updated = excluded.last_updated
+        """,
+        (agent, new),
+    )
+    conn.commit()
+    conn.close()
+
+    conn = _legacy_connect(path)
+    conn.execute(
+        """
+        INSERT INTO trust_events (agent, change, reason, confidence, timestamp)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (agent, round(new - old, 4), "reward", confidence, time.time()),
+    )
+    conn.commit()
+    conn.close()
+
+
+# -------------------------------------------------
+# Runner
+# -------------------------------------------------
+
+def _ops_per_sec(fn, ops: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        fn(i)
+    return ops / (time.perf_counter() - start)
+
+
+def main(ops: int = 2000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy.db"
+        pooled_path = Path(tmp) / "pooled.db"
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+
+        # Same schema for both runs
+        for path in (legacy_path, pooled_path):
+            memory_db.close_connections()
+            memory_db.DB_PATH = path
+            memory_db.init_db()
+
+        # The legacy file must use the legacy journal mode
+        memory_db.close_connections()
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+
+        memory_db.DB_PATH = pooled_path
+
+        results = {
+            "add_claim": (
+                _ops_per_sec(lambda i: _legacy_add_claim(legacy_path, f"a{i % 50}", f"e{i % 100}", "v", 0.9), ops),
+                _ops_per_sec(lambda i: add_claim(f"a{i % 50}", f"e{i % 100}", "v", 0.9), ops),
+            ),
+            "reward_agent": (
+                _ops_per_sec(lambda i: _legacy_reward_agent(legacy_path, f"a{i % 50}", 0.5), ops),
+                _ops_per_sec(lambda i: reward_agent(f"a{i % 50}", 0.5), ops),
+            ),
+        }
+
+        memory_db.close_connections()
+
+    print(f"{'operation':<14}{'before ops/s':>14}{'after ops/s':>14}{'speedup':>10}")
+    for name, (before, after) in results.items():
+        print(f"{name:<14}{before:>14.0f}{after:>14.0f}{after / before:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
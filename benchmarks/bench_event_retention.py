@@ -0,0 +1,119 @@
+"""
+Benchmark – event rollups + retention under a steady load
+
+D days of trust events (E per day, A agents, the write path's
+checkpoint + rollup upserts included), pruned daily to a retention
+window of R days (raw events and hourly rollups) – or never:
+- database size (pages in use, after a WAL checkpoint) every 30 days
+- a dashboard query over the last 30 days (per agent, day and reason:
+  count and sum of change) from the raw events vs the daily rollups
+
+Usage:
+    python -m benchmarks.bench_event_retention [days] [events_per_day]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.event_rollups import get_rollups, prune_events, record_rollups
+from kernel.core.memory_db import connection, transaction, use_global
+from kernel.core.trust_timeline import record_checkpoints
+
+DAY = 86_400.0
+AGENTS = 200
+RETENTION_DAYS = 30
+CHUNK = 10_000
+REASONS = ("consensus_correct", "consensus_incorrect", "route", "route_low_confidence")
+
+
+def _day(rng: random.Random, start: float, n: int) -> None:
+    rows = []
+    for ts in sorted(rng.uniform(start, start + DAY) for _ in range(n)):
+        change = rng.choice((0.01, -0.01))
+        rows.append((f"agent-{rng.randrange(AGENTS)}", change, rng.choice(REASONS), 1.0, ts, 0.5))
+    for first in range(0, n, CHUNK):
+        chunk = rows[first:first + CHUNK]
+        with use_global(), transaction() as conn:
+            conn.executemany(
+                "INSERT INTO trust_events (agent, change, reason, confidence, timestamp, trust_after) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                chunk,
+            )
+            record_checkpoints(conn, ((r[0], r[5], r[4]) for r in chunk))
+            record_rollups(conn, "trust_events", ((r[0], r[2], r[1], r[4]) for r in chunk))
+
+
+def _size_mb() -> float:
+    with connection() as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        used = conn.execute("PRAGMA page_count").fetchone()[0] - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return used * conn.execute("PRAGMA page_size").fetchone()[0] / 1e6
+
+
+def _dashboard_raw(start: float) -> int:
+    with connection() as conn:
+        return len(conn.execute(
+            """
+            SELECT agent, CAST(timestamp / 86400 AS INTEGER), reason, COUNT(*), SUM(change)
+            FROM trust_events WHERE timestamp >= ? GROUP BY 1, 2, 3
+            """,
+            (start,),
+        ).fetchall())
+
+
+def _timed_ms(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(3):
+        t = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+
+def _run(days: int, per_day: int, retention: bool) -> dict:
+    rng = random.Random(6)
+    start = (time.time() // DAY - days) * DAY
+    sizes, ingest = {}, 0.0
+    for d in range(days):
+        t = time.perf_counter()
+        _day(rng, start + d * DAY, per_day)
+        ingest += time.perf_counter() - t
+        if retention:
+            prune_events(RETENTION_DAYS, now=start + (d + 1) * DAY, hourly_retention_days=RETENTION_DAYS)
+        if (d + 1) % 30 == 0:
+            sizes[d + 1] = _size_mb()
+
+    since = start + (days - 30) * DAY
+    return {
+        "sizes": sizes,
+        "ingest_us": ingest / (days * per_day) * 1e6,
+        "raw_ms": _timed_ms(_dashboard_raw, since),
+        "rollup_ms": _timed_ms(get_rollups, "trust_events", "daily", None, since),
+    }
+
+
+def main(days: int = 120, per_day: int = 20_000) -> None:
+    results = {}
+    for retention in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+            memory_db.configure(Path(tmp) / "bench.db")
+            results[retention] = _run(days, per_day, retention)
+            memory_db.close_connections()
+
+    print(f"{days} days x {per_day} trust events/day, {AGENTS} agents, retention {RETENTION_DAYS} days")
+    print(f"{'day':>6}{'no retention MB':>18}{'retention MB':>15}")
+    for day in results[False]["sizes"]:
+        print(f"{day:>6}{results[False]['sizes'][day]:>18.1f}{results[True]['sizes'][day]:>15.1f}")
+    r = results[True]
+    print(f"ingest: {r['ingest_us']:.1f} us/event (events + checkpoints + rollups)")
+    print(f"dashboard, last 30 days: raw GROUP BY {results[False]['raw_ms']:.1f} ms, "
+          f"daily rollups {r['rollup_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
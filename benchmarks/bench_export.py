@@ -0,0 +1,111 @@
+"""
+Benchmark – streaming NDJSON export vs whole-document JSON
+
+N claims, exported two ways:
+- "document": fetchall() + [dict(r) ...] + one json.dumps (the
+  pattern of the paged JSON endpoints, without the page limit)
+- "stream":   kernel.core.export.iter_claims serialized a page of
+  NDJSON lines at a time (what /export/claims sends)
+
+Reports wall time, time to the first byte and peak Python memory
+(tracemalloc, separate run) of each.
+
+Usage:
+    python -m benchmarks.bench_export [claims]
+"""
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.claim_values import get_values
+from kernel.core.export import EXPORT_PAGE_SIZE, iter_claims
+from kernel.core.ledger import add_claims_bulk
+from kernel.core.memory_db import connection
+
+CHUNK = 10_000
+
+
+def _seed(n: int) -> None:
+    for start in range(0, n, CHUNK):
+        add_claims_bulk(
+            {
+                "agent": f"agent-{i % 64}",
+                "entity": f"entity-{i % 5000}",
+                "value": f"value-{i % 7}",
+                "confidence": 0.8,
+            }
+            for i in range(start, min(n, start + CHUNK))
+        )
+
+
+def _document(sink) -> None:
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT id, agent, entity, value_hash, confidence, trust, timestamp FROM claims ORDER BY entity, id"
+        ).fetchall()
+    values = get_values(bytes(r["value_hash"]) for r in rows)
+    items = []
+    for r in rows:
+        item = dict(r)
+        item["value"] = values[bytes(item.pop("value_hash"))]
+        items.append(item)
+    sink(json.dumps({"ok": True, "data": {"items": items}}))
+
+
+def _stream(sink) -> None:
+    records = iter_claims()
+    while True:
+        page = list(islice(records, EXPORT_PAGE_SIZE))
+        if not page:
+            return
+        sink("".join(json.dumps(r) + "\n" for r in page))
+
+
+def _measure(export) -> tuple:
+    """
+    (total ms, first byte ms, peak MB, sent MB): timed untraced,
+    peak memory from a second, traced run.
+    """
+    first = []
+    sent = [0]
+
+    def sink(chunk: str) -> None:
+        if not first:
+            first.append(time.perf_counter())
+        sent[0] += len(chunk)
+
+    start = time.perf_counter()
+    export(sink)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    export(lambda chunk: None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return elapsed * 1000, (first[0] - start) * 1000, peak / 1e6, sent[0] / 1e6
+
+
+def main(n: int = 200_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+        memory_db.configure(Path(tmp) / "bench.db")
+        _seed(n)
+
+        results = {name: _measure(fn) for name, fn in (("document", _document), ("stream", _stream))}
+        memory_db.close_connections()
+
+    print(f"claims: {n}, page size: {EXPORT_PAGE_SIZE}")
+    print(f"{'export':>10}{'total ms':>12}{'first byte ms':>16}{'peak MB':>10}{'sent MB':>10}")
+    for name, (total, first, peak, sent) in results.items():
+        print(f"{name:>10}{total:>12.0f}{first:>16.1f}{peak:>10.1f}{sent:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,66 @@
+"""
+Benchmark – kernel.core import time
+
+Each sample is a fresh interpreter:
+- "import":           import every kernel.core module (lazy DB, nothing on disk)
+- "import + init_db": the same plus schema creation on a new DB file,
+                      i.e. what every import used to pay
+
+Usage:
+    python -m benchmarks.bench_import [samples]
+"""
+
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+MODULES = (
+    "kernel.core.ledger",
+    "kernel.core.trust",
+    "kernel.core.error_review",
+    "kernel.core.governance",
+)
+
+SNIPPET = """
+import time
+start = time.perf_counter()
+{imports}
+{init}
+print(time.perf_counter() - start)
+"""
+
+
+def _sample(init: bool, db_path: Path) -> float:
+    code = SNIPPET.format(
+        imports="\n".join(f"import {m}" for m in MODULES),
+        init="import kernel.core.memory_db as m; m.init_db()" if init else "",
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"CRE_DB_PATH": str(db_path), "PYTHONPATH": str(Path.cwd())},
+    )
+    return float(out.stdout.strip())
+
+
+def main(samples: int = 10) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        lazy = [_sample(False, Path(tmp) / f"lazy-{i}.db") for i in range(samples)]
+        eager = [_sample(True, Path(tmp) / f"eager-{i}.db") for i in range(samples)]
+        touched = sorted(p.name for p in Path(tmp).glob("lazy-*"))
+
+    lazy_ms = statistics.median(lazy) * 1000
+    eager_ms = statistics.median(eager) * 1000
+
+    print(f"import            : {lazy_ms:8.2f} ms (median of {samples})")
+    print(f"import + init_db  : {eager_ms:8.2f} ms")
+    print(f"startup saved     : {eager_ms - lazy_ms:8.2f} ms per process")
+    print(f"DB files created by plain import: {len(touched)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,106 @@
+"""
+Benchmark – rebuilding trust from the claims: replay engine vs live path
+
+N claims over many entities / agents, then trust + resolutions are
+rebuilt from scratch four ways:
+- "live per claim": update_trust() per credited claim (one transaction
+  each, the original learning path) – timed on a sample, extrapolated
+- "live batch":     resolve_entities() over every entity after resetting
+  trust / watermarks (vectorized consensus, batched trust deltas)
+- "replay":         kernel.core.replay in memory (what-if, no writes)
+- "rebuild":        replay + bulk write of trust, trust_events,
+                    resolutions and watermarks
+
+Usage:
+    python -m benchmarks.bench_replay [claims]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.ledger import add_claims_bulk, resolve_entities
+from kernel.core.memory_db import connection
+from kernel.core.replay import claims_history, rebuild, replay
+from kernel.core.trust import update_trust
+from kernel.core.trust_cache import TRUST_CACHE
+
+AGENTS = 1000
+CHUNK = 20_000
+SAMPLE = 20_000
+
+
+def _seed(n: int) -> list:
+    rng = random.Random(11)
+    entities = max(1, n // 10)
+    for start in range(0, n, CHUNK):
+        add_claims_bulk(
+            {
+                "agent": f"agent-{rng.randrange(AGENTS)}",
+                "entity": f"entity-{rng.randrange(entities)}",
+                "value": rng.choice(("a", "a", "a", "b", "c")),
+                "confidence": rng.random(),
+            }
+            for _ in range(start, min(n, start + CHUNK))
+        )
+    return [f"entity-{i}" for i in range(entities)]
+
+
+def _reset() -> None:
+    TRUST_CACHE.clear()
+    with memory_db.transaction() as conn:
+        for table in ("trust", "trust_events", "resolutions", "learning_watermarks"):
+            conn.execute(f"DELETE FROM {table}")
+    TRUST_CACHE.clear()
+
+
+def _live_per_claim(n: int) -> float:
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT agent, confidence FROM claims ORDER BY id LIMIT ?", (SAMPLE,)
+        ).fetchall()
+    start = time.perf_counter()
+    for i, r in enumerate(rows):
+        update_trust(r["agent"], i % 3 != 0, r["confidence"])
+    return (time.perf_counter() - start) / len(rows) * n
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def _live_batch(entities: list) -> None:
+    for i in range(0, len(entities), CHUNK):
+        resolve_entities(entities[i:i + CHUNK])
+
+
+def main(n: int = 1_000_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+        memory_db.configure(Path(tmp) / "bench.db")
+        entities = _seed(n)
+
+        results = {}
+        _reset()
+        results["live per claim"] = _live_per_claim(n)
+        _reset()
+        results["live batch"] = _timed(_live_batch, entities)
+        results["replay"] = _timed(lambda: replay(claims_history()))
+        results["rebuild"] = _timed(lambda: rebuild(claims_history()))
+
+        memory_db.close_connections()
+
+    print(f"claims: {n}, entities: {len(entities)}, agents: {AGENTS}")
+    print(f"{'path':>16}{'seconds':>10}{'claims/s':>12}")
+    for name, seconds in results.items():
+        note = " (extrapolated)" if name == "live per claim" else ""
+        print(f"{name:>16}{seconds:>10.1f}{n / seconds:>12.0f}{note}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
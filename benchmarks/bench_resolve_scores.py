@@ -0,0 +1,122 @@
+"""
+Benchmark – resolve latency vs claims per entity
+
+For entities with 10, 10k and 1M claims, compares:
+- "raw":    SELECT every claim row + resolve_consensus (pre-v0.21 path)
+- "sql":    GROUP BY value_hash ... LIMIT 2 over the raw claim rows
+- "scores": entity_value_scores read + resolve_scored_consensus
+- "top2":   entity_value_scores ranked in SQL (LIMIT 2) + resolve_ranked_consensus
+- "resolve_entity": the full kernel call (incl. resolution write)
+
+Claims alternate between two equally weighted values, so the entity is
+contested and trust learning (which still reads claim rows) is skipped.
+
+Usage:
+    python -m benchmarks.bench_resolve_scores [max_claims]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.claim_values import store_values
+from kernel.core.consensus import (
+    resolve_consensus,
+    resolve_ranked_consensus,
+    resolve_scored_consensus,
+)
+from kernel.core.ledger import resolve_entity
+from kernel.core.memory_db import connection, transaction
+from kernel.core.value_scores import (
+    get_top_value_scores,
+    get_value_scores,
+    rebuild_value_scores,
+)
+
+SIZES = (10, 10_000, 1_000_000)
+
+
+def _seed(entity: str, n: int) -> None:
+    with transaction() as conn:
+        digests = store_values(conn, ["v0", "v1"])
+        conn.executemany(
+            """
+            INSERT INTO claims (agent, entity, value_hash, confidence, trust, timestamp)
+            VALUES (?, ?, ?, 0.8, 0.5, ?)
+            """,
+            ((f"agent-{i % 100}", entity, digests[i % 2], time.time()) for i in range(n)),
+        )
+    rebuild_value_scores(entity)
+
+
+def _raw(entity: str):
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT agent, value_hash, confidence, trust FROM claims WHERE entity = ?",
+            (entity,),
+        ).fetchall()
+    return resolve_consensus([
+        {"agent": r[0], "value": r[1], "confidence": float(r[2]), "trust": float(r[3])}
+        for r in rows
+    ])
+
+
+def _sql(entity: str):
+    with connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT value_hash, SUM(confidence * trust) AS score,
+                   SUM(COUNT(*)) OVER () AS total_claims,
+                   COUNT(*) OVER () AS distinct_values
+            FROM claims
+            WHERE entity = ?
+            GROUP BY value_hash
+            ORDER BY score DESC, MIN(id)
+            LIMIT 2
+            """,
+            (entity,),
+        ).fetchall()
+    return resolve_ranked_consensus([(r[0], r[1]) for r in rows], rows[0][2], rows[0][3])
+
+
+def _top2(entity: str):
+    return resolve_ranked_consensus(*get_top_value_scores(entity))
+
+
+def _ms(fn, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(max_claims: int = SIZES[-1]) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+        memory_db.configure(Path(tmp) / "bench.db")
+
+        print(f"{'claims':>10}{'raw ms':>12}{'sql ms':>12}{'scores ms':>12}"
+              f"{'top2 ms':>12}{'resolve_entity ms':>20}")
+        for n in SIZES:
+            if n > max_claims:
+                break
+            entity = f"entity-{n}"
+            _seed(entity, n)
+
+            repeat = 1 if n >= 1_000_000 else 5
+            raw = _ms(_raw, entity, repeat=repeat)
+            sql = _ms(_sql, entity, repeat=repeat)
+            scored = _ms(lambda e: resolve_scored_consensus(get_value_scores(e)), entity)
+            top2 = _ms(_top2, entity)
+            full = _ms(resolve_entity, entity)
+            print(f"{n:>10}{raw:>12.2f}{sql:>12.2f}{scored:>12.3f}{top2:>12.3f}{full:>20.3f}")
+
+        memory_db.close_connections()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1])
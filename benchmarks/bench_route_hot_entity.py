@@ -0,0 +1,83 @@
+"""
+Benchmark – resolving adapter_response after N routed requests
+
+- "before": every routed reply is a claim on the one adapter_response
+  entity (pre-v0.25 /kernel/route)
+- "after":  one entity per request + the adapter_route_summary rollup
+
+Replies are seeded in bulk (the claim rows, value scores and dirty
+marks the route path writes). Each resolve runs with the memo dropped:
+"first" includes trust learning, "repeat" is the steady state.
+
+Usage:
+    python -m benchmarks.bench_route_hot_entity [routes]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.ledger import add_claims_bulk, resolve_entity
+from kernel.core.memory_db import transaction
+from kernel.core.resolution_cache import RESOLUTION_CACHE
+from kernel.core.route_summary import ROUTE_ENTITY, bump_route_summary, route_entity
+
+CHUNK = 10_000
+
+
+def _seed(routes: int, per_request: bool) -> str:
+    last_entity = ROUTE_ENTITY
+    for start in range(0, routes, CHUNK):
+        batch = [
+            {
+                "agent": f"adapter-{i % 4}",
+                "entity": route_entity() if per_request else ROUTE_ENTITY,
+                "value": f"Mock received: request {i}",
+                "confidence": 0.42,
+            }
+            for i in range(start, min(start + CHUNK, routes))
+        ]
+        stored = add_claims_bulk(batch)
+        last_entity = batch[-1]["entity"]
+
+        if per_request:
+            with transaction() as conn:
+                bump_route_summary(
+                    conn,
+                    [(c["agent"], c["entity"], c["confidence"], c["timestamp"]) for c in stored],
+                )
+    return last_entity
+
+
+def _ms(entity: str) -> float:
+    RESOLUTION_CACHE.clear()
+    start = time.perf_counter()
+    resolve_entity(entity)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(routes: int = 1_000_000) -> None:
+    print(f"routes: {routes}")
+    print(f"{'layout':>8}{'seed s':>10}{'first ms':>12}{'repeat ms':>12}{'one request ms':>16}")
+
+    for layout, per_request in (("before", False), ("after", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+            memory_db.configure(Path(tmp) / "bench.db")
+
+            start = time.perf_counter()
+            last_entity = _seed(routes, per_request)
+            seed_s = time.perf_counter() - start
+
+            first = _ms(ROUTE_ENTITY)
+            repeat = _ms(ROUTE_ENTITY)
+            one = _ms(last_entity)
+            print(f"{layout:>8}{seed_s:>10.1f}{first:>12.2f}{repeat:>12.2f}{one:>16.3f}")
+
+            memory_db.close_connections()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,80 @@
+"""
+Benchmark – multi-process write throughput vs ledger shard count
+
+WORKERS processes ingest claims concurrently (add_claims_bulk, one
+transaction per batch). Worker w owns the entities with
+shard_of(entity, 8) == w, so with 1 shard all workers contend for one
+file's write lock and with 8 shards each writes its own file – the
+layout the per-shard API writers produce.
+
+Usage:
+    python -m benchmarks.bench_shards [claims_per_worker]
+"""
+
+import multiprocessing
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.ledger import add_claims_bulk
+
+SHARD_COUNTS = (1, 2, 4, 8)
+WORKERS = 8
+BATCH_SIZE = 50
+ENTITIES = 20_000
+
+
+def _init_worker(tmp: str, shards: int) -> None:
+    audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+    memory_db.configure(Path(tmp) / "bench.db", shards)
+
+
+def _ingest(worker: int, n: int) -> int:
+    entities = [f"entity-{i}" for i in range(ENTITIES)]
+    mine = [e for e in entities if memory_db.shard_of(e, WORKERS) == worker]
+    claims = [
+        {"agent": f"agent-{i % 64}", "entity": mine[i % len(mine)], "value": f"value-{i % 3}", "confidence": 0.8}
+        for i in range(n)
+    ]
+    for i in range(0, n, BATCH_SIZE):
+        add_claims_bulk(claims[i:i + BATCH_SIZE])
+    memory_db.close_connections()
+    return n
+
+
+def _run(shards: int, per_worker: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        _init_worker(tmp, shards)
+        memory_db.init_db()
+        memory_db.close_connections()
+
+        with ProcessPoolExecutor(
+            max_workers=WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(tmp, shards),
+        ) as pool:
+            # warm up: every worker process started and migrated
+            list(pool.map(_ingest, range(WORKERS), [BATCH_SIZE] * WORKERS))
+
+            start = time.perf_counter()
+            total = sum(pool.map(_ingest, range(WORKERS), [per_worker] * WORKERS))
+            return total / (time.perf_counter() - start)
+
+
+def main(per_worker: int = 20_000) -> None:
+    print(f"workers: {WORKERS}, cpus: {multiprocessing.cpu_count()}, batch size: {BATCH_SIZE}")
+    print(f"{'shards':>8}{'claims/s':>12}{'vs 1 shard':>12}")
+
+    baseline = None
+    for shards in SHARD_COUNTS:
+        rate = _run(shards, per_worker)
+        baseline = baseline or rate
+        print(f"{shards:>8}{rate:>12.0f}{rate / baseline:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,94 @@
+"""
+Benchmark – lazy closed-form trust decay vs eager per-row decay
+
+A trust table of N agents, decayed three ways:
+- "eager":   read every row, decay it in Python, write it back
+             (a periodic O(agents) pass – what a real decay_all_agents
+             running every 300 s / on every resolve would cost)
+- "compact": decay_all_agents() – one set-based UPDATE
+- "lazy":    nothing is written; reads decay from last_updated.
+             Reported as the per-read overhead of get_trust_many()
+             with decay on vs off (cold cache, 1000 agents per call)
+
+Usage:
+    python -m benchmarks.bench_trust_decay [agents]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db, trust
+from kernel.core.memory_db import connection, transaction, use_global
+from kernel.core.trust import decay_all_agents, decayed_trust, get_trust_many
+from kernel.core.trust_cache import TRUST_CACHE
+
+HALF_LIFE = 86_400.0
+READ_BATCH = 1000
+
+
+def _seed(n: int) -> None:
+    stamp = time.time() - HALF_LIFE
+    with use_global(), transaction() as conn:
+        conn.executemany(
+            "INSERT INTO trust (agent, trust, last_updated) VALUES (?, ?, ?)",
+            ((f"agent-{i}", 0.05 + (i % 96) / 100, stamp - i) for i in range(n)),
+        )
+
+
+def _eager() -> None:
+    now = time.time()
+    with use_global(), transaction() as conn:
+        rows = conn.execute("SELECT agent, trust, last_updated FROM trust").fetchall()
+        for r in rows:
+            conn.execute(
+                "UPDATE trust SET trust = ?, last_updated = ? WHERE agent = ?",
+                (decayed_trust(r["trust"], r["last_updated"], now), now, r["agent"]),
+            )
+
+
+def _reads(n: int) -> float:
+    """
+    Seconds per trust read, cold cache.
+    """
+    TRUST_CACHE.clear()
+    start = time.perf_counter()
+    for first in range(0, n, READ_BATCH):
+        get_trust_many(f"agent-{i}" for i in range(first, min(n, first + READ_BATCH)))
+    return (time.perf_counter() - start) / n
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(n: int = 200_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+        memory_db.configure(Path(tmp) / "bench.db")
+        _seed(n)
+
+        trust.TRUST_DECAY_HALF_LIFE_SECONDS = 0.0
+        read_off = _reads(n)
+        trust.TRUST_DECAY_HALF_LIFE_SECONDS = HALF_LIFE
+        read_on = _reads(n)
+
+        eager = _timed(_eager)
+        with connection() as conn:
+            conn.execute("UPDATE trust SET last_updated = last_updated - ?", (HALF_LIFE,))
+            conn.commit()
+        compact = _timed(decay_all_agents)
+
+        memory_db.close_connections()
+
+    print(f"agents: {n}, half-life: {HALF_LIFE:.0f} s")
+    print(f"{'eager pass':>16}{eager:>10.2f} s")
+    print(f"{'compact UPDATE':>16}{compact:>10.2f} s")
+    print(f"{'lazy read':>16}{read_on * 1e6:>10.2f} us/agent (decay off: {read_off * 1e6:.2f})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
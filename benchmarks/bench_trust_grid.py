@@ -0,0 +1,108 @@
+"""
+Benchmark – multi-agent trust plot: one timeline per agent vs one grid
+
+A agents with E trust events each over a year, plotted on daily buckets,
+through the API (TestClient: routing + JSON, no network):
+- "per-agent": what plot_trust_multi.py did – GET /trust/timeline for
+               every agent (every event), then forward-filled onto a
+               shared daily grid client-side in Python
+- "grid":      one POST /trust/timeline/batch, 86400 s buckets –
+               checkpoint closes forward-filled with NumPy
+- "grid raw":  the same with unaligned 86399 s buckets – the raw-events
+               path
+
+Usage:
+    python -m benchmarks.bench_trust_grid [agents] [events_per_agent]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from kernel.core import audit, memory_db
+from kernel.core.memory_db import transaction, use_global
+from kernel.core.trust_timeline import rebuild_trust_checkpoints
+
+YEAR = 365 * 86_400
+DAY = 86_400.0
+REPEAT = 3
+READ = {"X-Intent": "READ"}
+
+
+def _seed(agents: int, events: int) -> None:
+    rng = random.Random(3)
+    with use_global(), transaction() as conn:
+        for a in range(agents):
+            trust, rows = 0.5, []
+            for ts in sorted(rng.uniform(0, YEAR) for _ in range(events)):
+                change = rng.choice((0.01, -0.01))
+                trust = round(min(max(trust + change, 0.05), 1.0), 4)
+                rows.append((f"agent-{a}", change, "r", 1.0, ts, trust))
+            conn.executemany(
+                "INSERT INTO trust_events (agent, change, reason, confidence, timestamp, trust_after) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+    rebuild_trust_checkpoints()
+
+
+def _per_agent(client: TestClient, agents: list) -> dict:
+    timelines = {
+        a: client.get("/trust/timeline", params={"agent": a, "max_points": 0}, headers=READ).json()["data"]
+        for a in agents
+    }
+    labels = [i * DAY for i in range(int(YEAR // DAY) + 1)]
+    series = {}
+    for agent, points in timelines.items():
+        closes, i, current = [], 0, None
+        for label in labels:
+            while i < len(points) and points[i]["timestamp"] < label + DAY:
+                current = points[i]["trust"]
+                i += 1
+            closes.append(current)
+        series[agent] = closes
+    return series
+
+
+def _grid(client: TestClient, agents: list, width: float) -> dict:
+    body = {"agents": agents, "bucket_seconds": width}
+    return client.post("/trust/timeline/batch", json=body, headers=READ).json()["data"]["series"]
+
+
+def _best_ms(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(agents: int = 200, events: int = 5_000) -> None:
+    names = [f"agent-{a}" for a in range(agents)]
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+        memory_db.configure(Path(tmp) / "bench.db")
+        _seed(agents, events)
+
+        client = TestClient(app)
+        results = {
+            "per-agent": _best_ms(lambda: _per_agent(client, names)),
+            "grid": _best_ms(lambda: _grid(client, names, DAY)),
+            "grid raw": _best_ms(lambda: _grid(client, names, DAY - 1)),
+        }
+        memory_db.close_connections()
+
+    print(f"agents: {agents}, events per agent: {events}, daily buckets over one year")
+    print(f"{'plot data':>12}{'ms':>10}")
+    for name, ms in results.items():
+        print(f"{name:>12}{ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
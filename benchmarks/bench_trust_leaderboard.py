@@ -0,0 +1,98 @@
+"""
+Benchmark – trust leaderboard + summary vs the full trust map
+
+N agents in the trust table, read the ways a dashboard would:
+- "full map":    get_all_trust() – what GET /trust returns, every agent
+- "top 50":      get_trust_leaderboard(50) – one index range scan
+- "bottom 50":   get_trust_leaderboard(50, "asc")
+- "deep page":   the 50 agents after rank 100,000 (keyset cursor)
+- "summary":     get_trust_summary(20) – count, avg / min / max and
+                 histogram in one covering-index scan
+- "... (decay)": the same with a one-day half-life – pages off the
+                 decay key index (built before timing), the summary in
+                 one streamed pass over the decayed values
+
+Reported: best-of time and the JSON size of what the endpoint returns.
+
+Usage:
+    python -m benchmarks.bench_trust_leaderboard [agents]
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db, trust
+from kernel.core.memory_db import transaction, use_global
+from kernel.core.trust import get_all_trust
+from kernel.core.trust_leaderboard import get_trust_leaderboard, get_trust_summary
+
+REPEAT = 5
+DEEP_RANK = 100_000
+HALF_LIFE = 86400.0
+
+
+def _seed(n: int) -> None:
+    rng = random.Random(5)
+    with use_global(), transaction() as conn:
+        conn.executemany(
+            "INSERT INTO trust (agent, trust, last_updated) VALUES (?, ?, ?)",
+            (
+                (f"agent-{i}", round(rng.uniform(0.05, 1.0), 4), time.time() - rng.uniform(0, 3 * HALF_LIFE))
+                for i in range(n)
+            ),
+        )
+
+
+def _deep_cursor(n: int) -> str:
+    cursor = None
+    for _ in range(min(DEEP_RANK, n - 50) // 1000):
+        cursor = get_trust_leaderboard(1000, cursor=cursor)["next_cursor"]
+    return cursor
+
+
+def _best(fn) -> tuple:
+    best, result = float("inf"), None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(json.dumps(result))
+
+
+def main(n: int = 1_000_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+        memory_db.configure(Path(tmp) / "bench.db")
+        _seed(n)
+        deep = _deep_cursor(n)
+
+        results = {
+            "full map": _best(get_all_trust),
+            "top 50": _best(lambda: get_trust_leaderboard(50)),
+            "bottom 50": _best(lambda: get_trust_leaderboard(50, "asc")),
+            "deep page": _best(lambda: get_trust_leaderboard(50, cursor=deep)),
+            "summary": _best(lambda: get_trust_summary(20)),
+        }
+
+        trust.TRUST_DECAY_HALF_LIFE_SECONDS = HALF_LIFE
+        get_trust_leaderboard(1)  # builds idx_trust_decay_key
+        deep = _deep_cursor(n)
+        results.update({
+            "top 50 (decay)": _best(lambda: get_trust_leaderboard(50)),
+            "deep page (decay)": _best(lambda: get_trust_leaderboard(50, cursor=deep)),
+            "summary (decay)": _best(lambda: get_trust_summary(20)),
+        })
+        memory_db.close_connections()
+
+    print(f"agents: {n}")
+    print(f"{'read':>18}{'ms':>10}{'JSON bytes':>14}")
+    for name, (ms, size) in results.items():
+        print(f"{name:>18}{ms:>10.2f}{size:>14}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,100 @@
+"""
+Benchmark – /trust/timeline: backward walk vs stored trust_after + checkpoints
+
+One agent with N trust events spread over a year (plus as many events
+of other agents), served three ways:
+- "walk":        the previous endpoint – every event of the agent,
+                 walked back from the current trust
+- "raw":         get_trust_timeline(max_points=0) – every event,
+                 straight from trust_after
+- "downsampled": get_trust_timeline(max_points=1000) – checkpoints
+                 for whole hours, raw events only at the range edges
+
+Usage:
+    python -m benchmarks.bench_trust_timeline [events]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from kernel.core import audit, memory_db
+from kernel.core.memory_db import connection, transaction, use_global
+from kernel.core.trust import get_trust
+from kernel.core.trust_timeline import get_trust_timeline, rebuild_trust_checkpoints
+
+YEAR = 365 * 86_400
+CHUNK = 100_000
+REPEAT = 5
+
+
+def _seed(n: int) -> None:
+    rng = random.Random(2)
+    start = time.time() - YEAR
+    trust = 0.5
+    with use_global(), transaction() as conn:
+        for first in range(0, n, CHUNK):
+            rows = []
+            for i in range(first, min(n, first + CHUNK)):
+                change = rng.choice((0.01, -0.01))
+                trust = round(min(max(trust + change, 0.05), 1.0), 4)
+                ts = start + YEAR * i / n
+                rows.append(("senior", change, "r", 1.0, ts, trust))
+                rows.append((f"agent-{i % 500}", change, "r", 1.0, ts, 0.5))
+            conn.executemany(
+                "INSERT INTO trust_events (agent, change, reason, confidence, timestamp, trust_after) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        conn.execute("INSERT INTO trust (agent, trust, last_updated) VALUES ('senior', ?, ?)", (trust, time.time()))
+    rebuild_trust_checkpoints()
+
+
+def _walk(agent: str) -> list:
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT change, timestamp FROM trust_events WHERE agent = ? ORDER BY timestamp ASC",
+            (agent,),
+        ).fetchall()
+    current = get_trust(agent)
+    for r in reversed(rows):
+        current -= r["change"]
+    timeline = []
+    for r in rows:
+        current += r["change"]
+        timeline.append({"timestamp": r["timestamp"], "trust": round(current, 4)})
+    return timeline
+
+
+def _best_ms(fn) -> tuple:
+    best, points = float("inf"), 0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        points = len(fn())
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, points
+
+
+def main(n: int = 1_000_000) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        audit.AUDIT_LOG_FILE = Path(tmp) / "audit_log.jsonl"
+        memory_db.configure(Path(tmp) / "bench.db")
+        _seed(n)
+
+        results = {
+            "walk": _best_ms(lambda: _walk("senior")),
+            "raw": _best_ms(lambda: get_trust_timeline("senior", max_points=0)),
+            "downsampled": _best_ms(lambda: get_trust_timeline("senior", max_points=1000)),
+        }
+        memory_db.close_connections()
+
+    print(f"events of the agent: {n} over one year")
+    print(f"{'timeline':>12}{'ms':>10}{'points':>10}")
+    for name, (ms, points) in results.items():
+        print(f"{name:>12}{ms:>10.1f}{points:>10}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
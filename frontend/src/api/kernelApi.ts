@@ -8,7 +8,10 @@ import type {
   PagedResponse,
   ResolverResponse,
   TrustEvent,
+  TrustLeaderboardPage,
   TrustMap,
+  TrustSummary,
+  TrustTimelineGrid,
 } from '../types/api';
 
 /* ===========================
@@ -36,6 +39,25 @@ export async function getTrustScores(): Promise<TrustMap> {
   return res.data?.data ?? {};
 }
 
+export async function getTrustLeaderboard(
+  limit = 50,
+  order: 'desc' | 'asc' = 'desc',
+  cursor?: string
+): Promise<TrustLeaderboardPage> {
+  const res = await apiClient.get<{ ok: boolean; data: TrustLeaderboardPage }>(
+    '/trust/leaderboard',
+    { params: { limit, order, cursor } }
+  );
+  return res.data?.data ?? { items: [], next_cursor: null };
+}
+
+export async function getTrustSummary(buckets = 20): Promise<TrustSummary> {
+  const res = await apiClient.get<{ ok: boolean; data: TrustSummary }>('/trust/summary', {
+    params: { buckets },
+  });
+  return res.data?.data ?? { agents: 0, avg: null, min: null, max: null, histogram: [] };
+}
+
 export async function getTrustEvents(limit = 25, offset = 0) {
   const res = await apiClient.get<{
     ok: boolean;
@@ -63,6 +85,18 @@ export async function getTrustTimeline(agent: string) {
   return res.data?.data ?? [];
 }
 
+export async function getTrustTimelines(
+  agents: string[],
+  bucketSeconds: number
+): Promise<TrustTimelineGrid> {
+  const res = await apiClient.post<{ ok: boolean; data: TrustTimelineGrid }>(
+    '/trust/timeline/batch',
+    { agents, bucket_seconds: bucketSeconds }
+  );
+
+  return res.data?.data ?? { bucket_seconds: bucketSeconds, timestamps: [], series: {} };
+}
+
 /* ===========================
    RESOLVER
 =========================== */
@@ -1,7 +1,7 @@
 import { useCallback, useState } from 'react';
 import { PageHeader } from '../components/PageHeader';
 import { StatCard } from '../components/StatCard';
-import { getKernelStatus, getRootStatus, getTrustScores } from '../api/kernelApi';
+import { getKernelStatus, getRootStatus, getTrustSummary } from '../api/kernelApi';
 import type { KernelExtendedStatus } from '../types/api';
 import { usePolling } from '../hooks/usePolling';
 import { formatTimestamp } from '../utils/format';
@@ -15,14 +15,14 @@ export function DashboardPage() {
   const load = useCallback(async () => {
     try {
       setError(null);
-      const [rootResp, kernelResp, trustMap] = await Promise.all([
+      const [rootResp, kernelResp, trustSummary] = await Promise.all([
         getRootStatus(),
         getKernelStatus(),
-        getTrustScores(),
+        getTrustSummary(1),
       ]);
       setRoot(rootResp.status);
       setKernel(kernelResp);
-      setAgentCount(Object.keys(trustMap).length);
+      setAgentCount(trustSummary.agents);
     } catch (err) {
       setError((err as Error).message);
     }
@@ -1,11 +1,14 @@
 import { useCallback, useMemo, useState } from 'react';
 import { PageHeader } from '../components/PageHeader';
 import { TrustBarChart } from '../components/TrustBarChart';
-import { getTrustScores, getTrustTimeline } from '../api/kernelApi';
+import { getTrustLeaderboard, getTrustTimeline } from '../api/kernelApi';
 import type { TrustRow, TrustTimelinePoint } from '../types/api';
 import { usePolling } from '../hooks/usePolling';
 import { formatTimestamp } from '../utils/format';
 
+// agents shown: the top of the leaderboard, never the full trust map
+const LEADERBOARD_SIZE = 50;
+
 export function TrustPage() {
   const [rows, setRows] = useState<TrustRow[]>([]);
   const [selectedAgent, setSelectedAgent] = useState<string>('');
@@ -13,17 +16,13 @@ export function TrustPage() {
 
   const loadScores = useCallback(async () => {
     try {
-      const res = await getTrustScores();
-
-      // ✅ v1.0 SAFE unwrap
-      const trustMap = res?.data ?? {};
+      const page = await getTrustLeaderboard(LEADERBOARD_SIZE);
 
-      const nextRows = Object.entries(trustMap)
-        .map(([agent, trust]) => ({
-          agent,
-          trust: Number(trust) || 0,
-        }))
-        .sort((a, b) => b.trust - a.trust);
+      // already ranked server-side (highest trust first)
+      const nextRows = page.items.map(({ agent, trust }) => ({
+        agent,
+        trust: Number(trust) || 0,
+      }));
 
       setRows(nextRows);
 
@@ -68,7 +67,7 @@ export function TrustPage() {
       />
 
       <div className="panel">
-        <h3>Trust Score Table</h3>
+        <h3>Trust Score Table (top {LEADERBOARD_SIZE})</h3>
 
         {rows.length === 0 ? (
           <p>No trust data available.</p>
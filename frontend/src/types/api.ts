@@ -17,6 +17,20 @@ export type TrustRow = {
   trust: number;
 };
 
+// /trust/leaderboard: one keyset page (next_cursor null on the last one)
+export type TrustLeaderboardPage = {
+  items: (TrustRow & { rank: number })[];
+  next_cursor: string | null;
+};
+
+export type TrustSummary = {
+  agents: number;
+  avg: number | null;
+  min: number | null;
+  max: number | null;
+  histogram: { from: number; to: number; agents: number }[];
+};
+
 export type TrustEvent = {
   agent: string;
   change: number;
@@ -34,6 +48,13 @@ export type TrustTimelineResponse = {
   timeline: TrustTimelinePoint[];
 };
 
+// /trust/timeline/batch: every agent on one grid (null before its first event)
+export type TrustTimelineGrid = {
+  bucket_seconds: number;
+  timestamps: number[];
+  series: Record<string, (number | null)[]>;
+};
+
 export type ResolverResponse = {
   entity: string;
   value: string | null;
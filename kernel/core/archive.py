@@ -0,0 +1,204 @@
+"""
+v0.20 – Claim Archive (HOT / COLD)
+
+Responsibilities:
+- Move claims out of the hot `claims` table once they are
+  older than the retention window, or already credited to trust
+  (at or below the entity's learning watermark)
+- Run as a background job with progress reporting
+  (shard by shard when the ledger is sharded)
+
+Consensus is unaffected: it reads entity_value_scores, which covers
+hot and archived claims alike (see kernel.core.value_scores).
+
+A contested resolution credits nothing, so it does not make a claim
+eligible. Claims archived for age before any resolved outcome are still
+credited by the next one: learning reads uncredited claims from the
+archive too (see kernel.core.ledger).
+
+Upserted claims (submissions set) stay hot: each is its agent's only
+claim on the entity, and the next upsert replaces it in place (one row
+per (agent, entity), never a hot and an archived copy).
+
+Usage:
+    python -m kernel.core.archive [retention_days]
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from kernel.core.audit import log_event
+from kernel.core.memory_db import fan_out, shards, transaction, use_shard
+
+# =================================================
+# Configuration
+# =================================================
+
+RETENTION_DAYS = float(os.environ.get("CRE_CLAIM_RETENTION_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.environ.get("CRE_ARCHIVE_BATCH_SIZE", "500"))
+
+# Claims are "folded" once a resolved outcome credited them
+_ELIGIBLE_SQL = """
+    FROM claims c
+    LEFT JOIN learning_watermarks w ON w.entity = c.entity
+    WHERE c.id > ?
+      AND c.submissions IS NULL
+      AND (
+        c.timestamp < ?
+        OR c.id <= COALESCE(w.last_credited_claim_id, 0)
+      )
+"""
+
+
+def _cutoff(retention_days: float) -> float:
+    return time.time() - retention_days * 86400
+
+
+# =================================================
+# Archival steps
+# =================================================
+
+def count_archivable(retention_days: float = RETENTION_DAYS) -> int:
+    cutoff = _cutoff(retention_days)
+    return sum(fan_out(
+        lambda conn: conn.execute("SELECT COUNT(*) " + _ELIGIBLE_SQL, (0, cutoff)).fetchone()[0]
+    ))
+
+
+def archive_batch(
+    after_id: int = 0,
+    retention_days: float = RETENTION_DAYS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    shard: int = 0,
+) -> List[int]:
+    """
+    Archive up to batch_size eligible claims of one shard with
+    id > after_id, in ONE transaction. Returns the archived ids (ascending).
+    """
+    with use_shard(shard), transaction() as conn:
+        ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT c.id " + _ELIGIBLE_SQL + " ORDER BY c.id LIMIT ?",
+                (after_id, _cutoff(retention_days), batch_size),
+            )
+        ]
+        if not ids:
+            return ids
+
+        placeholders = ",".join("?" * len(ids))
+
+        conn.execute(
+            f"""
+            INSERT INTO claims_archive
+                (id, agent, entity, value_hash, confidence, trust, timestamp, submissions, archived_at)
+            SELECT id, agent, entity, value_hash, confidence, trust, timestamp, submissions, ?
+            FROM claims
+            WHERE id IN ({placeholders})
+            """,
+            (time.time(), *ids),
+        )
+
+        conn.execute(f"DELETE FROM claims WHERE id IN ({placeholders})", ids)
+
+    return ids
+
+
+# =================================================
+# Background job
+# =================================================
+
+class ArchiveJob:
+    """
+    Archives in batches until nothing is eligible.
+
+    runner(shard, fn, *args) executes each batch (e.g. run_on_shard in
+    the API process, so archival shares the shard's write path);
+    default: inline.
+    on_progress receives the progress dict after every batch.
+    """
+
+    def __init__(
+        self,
+        retention_days: float = RETENTION_DAYS,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        runner: Optional[Callable[..., Any]] = None,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+    ) -> None:
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.runner = runner or (lambda shard, fn, *args: fn(*args))
+        self.on_progress = on_progress
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._progress: Dict = {"status": "idle"}
+
+    def progress(self) -> Dict:
+        with self._lock:
+            return dict(self._progress)
+
+    def start(self) -> bool:
+        """
+        Run in a background thread. False if a run is already active.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._thread = threading.Thread(
+                target=self.run,
+                name="cre-claim-archiver",
+                daemon=True,
+            )
+            self._thread.start()
+            return True
+
+    def run(self) -> Dict:
+        started = time.time()
+        total = count_archivable(self.retention_days)
+        self._update(status="running", moved=0, total=total, started_at=started,
+                     finished_at=None, error=None)
+
+        moved = 0
+        try:
+            for shard in shards():
+                last_id = 0
+                while True:
+                    ids = self.runner(
+                        shard, archive_batch, last_id, self.retention_days, self.batch_size, shard
+                    )
+                    if not ids:
+                        break
+                    moved += len(ids)
+                    last_id = ids[-1]
+                    self._update(moved=moved, total=max(total, moved))
+                    if self.on_progress:
+                        self.on_progress(self.progress())
+        except Exception as e:
+            self._update(status="failed", error=str(e), finished_at=time.time())
+            raise
+
+        self._update(status="done", finished_at=time.time())
+        log_event("CLAIMS_ARCHIVED", self.progress())
+        return self.progress()
+
+    def _update(self, **fields) -> None:
+        with self._lock:
+            self._progress.update(fields)
+
+
+# =================================================
+# CLI
+# =================================================
+
+if __name__ == "__main__":
+    import sys
+
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else RETENTION_DAYS
+    job = ArchiveJob(
+        retention_days=days,
+        on_progress=lambda p: print(f"archived {p['moved']}/{p['total']}"),
+    )
+    print(job.run())
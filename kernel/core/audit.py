@@ -7,6 +7,7 @@ Append-only, immutable audit trail for CRE Kernel
 import json
 import time
 from pathlib import Path
+from typing import Iterable, Tuple
 
 # Audit log file (JSON Lines format)
 AUDIT_LOG_FILE = Path("audit_log.jsonl")
@@ -35,4 +36,27 @@ def log_event(event_type: str, data: dict):
 
     # Append-only write (never overwrite history)
     with AUDIT_LOG_FILE.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
\ No newline at end of file
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def log_events(events: Iterable[Tuple[str, dict]]):
+    """
+    Record many audit events with ONE buffered append.
+
+    events: iterable of (event_type, data) pairs, written in order.
+    """
+
+    now = time.time()
+    lines = [
+        json.dumps(
+            {"timestamp": now, "event": event_type, "data": data},
+            ensure_ascii=False,
+        ) + "\n"
+        for event_type, data in events
+    ]
+
+    if not lines:
+        return
+
+    with AUDIT_LOG_FILE.open("a", encoding="utf-8") as f:
+        f.write("".join(lines))
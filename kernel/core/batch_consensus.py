@@ -0,0 +1,136 @@
+"""
+v0.23 – Batch Consensus Engine (VECTORIZED, NumPy)
+
+Purpose:
+- Resolve many entities at once from columnar arrays
+- Same rules and same outputs as consensus.resolve_consensus:
+  - scores are summed in input order (np.bincount), i.e. the exact
+    float sequence of the scalar loop
+  - score ties rank by first appearance (stable, like sorted(reverse=True))
+  - 1.2× clear-winner rule applied in bulk
+
+Entities / values may be any hashables, or integer arrays
+(entity ids, value codes) for the all-NumPy path.
+
+Rows may be raw claims (count = 1) or pre-aggregated per value
+(e.g. entity_value_scores: confidence = score, trust = 1.0, count = n).
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+WINNER_RATIO = 1.2
+
+REASON_SINGLE = "Single claim"
+REASON_AGREE = "All agents agree"
+REASON_WINNER = "Trust-weighted consensus"
+REASON_CONTESTED = "Conflicting claims with no clear winner"
+
+
+def _factorize(values: Sequence) -> tuple:
+    """
+    (codes, uniques) with codes in first-appearance order.
+
+    Integer arrays (pre-coded ids) stay in NumPy; anything else takes
+    one hash pass (sorting Python objects is far slower).
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        uniques, first_index, inverse = np.unique(
+            values, return_index=True, return_inverse=True
+        )
+        order = np.argsort(first_index, kind="stable")
+        remap = np.empty_like(order)
+        remap[order] = np.arange(len(order))
+        return remap[inverse.ravel()], uniques[order]
+
+    index: Dict[object, int] = {}
+    codes = np.fromiter(
+        (index.setdefault(v, len(index)) for v in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    uniques = np.empty(len(index), dtype=object)
+    uniques[:] = list(index)
+    return codes, uniques
+
+
+def resolve_consensus_batch(
+    entities: Sequence,
+    values: Sequence,
+    confidence: Sequence[float],
+    trust: Sequence[float],
+    counts: Optional[Sequence[int]] = None,
+) -> Dict[object, Dict]:
+    """
+    Input: parallel columns, one row per claim (or per aggregated value),
+    rows of each entity in claim order.
+
+    Output: {entity: resolve_consensus-style result}
+    """
+    n = len(entities)
+    if n == 0:
+        return {}
+
+    entity_codes, entity_uniques = _factorize(entities)
+    value_codes, value_uniques = _factorize(values)
+
+    weights = np.asarray(confidence, dtype=np.float64) * np.asarray(trust, dtype=np.float64)
+    row_counts = (
+        np.ones(n, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+    )
+
+    # -------------------------------------------------
+    # Group by (entity, value)
+    # -------------------------------------------------
+    pair = entity_codes.astype(np.int64) * len(value_uniques) + value_codes
+    _, group_first_row, group_of_row = np.unique(pair, return_index=True, return_inverse=True)
+    group_of_row = group_of_row.ravel()
+    n_groups = len(group_first_row)
+
+    scores = np.bincount(group_of_row, weights=weights, minlength=n_groups)
+    group_entity = entity_codes[group_first_row]
+    group_value = value_codes[group_first_row]
+
+    # -------------------------------------------------
+    # Rank inside each entity: score desc, first appearance asc
+    # -------------------------------------------------
+    order = np.lexsort((group_first_row, -scores, group_entity))
+    ranked_entity = group_entity[order]
+
+    n_entities = len(entity_uniques)
+    starts = np.searchsorted(ranked_entity, np.arange(n_entities), side="left")
+    groups_per_entity = np.bincount(group_entity, minlength=n_entities)
+    claims_per_entity = np.bincount(entity_codes, weights=row_counts, minlength=n_entities)
+
+    top = order[starts]
+    has_second = groups_per_entity > 1
+    second = order[np.minimum(starts + 1, len(order) - 1)]
+
+    top_score = scores[top]
+    second_score = np.where(has_second, scores[second], 0.0)
+
+    single = claims_per_entity == 1
+    agree = ~single & ~has_second
+    winner = ~single & has_second & (top_score >= second_score * WINNER_RATIO)
+
+    # -------------------------------------------------
+    # Back to resolve_consensus dicts
+    # -------------------------------------------------
+    top_values = value_uniques[group_value[top]].tolist()
+    reasons = np.select(
+        [single, agree, winner],
+        [REASON_SINGLE, REASON_AGREE, REASON_WINNER],
+        default=REASON_CONTESTED,
+    ).tolist()
+
+    resolved = (single | agree | winner).tolist()
+
+    return {
+        entity: (
+            {"status": "resolved", "value": value, "reason": reason}
+            if ok
+            else {"status": "contested", "reason": reason}
+        )
+        for entity, ok, value, reason in zip(entity_uniques.tolist(), resolved, top_values, reasons)
+    }
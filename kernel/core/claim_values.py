@@ -0,0 +1,110 @@
+"""
+v0.26 – Claim Value Store (CONTENT-HASHED, DEDUPLICATED)
+
+Responsibilities:
+- Identify claim values by a fixed-width digest
+  (BLAKE2b-128 of the UTF-8 text)
+- Store each distinct value ONCE in claim_values,
+  zlib-compressed when that pays off
+- claims / claims_archive / entity_value_scores carry only the digest:
+  grouping, comparisons and joins are on 16-byte keys
+- Turn digests back into text for the few values a caller shows
+"""
+
+import hashlib
+import os
+import sqlite3
+import zlib
+from typing import Dict, Iterable, List
+
+from kernel.core.memory_db import SQL_BATCH_SIZE, connection
+
+# =================================================
+# Configuration
+# =================================================
+
+DIGEST_SIZE = 16
+
+# values at least this long (UTF-8 bytes) are stored compressed if it helps
+COMPRESS_MIN_BYTES = int(os.environ.get("CRE_VALUE_COMPRESS_MIN_BYTES", "512"))
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+
+
+def value_hash(value: str) -> bytes:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+
+
+def encode_value(value: str) -> tuple:
+    """
+    (codec, data) as stored in claim_values.
+    """
+    raw = value.encode("utf-8")
+    if len(raw) >= COMPRESS_MIN_BYTES:
+        packed = zlib.compress(raw)
+        if len(packed) < len(raw):
+            return CODEC_ZLIB, packed
+    return CODEC_RAW, raw
+
+
+def decode_value(codec: int, data: bytes) -> str:
+    """
+    Text of a claim_values row (also for callers doing their own join).
+    """
+    if codec == CODEC_ZLIB:
+        data = zlib.decompress(data)
+    return bytes(data).decode("utf-8")
+
+
+# =================================================
+# Write path (inside the claim transaction)
+# =================================================
+
+def store_values(conn: sqlite3.Connection, values: Iterable[str]) -> List[bytes]:
+    """
+    Digest per input value (in order); new distinct values are stored.
+    """
+    values = list(values)
+    hashes = [value_hash(v) for v in values]
+
+    known = set()
+    new = []
+    for h, v in zip(hashes, values):
+        if h not in known:
+            known.add(h)
+            new.append((h, v))
+
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO claim_values (value_hash, codec, data, size)
+        VALUES (?, ?, ?, ?)
+        """,
+        [(h, *encode_value(v), len(v.encode("utf-8"))) for h, v in new],
+    )
+    return hashes
+
+
+# =================================================
+# Read path
+# =================================================
+
+def get_values(hashes: Iterable[bytes]) -> Dict[bytes, str]:
+    """
+    {digest: text} for the given digests (unknown ones omitted).
+    """
+    hashes = list(dict.fromkeys(hashes))
+    values: Dict[bytes, str] = {}
+
+    with connection() as conn:
+        for i in range(0, len(hashes), SQL_BATCH_SIZE):
+            chunk = hashes[i:i + SQL_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            for h, codec, data in conn.execute(
+                f"SELECT value_hash, codec, data FROM claim_values WHERE value_hash IN ({placeholders})",
+                chunk,
+            ):
+                values[bytes(h)] = decode_value(codec, data)
+
+    return values
+
@@ -7,7 +7,7 @@ Purpose:
 - Deterministic (no ML yet)
 """
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 
 def resolve_consensus(claims: List[Dict]) -> Dict:
@@ -48,15 +48,6 @@ def resolve_consensus(claims: List[Dict]) -> Dict:
     for c in claims:
         groups.setdefault(c["value"], []).append(c)
 
-    # Everyone agrees
-    if len(groups) == 1:
-        value = list(groups.keys())[0]
-        return {
-            "status": "resolved",
-            "value": value,
-            "reason": "All agents agree"
-        }
-
     # -------------------------------------------------
     # Trust-weighted scoring
     # -------------------------------------------------
@@ -66,12 +57,72 @@ def resolve_consensus(claims: List[Dict]) -> Dict:
         score = 0.0
         for c in group:
             score += c.get("confidence", 0.0) * c.get("trust", 1.0)
-        scores.append((value, score))
+        scores.append((value, score, len(group)))
+
+    return resolve_scored_consensus(scores)
+
+
+def resolve_scored_consensus(scores: List[Tuple[str, float, int]]) -> Dict:
+    """
+    Same rules as resolve_consensus, over per-value aggregates.
+
+    Input: (value, sum(confidence * trust), claim_count) per distinct
+    value, in order of first appearance (breaks score ties the same way).
+
+    Lets callers keep claims aggregated (archive, SQL GROUP BY, ...)
+    without changing any outcome.
+    """
+
+    scores = [s for s in scores if s[2] > 0]
+    total = sum(count for _, _, count in scores)
+
+    ranked = sorted(scores, key=lambda x: x[1], reverse=True)
+
+    return resolve_ranked_consensus(
+        [(value, score) for value, score, _ in ranked[:2]],
+        total,
+        len(scores),
+    )
+
+
+def resolve_ranked_consensus(
+    top: List[Tuple[str, float]],
+    total_claims: int,
+    distinct_values: int,
+) -> Dict:
+    """
+    Same rules again, over just the two best values.
 
-    scores.sort(key=lambda x: x[1], reverse=True)
+    Input: up to two (value, score) pairs ranked by score desc, then
+    first appearance – e.g. straight from
+    ORDER BY score DESC, first_claim_id LIMIT 2 – plus the entity's
+    claim and distinct-value counts.
+    """
+
+    if total_claims == 0:
+        return {
+            "status": "unknown",
+            "reason": "No claims available"
+        }
+
+    # Single claim → resolved
+    if total_claims == 1:
+        return {
+            "status": "resolved",
+            "value": top[0][0],
+            "reason": "Single claim"
+        }
+
+    # Everyone agrees
+    if distinct_values == 1:
+        return {
+            "status": "resolved",
+            "value": top[0][0],
+            "reason": "All agents agree"
+        }
 
-    top_value, top_score = scores[0]
-    second_value, second_score = scores[1]
+    top_value, top_score = top[0]
+    second_value, second_score = top[1]
 
     # Clear winner?
     if top_score >= second_score * 1.2:
@@ -85,4 +136,4 @@ def resolve_consensus(claims: List[Dict]) -> Dict:
     return {
         "status": "contested",
         "reason": "Conflicting claims with no clear winner"
-    }
\ No newline at end of file
+    }
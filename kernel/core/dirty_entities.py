@@ -0,0 +1,111 @@
+"""
+v0.24 – Dirty Entities (STALE RESOLUTION TRACKING)
+
+Responsibilities:
+- Mark an entity dirty in the transaction that adds its claims
+  (or changes its human override)
+- Clear the mark once a resolution covering those claims is stored
+  (claims that arrived meanwhile keep it dirty)
+- Serve the latest stored resolution of a clean entity (one indexed row)
+- Report backlog and lag for the sweeper metrics
+
+Marks live in the entity's shard; reads without a shard fan out
+over every shard and merge.
+"""
+
+import heapq
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kernel.core.memory_db import connection, fan_out, shard_of, use_shard
+
+
+# =================================================
+# Write path (inside the caller's transaction)
+# =================================================
+
+def mark_dirty(conn: sqlite3.Connection, marks: Iterable[Tuple[str, int]]) -> None:
+    """
+    marks: (entity, newest claim id). dirtied_at keeps the OLDEST
+    unresolved change, so lag reflects how long it has been waiting.
+    """
+    now = time.time()
+    conn.executemany(
+        """
+        INSERT INTO dirty_entities (entity, last_claim_id, dirtied_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(entity) DO UPDATE SET
+            last_claim_id = MAX(last_claim_id, excluded.last_claim_id)
+        """,
+        [(entity, claim_id, now) for entity, claim_id in marks],
+    )
+
+
+def clear_dirty(conn: sqlite3.Connection, marks: Iterable[Tuple[str, int]]) -> None:
+    """
+    marks: (entity, high-water mark the stored resolution covers).
+    """
+    conn.executemany(
+        "DELETE FROM dirty_entities WHERE entity = ? AND last_claim_id <= ?",
+        list(marks),
+    )
+
+
+# =================================================
+# Read path
+# =================================================
+
+def take_dirty(limit: int, shard: Optional[int] = None) -> List[str]:
+    """
+    Oldest dirty entities first (the mark stays until resolved),
+    of one shard or of all of them.
+    """
+    def oldest(conn: sqlite3.Connection) -> List:
+        return conn.execute(
+            "SELECT dirtied_at, entity FROM dirty_entities ORDER BY dirtied_at LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    if shard is not None:
+        with use_shard(shard), connection() as conn:
+            per_shard = [oldest(conn)]
+    else:
+        per_shard = fan_out(oldest)
+
+    merged = heapq.merge(*per_shard, key=lambda row: row[0])
+    return [row[1] for _, row in zip(range(limit), merged)]
+
+
+def get_clean_resolution(entity: str) -> Optional[Dict]:
+    """
+    Latest stored resolution, or None if the entity is dirty
+    or was never resolved.
+    """
+    with use_shard(shard_of(entity)), connection() as conn:
+        row = conn.execute(
+            """
+            SELECT entity, value, status, reason, timestamp
+            FROM resolutions
+            WHERE entity = ?
+              AND NOT EXISTS (SELECT 1 FROM dirty_entities WHERE entity = ?)
+            ORDER BY timestamp DESC
+            LIMIT 1
+            """,
+            (entity, entity),
+        ).fetchone()
+    return dict(row) if row is not None else None
+
+
+def dirty_stats() -> Dict:
+    per_shard = fan_out(
+        lambda conn: conn.execute(
+            "SELECT COUNT(*), MIN(dirtied_at) FROM dirty_entities"
+        ).fetchone()
+    )
+    count = sum(row[0] for row in per_shard)
+    oldest = min((row[1] for row in per_shard if row[1] is not None), default=None)
+    return {
+        "dirty": count,
+        "lag_seconds": round(time.time() - oldest, 3) if oldest is not None else 0.0,
+    }
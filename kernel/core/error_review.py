@@ -8,12 +8,16 @@ Responsibilities:
 - Apply severity-weighted trust penalties
 - Log explainable penalty reasons (Grafana / Audit)
 - Stay extensible for future error types
+
+Reviews live in the entity's shard; penalties and penalty events
+in the global store (with trust).
 """
 
 import time
 from typing import Optional
 
-from kernel.core.memory_db import get_connection
+from kernel.core.event_rollups import record_rollups
+from kernel.core.memory_db import connection, shard_of, transaction, use_global, use_shard
 from kernel.core.trust import penalize_agent
 from kernel.core.error_weights import get_error_weight
 
@@ -36,39 +40,34 @@ def add_error_review(
     Store an error review into SQLite.
     """
 
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        INSERT INTO error_reviews (
-            reviewer_agent,
-            target_agent,
-            entity,
-            observed_value,
-            expected_value,
-            error_type,
-            confidence,
-            evidence,
-            timestamp
+    with use_shard(shard_of(entity)), transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO error_reviews (
+                reviewer_agent,
+                target_agent,
+                entity,
+                observed_value,
+                expected_value,
+                error_type,
+                confidence,
+                evidence,
+                timestamp
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                reviewer_agent,
+                target_agent,
+                entity,
+                observed_value,
+                expected_value,
+                error_type,
+                float(confidence),
+                evidence,
+                time.time(),
+            ),
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            reviewer_agent,
-            target_agent,
-            entity,
-            observed_value,
-            expected_value,
-            error_type,
-            float(confidence),
-            evidence,
-            time.time(),
-        ),
-    )
-
-    conn.commit()
-    conn.close()
 
 
 def record_error_review(
@@ -82,37 +81,34 @@ def record_error_review(
     evidence: Optional[str] = None,
     timestamp: Optional[float] = None,
 ) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO error_reviews (
-            reviewer_agent,
-            target_agent,
-            entity,
-            observed_value,
-            expected_value,
-            error_type,
-            confidence,
-            evidence,
-            timestamp
+    with use_shard(shard_of(entity)), transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO error_reviews (
+                reviewer_agent,
+                target_agent,
+                entity,
+                observed_value,
+                expected_value,
+                error_type,
+                confidence,
+                evidence,
+                timestamp
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                reviewer_agent,
+                target_agent,
+                entity,
+                observed_value,
+                expected_value,
+                error_type,
+                float(confidence),
+                evidence,
+                float(timestamp if timestamp is not None else time.time()),
+            ),
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            reviewer_agent,
-            target_agent,
-            entity,
-            observed_value,
-            expected_value,
-            error_type,
-            float(confidence),
-            evidence,
-            float(timestamp if timestamp is not None else time.time()),
-        ),
-    )
-    conn.commit()
-    conn.close()
 
 
 # =================================================
@@ -120,20 +116,15 @@ def record_error_review(
 # =================================================
 
 def get_error_reviews_for_entity(entity: str):
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        SELECT *
-        FROM error_reviews
-        WHERE entity = ?
-        """,
-        (entity,),
-    )
-
-    rows = cur.fetchall()
-    conn.close()
+    with use_shard(shard_of(entity)), connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT *
+            FROM error_reviews
+            WHERE entity = ?
+            """,
+            (entity,),
+        ).fetchall()
     return rows
 
 
@@ -158,77 +149,76 @@ def apply_error_penalties(
     - Explainability
     """
 
-    conn = get_connection()
-    cur = conn.cursor()
-
-    # Aggregate reviews by (target_agent, error_type)
-    cur.execute(
-        """
-        SELECT
-            target_agent,
-            error_type,
-            COUNT(*) AS review_count,
-            AVG(confidence) AS avg_conf
-        FROM error_reviews
-        WHERE entity = ?
-        GROUP BY target_agent, error_type
-        """,
-        (entity,),
-    )
-
-    rows = cur.fetchall()
-
-    for row in rows:
-        agent = row["target_agent"]
-        error_type = row["error_type"]
-        review_count = row["review_count"]
-        avg_conf = float(row["avg_conf"])
-
-        if review_count < min_reviews or avg_conf < min_confidence:
-            continue
-
-        # -------------------------------------------------
-        # Severity weighting
-        # -------------------------------------------------
-        weight = get_error_weight(error_type)
-        final_penalty_strength = round(avg_conf * weight, 4)
-
-        # -------------------------------------------------
-        # Apply trust penalty (ONCE per agent+entity+type)
-        # -------------------------------------------------
-        penalize_agent(
-            agent=agent,
-            confidence=final_penalty_strength,
-        )
-
-        # -------------------------------------------------
-        # Persist penalty event (Grafana / Audit)
-        # -------------------------------------------------
-        cur.execute(
+    # Aggregate reviews by (target_agent, error_type) – entity's shard
+    with use_shard(shard_of(entity)), connection() as conn:
+        rows = conn.execute(
             """
-            INSERT INTO error_penalty_events (
-                agent,
-                entity,
+            SELECT
+                target_agent,
                 error_type,
-                weight,
-                confidence,
-                final_penalty_strength,
-                reason,
-                timestamp
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                COUNT(*) AS review_count,
+                AVG(confidence) AS avg_conf
+            FROM error_reviews
+            WHERE entity = ?
+            GROUP BY target_agent, error_type
             """,
-            (
-                agent,
-                entity,
-                error_type,
-                weight,
-                avg_conf,
-                final_penalty_strength,
-                "error_review_penalty",
-                time.time(),
-            ),
-        )
+            (entity,),
+        ).fetchall()
+
+    # Penalties and penalty events commit together (global store)
+    with use_global(), transaction() as conn:
+        cur = conn.cursor()
+
+        for row in rows:
+            agent = row["target_agent"]
+            error_type = row["error_type"]
+            review_count = row["review_count"]
+            avg_conf = float(row["avg_conf"])
+
+            if review_count < min_reviews or avg_conf < min_confidence:
+                continue
+
+            # -------------------------------------------------
+            # Severity weighting
+            # -------------------------------------------------
+            weight = get_error_weight(error_type)
+            final_penalty_strength = round(avg_conf * weight, 4)
+
+            # -------------------------------------------------
+            # Apply trust penalty (ONCE per agent+entity+type)
+            # -------------------------------------------------
+            penalize_agent(
+                agent=agent,
+                confidence=final_penalty_strength,
+            )
 
-    conn.commit()
-    conn.close()
+            # -------------------------------------------------
+            # Persist penalty event (Grafana / Audit)
+            # -------------------------------------------------
+            now = time.time()
+            cur.execute(
+                """
+                INSERT INTO error_penalty_events (
+                    agent,
+                    entity,
+                    error_type,
+                    weight,
+                    confidence,
+                    final_penalty_strength,
+                    reason,
+                    timestamp
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    agent,
+                    entity,
+                    error_type,
+                    weight,
+                    avg_conf,
+                    final_penalty_strength,
+                    "error_review_penalty",
+                    now,
+                ),
+            )
+            record_rollups(conn, "error_penalty_events", [(agent, error_type, final_penalty_strength, now)])
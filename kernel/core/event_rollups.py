@@ -0,0 +1,321 @@
+"""
+v0.30 – Event Rollups (HOURLY / DAILY, RETENTION)
+
+Responsibilities:
+- Roll trust_events (per agent and reason) and error_penalty_events
+  (per agent and error type) up per hour and per day – event count and
+  sum / min / max of the trust change / penalty strength – inside the
+  transaction that writes the events
+- Serve the rollups: dashboards and analytics read these, never a
+  GROUP BY over the raw events
+- Prune raw events older than the retention window, in batches.
+  Every committed event is already rolled up, and trust history stays
+  in trust_checkpoints. The per-source pruned_before watermark tells
+  rebuilds which periods no longer have raw events. Hourly rollups get
+  their own (longer) window; daily rollups are kept
+- Rebuild the rollups from the retained events
+
+Deleted pages are reused by later inserts: under a steady load the
+database file stops growing with the event volume once the windows are
+full (what remains: daily rollups and trust checkpoints, per agent
+and period).
+Retention cuts at day boundaries – keep CRE_TRUST_CHECKPOINT_SECONDS
+a divisor of a day.
+
+Usage:
+    python -m kernel.core.event_rollups [retention_days]    # prune now
+"""
+
+import math
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from kernel.core.audit import log_event
+from kernel.core.memory_db import connection, transaction, use_global
+
+# =================================================
+# Configuration
+# =================================================
+
+# rollup table suffix → period length (seconds)
+GRAINS = {"hourly": 3600.0, "daily": 86400.0}
+
+# raw event table → (rollup key column, rolled-up value column, rollup column prefix)
+SOURCES = {
+    "trust_events": ("reason", "change", "change"),
+    "error_penalty_events": ("error_type", "final_penalty_strength", "penalty"),
+}
+
+# raw events older than this are deleted (0 = keep every raw event)
+EVENT_RETENTION_DAYS = float(os.environ.get("CRE_EVENT_RETENTION_DAYS", "0"))
+# hourly rollups older than this are deleted too (never before the raw
+# events; 0 = keep); daily rollups are kept
+HOURLY_ROLLUP_RETENTION_DAYS = float(os.environ.get("CRE_HOURLY_ROLLUP_RETENTION_DAYS", "90"))
+RETENTION_INTERVAL_SECONDS = float(os.environ.get("CRE_EVENT_RETENTION_INTERVAL_SECONDS", "3600"))
+PRUNE_BATCH_SIZE = int(os.environ.get("CRE_EVENT_PRUNE_BATCH_SIZE", "5000"))
+
+DAY = GRAINS["daily"]
+
+
+def _check_source(source: str) -> None:
+    if source not in SOURCES:
+        raise ValueError(f"unknown event source: {source}")
+
+
+def rollup_table(source: str, grain: str) -> str:
+    _check_source(source)
+    if grain not in GRAINS:
+        raise ValueError(f"unknown rollup grain: {grain} (one of {', '.join(GRAINS)})")
+    return f"{source}_{grain}"
+
+
+# =================================================
+# Write path (called inside the event transaction)
+# =================================================
+
+def record_rollups(conn: sqlite3.Connection, source: str, events: Iterable[Tuple[str, str, float, float]]) -> None:
+    """
+    events: (agent, key, value, timestamp) – key is the reason / error
+    type, value the trust change / penalty strength.
+    Folded per (grain, agent, period, key) first: one upsert per row touched.
+    """
+    folded: Dict[Tuple[str, str, float, str], list] = {}
+    for agent, key, value, ts in events:
+        for grain, seconds in GRAINS.items():
+            k = (grain, agent, math.floor(ts / seconds) * seconds, key)
+            r = folded.get(k)
+            if r is None:
+                folded[k] = [1, value, value, value]
+                continue
+            r[0] += 1
+            r[1] += value
+            r[2] = min(r[2], value)
+            r[3] = max(r[3], value)
+
+    key_col, _value_col, p = SOURCES[source]
+    for grain in GRAINS:
+        rows = [(agent, period, key, *r) for (g, agent, period, key), r in folded.items() if g == grain]
+        if not rows:
+            continue
+        conn.executemany(
+            f"""
+            INSERT INTO {rollup_table(source, grain)}
+                (agent, period_start, {key_col}, events, {p}_sum, {p}_min, {p}_max)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(agent, period_start, {key_col}) DO UPDATE SET
+                events = events + excluded.events,
+                {p}_sum = {p}_sum + excluded.{p}_sum,
+                {p}_min = MIN({p}_min, excluded.{p}_min),
+                {p}_max = MAX({p}_max, excluded.{p}_max)
+            """,
+            rows,
+        )
+
+
+# =================================================
+# Read path
+# =================================================
+
+def get_rollups(
+    source: str,
+    grain: str = "daily",
+    agent: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> List[Dict]:
+    """
+    Rollup rows of periods starting in [start, end], oldest first
+    (one row per agent and reason / error type).
+    """
+    table = rollup_table(source, grain)
+    key_col, _value_col, p = SOURCES[source]
+
+    where, params = ["period_start >= ?", "period_start <= ?"], [
+        -math.inf if start is None else start,
+        math.inf if end is None else end,
+    ]
+    if agent is not None:
+        where.insert(0, "agent = ?")
+        params.insert(0, agent)
+
+    with use_global(), connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT period_start, agent, {key_col}, events, {p}_sum, {p}_min, {p}_max
+            FROM {table}
+            WHERE {' AND '.join(where)}
+            ORDER BY period_start, agent, {key_col}
+            """,
+            params,
+        ).fetchall()
+
+    return [dict(r) for r in rows]
+
+
+# =================================================
+# Retention
+# =================================================
+
+def retention_cutoff(retention_days: float, now: Optional[float] = None) -> float:
+    """
+    Start of the oldest day kept: pruning never splits an hour or a day.
+    """
+    now = time.time() if now is None else now
+    return math.floor((now - retention_days * DAY) / DAY) * DAY
+
+
+def pruned_before(conn: sqlite3.Connection, source: str) -> Optional[float]:
+    """
+    Raw events of this source before the returned time may be gone
+    (None: never pruned).
+    """
+    row = conn.execute("SELECT pruned_before FROM event_retention WHERE source = ?", (source,)).fetchone()
+    return None if row is None else row[0]
+
+
+def reset_pruned(conn: sqlite3.Connection, source: str) -> None:
+    """
+    The raw events of this source are complete again (e.g. after a replay).
+    """
+    conn.execute("DELETE FROM event_retention WHERE source = ?", (source,))
+
+
+def prune_batch(source: str, cutoff: float, batch_size: int = PRUNE_BATCH_SIZE) -> int:
+    """
+    Delete up to batch_size events of one source older than cutoff, in
+    ONE transaction (the watermark moves with the first delete).
+    Returns the number deleted.
+    """
+    _check_source(source)
+
+    with use_global(), transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO event_retention (source, pruned_before) VALUES (?, ?)
+            ON CONFLICT(source) DO UPDATE SET pruned_before = MAX(pruned_before, excluded.pruned_before)
+            """,
+            (source, cutoff),
+        )
+        return conn.execute(
+            f"""
+            DELETE FROM {source} WHERE id IN (
+                SELECT id FROM {source} WHERE timestamp < ? ORDER BY timestamp LIMIT ?
+            )
+            """,
+            (cutoff, batch_size),
+        ).rowcount
+
+
+def prune_hourly_batch(source: str, cutoff: float) -> int:
+    """
+    Delete the oldest day of the source's hourly rollups older than
+    cutoff, in ONE transaction. Returns the number of rows deleted.
+    """
+    table = rollup_table(source, "hourly")
+
+    with use_global(), transaction() as conn:
+        oldest = conn.execute(f"SELECT MIN(period_start) FROM {table}").fetchone()[0]
+        if oldest is None or oldest >= cutoff:
+            return 0
+        return conn.execute(
+            f"DELETE FROM {table} WHERE period_start < ?", (min(oldest + DAY, cutoff),)
+        ).rowcount
+
+
+def prune_events(
+    retention_days: float = EVENT_RETENTION_DAYS,
+    batch_size: int = PRUNE_BATCH_SIZE,
+    runner: Optional[Callable[..., Any]] = None,
+    now: Optional[float] = None,
+    hourly_retention_days: float = HOURLY_ROLLUP_RETENTION_DAYS,
+) -> Dict[str, int]:
+    """
+    Delete every raw event older than the retention window, then the
+    hourly rollups older than theirs, batch by batch.
+
+    runner(fn, *args) executes each batch (e.g. on the global writer in
+    the API process, so pruning interleaves with event writes);
+    default: inline. Returns the number of rows deleted per table.
+    """
+    if retention_days <= 0:
+        return {}
+    runner = runner or (lambda fn, *args: fn(*args))
+    cutoff = retention_cutoff(retention_days, now)
+
+    deleted: Dict[str, int] = {}
+    for source in SOURCES:
+        deleted[source] = 0
+        while True:
+            n = runner(prune_batch, source, cutoff, batch_size)
+            deleted[source] += n
+            if n < batch_size:
+                break
+
+    if hourly_retention_days > 0:
+        hourly_cutoff = retention_cutoff(max(retention_days, hourly_retention_days), now)
+        for source in SOURCES:
+            table = rollup_table(source, "hourly")
+            deleted[table] = 0
+            while True:
+                n = runner(prune_hourly_batch, source, hourly_cutoff)
+                if not n:
+                    break
+                deleted[table] += n
+
+    if any(deleted.values()):
+        log_event("EVENTS_PRUNED", {"cutoff": cutoff, **deleted})
+    return deleted
+
+
+# =================================================
+# Rebuild
+# =================================================
+
+def rebuild_rollups(source: Optional[str] = None) -> None:
+    """
+    Regenerate the rollups of one source (default: all) from its raw
+    events. Periods before the pruned_before watermark are kept as they are.
+    """
+    sources = list(SOURCES) if source is None else [source]
+    for s in sources:
+        _check_source(s)
+
+    with use_global(), transaction() as conn:
+        for s in sources:
+            _rebuild(conn, s, pruned_before(conn, s))
+
+
+def _rebuild(conn: sqlite3.Connection, source: str, since: Optional[float] = None) -> None:
+    key_col, value_col, p = SOURCES[source]
+    since = -math.inf if since is None else since
+
+    for grain, seconds in GRAINS.items():
+        table = rollup_table(source, grain)
+        conn.execute(f"DELETE FROM {table} WHERE period_start >= ?", (since,))
+        conn.execute(
+            f"""
+            INSERT INTO {table} (agent, period_start, {key_col}, events, {p}_sum, {p}_min, {p}_max)
+            SELECT agent, CAST(timestamp / ? AS INTEGER) * ?, {key_col},
+                   COUNT(*), SUM({value_col}), MIN({value_col}), MAX({value_col})
+            FROM {source}
+            WHERE timestamp >= ?
+            GROUP BY 1, 2, 3
+            """,
+            (seconds, seconds, since),
+        )
+
+
+# =================================================
+# CLI
+# =================================================
+
+if __name__ == "__main__":
+    import sys
+
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else EVENT_RETENTION_DAYS
+    if days <= 0:
+        print("retention is off (CRE_EVENT_RETENTION_DAYS=0): pass a number of days")
+    else:
+        print(prune_events(days))
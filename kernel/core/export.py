@@ -0,0 +1,257 @@
+"""
+v0.27 – Streaming Export (KEYSET-PAGED, RESUMABLE)
+
+Responsibilities:
+- Stream claims, resolutions and trust history as record generators
+  (constant memory, whatever the result size)
+- Page through an index in key order, one short query per page:
+  no cursor or read transaction stays open between pages, so a slow
+  client never pins a connection or holds back WAL checkpoints
+- Tag every record with an opaque cursor; passing it back resumes
+  the export right after that record
+- Entity-scoped exports walk the shards one after another
+
+Record order:
+- claims:       (entity, id)             per shard
+- resolutions:  (entity, timestamp, id)  per shard
+- trust events: (timestamp, id)          global store
+"""
+
+import base64
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from kernel.core.claim_values import get_values
+from kernel.core.memory_db import connection, shards, use_shard
+
+# =================================================
+# Configuration
+# =================================================
+
+# rows per page query (also the most rows held in memory at once)
+EXPORT_PAGE_SIZE = int(os.environ.get("CRE_EXPORT_PAGE_SIZE", "1000"))
+
+
+# =================================================
+# Cursors
+# =================================================
+
+# Payload: "<shard | g>:<key fields, last to first>". Only the FIRST key
+# column may be text (the entity), so it is written last and may itself
+# contain ":". Cheaper than JSON – every exported record carries one.
+
+_GLOBAL = "g"
+
+
+def encode_cursor(shard: Optional[int], key: Sequence[Any]) -> str:
+    """
+    Opaque token: resume after `key` on `shard` (None = global store).
+    """
+    raw = ":".join([_GLOBAL if shard is None else str(shard), *map(str, reversed(key))])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, key_types: Sequence[type]) -> tuple:
+    """
+    (shard, key) of a token; ValueError if it is not one of ours.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        shard, *fields = raw.split(":", len(key_types))
+        if len(fields) != len(key_types):
+            raise ValueError(cursor)
+        key = [kind(field) for kind, field in zip(key_types, reversed(fields))]
+        return (None if shard == _GLOBAL else int(shard)), key
+    except ValueError as e:
+        raise ValueError("invalid export cursor") from e
+
+
+# =================================================
+# Keyset paging
+# =================================================
+
+def _prefix_bounds(prefix: str) -> tuple:
+    """
+    [low, high) covering every string starting with prefix
+    (SQLite's BINARY collation orders UTF-8 by code point).
+    """
+    last = ord(prefix[-1]) + 1
+    if 0xD800 <= last <= 0xDFFF:
+        last = 0xE000
+    return prefix, prefix[:-1] + chr(last)
+
+
+def _pages(
+    shard: Optional[int],
+    table: str,
+    columns: str,
+    key: Sequence[str],
+    where: List[str],
+    params: List[Any],
+    after: Optional[Sequence[Any]],
+    page_size: int,
+) -> Iterator[list]:
+    """
+    Rows of one shard (None = global store) in key order, after `after`,
+    page by page. Routing is scoped to each page query: the caller's
+    generator may resume on another thread between pages.
+    """
+    order = ", ".join(key)
+    marks = ", ".join("?" * len(key))
+
+    while True:
+        clauses = list(where)
+        args = list(params)
+        if after is not None:
+            clauses.append(f"({order}) > ({marks})")
+            args.extend(after)
+
+        sql = f"SELECT {columns} FROM {table}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order} LIMIT ?"
+
+        with use_shard(shard), connection() as conn:
+            rows = conn.execute(sql, (*args, page_size)).fetchall()
+
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        after = [rows[-1][k] for k in key]
+
+
+def _sharded(cursor: Optional[str], key_types: Sequence[type]) -> Iterator[tuple]:
+    """
+    (shard, after) for every shard still to export, from the cursor on.
+    """
+    start, after = 0, None
+    if cursor is not None:
+        start, after = decode_cursor(cursor, key_types)
+        if start is None or not 0 <= start < len(shards()):
+            raise ValueError("invalid export cursor")
+
+    def walk() -> Iterator[tuple]:
+        position = after
+        for shard in shards()[start:]:
+            yield shard, position
+            position = None
+
+    return walk()
+
+
+# =================================================
+# Exports (cursor is validated eagerly, rows stream lazily)
+# =================================================
+
+_CLAIM_KEY = ("entity", "id")
+_CLAIM_KEY_TYPES = (str, int)
+
+
+def iter_claims(
+    prefix: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Hot claims (optionally of entities starting with prefix), values as text.
+    """
+    where, params = [], []
+    if prefix:
+        where.append("entity >= ? AND entity < ?")
+        params.extend(_prefix_bounds(prefix))
+    todo = _sharded(cursor, _CLAIM_KEY_TYPES)
+
+    def stream() -> Iterator[Dict[str, Any]]:
+        for shard, after in todo:
+            for rows in _pages(
+                shard, "claims",
+                "id, agent, entity, value_hash, confidence, trust, timestamp, submissions",
+                _CLAIM_KEY, where, params, after, page_size,
+            ):
+                with use_shard(shard):
+                    values = get_values(bytes(r["value_hash"]) for r in rows)
+                for r in rows:
+                    yield {
+                        "id": r["id"],
+                        "agent": r["agent"],
+                        "entity": r["entity"],
+                        "value": values.get(bytes(r["value_hash"])),
+                        "confidence": r["confidence"],
+                        "trust": r["trust"],
+                        "timestamp": r["timestamp"],
+                        "submissions": r["submissions"],
+                        "cursor": encode_cursor(shard, (r["entity"], r["id"])),
+                    }
+
+    return stream()
+
+
+_RESOLUTION_KEY = ("entity", "timestamp", "id")
+_RESOLUTION_KEY_TYPES = (str, float, int)
+
+
+def iter_resolutions(
+    prefix: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Every persisted resolution (optionally of entities starting with prefix).
+    """
+    where, params = [], []
+    if prefix:
+        where.append("entity >= ? AND entity < ?")
+        params.extend(_prefix_bounds(prefix))
+    todo = _sharded(cursor, _RESOLUTION_KEY_TYPES)
+
+    def stream() -> Iterator[Dict[str, Any]]:
+        for shard, after in todo:
+            for rows in _pages(
+                shard, "resolutions",
+                "id, entity, value, status, reason, timestamp",
+                _RESOLUTION_KEY, where, params, after, page_size,
+            ):
+                for r in rows:
+                    record = dict(r)
+                    record["cursor"] = encode_cursor(shard, [r[k] for k in _RESOLUTION_KEY])
+                    yield record
+
+    return stream()
+
+
+_TRUST_EVENT_KEY = ("timestamp", "id")
+_TRUST_EVENT_KEY_TYPES = (float, int)
+
+
+def iter_trust_events(
+    agent: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Trust history (optionally of one agent), oldest first.
+    """
+    where, params = [], []
+    if agent is not None:
+        where.append("agent = ?")
+        params.append(agent)
+
+    after = None
+    if cursor is not None:
+        shard, after = decode_cursor(cursor, _TRUST_EVENT_KEY_TYPES)
+        if shard is not None:
+            raise ValueError("invalid export cursor")
+
+    def stream() -> Iterator[Dict[str, Any]]:
+        for rows in _pages(
+            None, "trust_events",
+            "id, agent, change, reason, confidence, timestamp, trust_after",
+            _TRUST_EVENT_KEY, where, params, after, page_size,
+        ):
+            for r in rows:
+                record = dict(r)
+                record["cursor"] = encode_cursor(None, (r["timestamp"], r["id"]))
+                yield record
+
+    return stream()
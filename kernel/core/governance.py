@@ -2,6 +2,9 @@
 # v0.3 — Human governance & override control
 
 from kernel.core.audit import log_event
+from kernel.core.dirty_entities import mark_dirty
+from kernel.core.memory_db import shard_of, transaction, use_shard
+from kernel.core.resolution_cache import RESOLUTION_CACHE
 
 # simple in-memory human override registry
 HUMAN_OVERRIDES = {}
@@ -19,6 +22,7 @@ def set_override(entity, value, reason="manual override", identity_id=None, sign
         "value": value,
         "reason": reason
     }
+    _invalidate(entity)
 
     # audit log
     log_event("SET_OVERRIDE", {
@@ -43,6 +47,7 @@ def clear_override(entity, reason="manual clear", identity_id=None, signature_ve
 
     if entity in HUMAN_OVERRIDES:
         del HUMAN_OVERRIDES[entity]
+        _invalidate(entity)
 
         log_event("CLEAR_OVERRIDE", {
             "actor": "HUMAN_ADMIN",
@@ -64,4 +69,13 @@ def check_override(entity):
     Called by resolver.
     If override exists → resolver MUST obey.
     """
-    return HUMAN_OVERRIDES.get(entity)
\ No newline at end of file
+    return HUMAN_OVERRIDES.get(entity)
+
+
+def _invalidate(entity):
+    """
+    Stored / memoized resolutions of entity no longer hold.
+    """
+    RESOLUTION_CACHE.invalidate(entity)
+    with use_shard(shard_of(entity)), transaction() as conn:
+        mark_dirty(conn, [(entity, 0)])
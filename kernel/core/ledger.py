@@ -2,26 +2,60 @@
 v0.11 – Ledger (SQLite-backed, STABLE)
 
 Responsibilities:
-- Store claims in SQLite
+- Store claims in SQLite (in the entity's shard, see memory_db),
+  appended, or upserted per (agent, entity) (opt-in, CRE_CLAIM_UPSERT)
 - Resolve entities using consensus
 - Persist resolutions in SQLite
-- Update agent trust based on outcomes (JSON trust)
-- Apply global trust decay (safe stub)
+- Update agent trust based on outcomes (JSON trust),
+  once per claim (learning watermarks)
+- Trust decays lazily at read time (kernel.core.trust), not per resolve
 - Respect human overrides
+- Per-request route entities (one reply each) are neither marked dirty
+  nor credited by consensus
 """
 
+import os
 import time
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
 
-from kernel.core.audit import log_event
+from kernel.core.audit import log_event, log_events
 from kernel.core.governance import check_override
-from kernel.core.consensus import resolve_consensus
+from kernel.core.consensus import resolve_ranked_consensus
+from kernel.core.batch_consensus import resolve_consensus_batch
+from kernel.core.claim_values import get_values, store_values, value_hash
 from kernel.core.trust import (
     get_trust,
-    update_trust,
-    decay_all_agents,
+    get_trust_many,
 )
-from kernel.core.memory_db import get_connection
+from kernel.core.dirty_entities import clear_dirty, mark_dirty
+from kernel.core.memory_db import (
+    SQL_BATCH_SIZE,
+    connection,
+    shard_of,
+    transaction,
+    use_shard,
+)
+from kernel.core.outbox import on_shard_commit
+from kernel.core.resolution_cache import RESOLUTION_CACHE
+from kernel.core.route_summary import is_request_entity
+from kernel.core.value_scores import (
+    bump_value_scores,
+    get_high_water_mark,
+    get_high_water_marks,
+    get_top_value_scores,
+    get_value_scores_many,
+    refresh_value_scores,
+)
+
+# =================================================
+# Configuration
+# =================================================
+
+# Default claim mode: "1" keeps one claim per (agent, entity) – the
+# latest value / confidence plus a submission counter – instead of
+# appending every submission. add_claim / add_claims_bulk(upsert=...)
+# override it per call.
+CLAIM_UPSERT = os.environ.get("CRE_CLAIM_UPSERT", "0") == "1"
 
 
 # =================================================
@@ -35,27 +69,41 @@ def add_claim(
     confidence: float,
     identity_id: Optional[str] = None,
     signature_verified: bool = False,
+    upsert: Optional[bool] = None,
 ) -> Dict:
     """
     Store a new claim into SQLite with live trust snapshot.
+
+    upsert (default CLAIM_UPSERT): replace the agent's previous upserted
+    claim on the entity; the result then also carries "submissions" and
+    "replaces" (the superseded claim id or None).
     """
+    if CLAIM_UPSERT if upsert is None else upsert:
+        claim = {
+            "agent": agent,
+            "entity": entity,
+            "value": value,
+            "confidence": float(confidence),
+            "identity_id": identity_id,
+            "signature_verified": signature_verified,
+        }
+        return add_claims_bulk([claim], upsert=True)[0]
+
     trust = get_trust(agent)
     ts = time.time()
 
-    conn = get_connection()
-    cur = conn.cursor()
-
-    cur.execute(
-        """
-        INSERT INTO claims (agent, entity, value, confidence, trust, timestamp)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (agent, entity, value, float(confidence), trust, ts),
-    )
-
-    claim_id = cur.lastrowid
-    conn.commit()
-    conn.close()
+    with use_shard(shard_of(entity)), transaction() as conn:
+        (digest,) = store_values(conn, [value])
+        cur = conn.execute(
+            """
+            INSERT INTO claims (agent, entity, value_hash, confidence, trust, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (agent, entity, digest, float(confidence), trust, ts),
+        )
+        claim_id = cur.lastrowid
+        bump_value_scores(conn, [(claim_id, entity, digest, confidence, trust)])
+        _mark_dirty(conn, [(entity, claim_id)])
 
     claim = {
         "id": claim_id,
@@ -73,18 +121,257 @@ def add_claim(
     return claim
 
 
+def _mark_dirty(conn, marks: Iterable[Tuple[str, int]]) -> None:
+    """
+    mark_dirty, minus per-request route entities (nothing to sweep).
+    """
+    mark_dirty(conn, [(e, claim_id) for e, claim_id in marks if not is_request_entity(e)])
+
+
+def _validate_claim(item: Dict) -> Dict:
+    """
+    Normalize one bulk claim item, raising ValueError if unusable.
+    """
+    if not isinstance(item, dict):
+        raise ValueError("claim must be an object")
+
+    for field in ("agent", "entity", "value"):
+        if not isinstance(item.get(field), str) or not item[field]:
+            raise ValueError(f"'{field}' must be a non-empty string")
+
+    try:
+        confidence = float(item.get("confidence"))
+    except (TypeError, ValueError):
+        raise ValueError("'confidence' must be a number")
+
+    return {
+        "agent": item["agent"],
+        "entity": item["entity"],
+        "value": item["value"],
+        "confidence": confidence,
+        "identity_id": item.get("identity_id"),
+        "signature_verified": bool(item.get("signature_verified", False)),
+    }
+
+
+def add_claims_bulk(claims: Iterable[Dict], upsert: Optional[bool] = None) -> List[Dict]:
+    """
+    Store many claims at once:
+    - one trust lookup for all distinct agents
+    - one executemany INSERT in one transaction (per shard)
+    - one buffered audit append
+
+    Returns one result per input item, in order:
+    the stored claim (same shape as add_claim), or
+    {"error": reason} for items that failed validation (not stored).
+
+    upsert: see add_claim (items of one batch upsert in order).
+    """
+    upsert = CLAIM_UPSERT if upsert is None else upsert
+    results: List[Dict] = []
+    valid: List[tuple] = []
+
+    for item in claims:
+        try:
+            valid.append((len(results), _validate_claim(item)))
+            results.append({})
+        except ValueError as e:
+            results.append({"error": str(e)})
+
+    if not valid:
+        return results
+
+    ts = time.time()
+    trust_map = get_trust_many(c["agent"] for _, c in valid)
+
+    by_shard: Dict[int, List[tuple]] = {}
+    for index, c in valid:
+        by_shard.setdefault(shard_of(c["entity"]), []).append((index, c))
+
+    stored: Dict[int, tuple] = {}
+    for shard, part in by_shard.items():
+        with use_shard(shard), transaction() as conn:
+            if upsert:
+                rows = _upsert_claims(conn, [c for _, c in part], trust_map, ts)
+            else:
+                first_id = _insert_claims(conn, [c for _, c in part], trust_map, ts)
+                rows = [(first_id + offset,) for offset in range(len(part))]
+        stored.update((index, row) for (index, _), row in zip(part, rows))
+
+    for index, c in valid:
+        claim_id, *upserted = stored[index]
+        results[index] = {
+            "id": claim_id,
+            "agent": c["agent"],
+            "entity": c["entity"],
+            "value": c["value"],
+            "confidence": c["confidence"],
+            "trust": trust_map[c["agent"]],
+            "timestamp": ts,
+            "identity_id": c["identity_id"],
+            "signature_verified": c["signature_verified"],
+        }
+        if upserted:
+            results[index]["submissions"], results[index]["replaces"] = upserted
+
+    log_events(("CLAIM_ADDED", results[index]) for index, _ in valid)
+    return results
+
+
+def _insert_claims(conn, claims: List[Dict], trust_map: Dict[str, float], ts: float) -> int:
+    """
+    Insert validated claims of ONE shard; returns the first claim id.
+    """
+    digests = store_values(conn, (c["value"] for c in claims))
+
+    conn.executemany(
+        """
+        INSERT INTO claims (agent, entity, value_hash, confidence, trust, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (c["agent"], c["entity"], digest, c["confidence"], trust_map[c["agent"]], ts)
+            for c, digest in zip(claims, digests)
+        ],
+    )
+
+    # One writer holds the lock for the whole batch, so the
+    # AUTOINCREMENT ids of this executemany are contiguous.
+    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    first_id = last_id - len(claims) + 1
+
+    bump_value_scores(
+        conn,
+        [
+            (first_id + offset, c["entity"], digest, c["confidence"], trust_map[c["agent"]])
+            for offset, (c, digest) in enumerate(zip(claims, digests))
+        ],
+    )
+    _mark_dirty(
+        conn,
+        {c["entity"]: first_id + offset for offset, c in enumerate(claims)}.items(),
+    )
+    return first_id
+
+
+def _upsert_claims(
+    conn, claims: List[Dict], trust_map: Dict[str, float], ts: float
+) -> List[Tuple[int, int, Optional[int]]]:
+    """
+    Upsert validated claims of ONE shard: one row per (agent, entity).
+
+    Every submission takes a new claim id (the row's id moves forward),
+    so high-water marks, dirty marks and learning watermarks see it as
+    new. Returns (id, submissions, replaced claim id or None) per claim.
+    """
+    digests = store_values(conn, (c["value"] for c in claims))
+
+    pairs = list({(c["agent"], c["entity"]): None for c in claims})
+    current: Dict[Tuple[str, str], Tuple[int, int]] = {}
+    step = SQL_BATCH_SIZE // 2
+    for i in range(0, len(pairs), step):
+        chunk = pairs[i:i + step]
+        current.update(
+            ((r[0], r[1]), (r[2], r[3]))
+            for r in conn.execute(
+                # a join probes the unique index per pair ((agent, entity) IN
+                # (VALUES ...) scans all of it)
+                f"""
+                SELECT c.agent, c.entity, c.id, c.submissions
+                FROM (VALUES {",".join(["(?, ?)"] * len(chunk))}) AS p
+                JOIN claims c
+                  ON c.agent = p.column1 AND c.entity = p.column2 AND c.submissions IS NOT NULL
+                """,
+                [v for pair in chunk for v in pair],
+            )
+        )
+
+    # the writer holds the lock: ids next_id.. are ours (AUTOINCREMENT
+    # never reuses ids, archived ones included)
+    next_id = conn.execute(
+        "SELECT COALESCE(MAX(seq), 0) + 1 FROM sqlite_sequence WHERE name = 'claims'"
+    ).fetchone()[0]
+
+    rows: List[tuple] = []
+    stored: List[Tuple[int, int, Optional[int]]] = []
+    replaced: Dict[str, None] = {}
+    for offset, (c, digest) in enumerate(zip(claims, digests)):
+        claim_id = next_id + offset
+        key = (c["agent"], c["entity"])
+        previous = current.get(key)
+        if previous is None:
+            submissions, replaces = 1, None
+        else:
+            replaces, submissions = previous[0], previous[1] + 1
+            replaced[c["entity"]] = None
+        current[key] = (claim_id, submissions)
+        rows.append((claim_id, *key, digest, c["confidence"], trust_map[c["agent"]], ts, submissions))
+        stored.append((claim_id, submissions, replaces))
+
+    conn.executemany(
+        """
+        INSERT INTO claims
+            (id, agent, entity, value_hash, confidence, trust, timestamp, submissions)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(agent, entity) WHERE submissions IS NOT NULL DO UPDATE SET
+            id = excluded.id,
+            value_hash = excluded.value_hash,
+            confidence = excluded.confidence,
+            trust = excluded.trust,
+            timestamp = excluded.timestamp,
+            submissions = excluded.submissions
+        """,
+        rows,
+    )
+    # the UPDATE branch does not advance AUTOINCREMENT
+    conn.execute(
+        "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'claims'",
+        (next_id + len(claims) - 1,),
+    )
+
+    # a replaced claim leaves its value's score: recompute those entities
+    bump_value_scores(conn, [r[:1] + r[2:6] for r in rows if r[2] not in replaced])
+    if replaced:
+        refresh_value_scores(conn, list(replaced))
+    _mark_dirty(conn, {r[2]: r[0] for r in rows}.items())
+    return stored
+
+
 # =================================================
 # Entity resolution (READ → SQLite)
 # =================================================
 
 def resolve_entity(entity: str) -> Dict:
+    """
+    Memoized resolution.
+
+    If nothing that can change the outcome happened since the last
+    resolve (no new claim, no override change, same trust epoch), the
+    stored resolution is returned and NOTHING is written
+    (no resolutions row, no trust learning).
+    """
+    with use_shard(shard_of(entity)):
+        high_water_mark = get_high_water_mark(entity)
+        key = RESOLUTION_CACHE.key(high_water_mark)
+
+        cached = RESOLUTION_CACHE.get(entity, key)
+        if cached is not None:
+            return cached
+
+        with transaction() as conn:
+            record = _resolve_uncached(entity, high_water_mark)
+            clear_dirty(conn, [(entity, high_water_mark)])
+            RESOLUTION_CACHE.put(entity, key, record)
+    return record
+
+
+def _resolve_uncached(entity: str, high_water_mark: int) -> Dict:
     """
     Resolve an entity using:
     1. Human override
-    2. Consensus over SQLite claims
-    3. Global trust decay (safe stub)
-    4. Trust learning (confidence-weighted)
-    5. Resolution persistence
+    2. Consensus over the two best value scores (ranked in SQL)
+    3. Trust learning (confidence-weighted, claims not yet credited)
+    4. Resolution persistence
     """
 
     now = time.time()
@@ -94,61 +381,25 @@ def resolve_entity(entity: str) -> Dict:
     # -------------------------------------------------
     override = check_override(entity)
     if override:
-        record = {
-            "entity": entity,
-            "value": override["value"],
-            "status": "human_override",
-            "reason": override["reason"],
-            "timestamp": now,
-        }
-        _store_resolution(record)
+        record = _override_record(entity, override, now)
+        _store_resolutions([record])
         log_event("HUMAN_OVERRIDE_USED", record)
         return record
 
     # -------------------------------------------------
-    # 2. Load claims from SQLite
+    # 2. Load the two best value scores (+ claim / value counts)
     # -------------------------------------------------
-    conn = get_connection()
-    conn.row_factory = None
-    cur = conn.cursor()
+    top, total_claims, distinct_values = get_top_value_scores(entity)
 
-    cur.execute(
-        """
-        SELECT agent, value, confidence, trust
-        FROM claims
-        WHERE entity = ?
-        """,
-        (entity,),
-    )
-
-    rows = cur.fetchall()
-    conn.close()
-
-    if not rows:
-        record = {
-            "entity": entity,
-            "value": None,
-            "status": "unknown",
-            "reason": "No claims available",
-            "timestamp": now,
-        }
-        _store_resolution(record)
+    if not total_claims:
+        record = _unknown_record(entity, now)
+        _store_resolutions([record])
         return record
 
-    claims: List[Dict] = [
-        {
-            "agent": row[0],
-            "value": row[1],
-            "confidence": float(row[2]),
-            "trust": float(row[3]),
-        }
-        for row in rows
-    ]
-
     # -------------------------------------------------
     # 3. Consensus
     # -------------------------------------------------
-    result = resolve_consensus(claims)
+    result = _with_value_text(resolve_ranked_consensus(top, total_claims, distinct_values))
 
     log_event(
         "CONSENSUS_RESULT",
@@ -159,70 +410,327 @@ def resolve_entity(entity: str) -> Dict:
     )
 
     # -------------------------------------------------
-    # 4. Global trust decay (SAFE – stub in v0.11)
+    # 4. Trust learning (one batched transaction, once the shard commits)
     # -------------------------------------------------
-    decay_all_agents()
+    record = _consensus_record(entity, result, now)
+
+    if record["status"] == "resolved" and not is_request_entity(entity):
+        # per-agent claims only now, and only those past the learning watermark
+        updates = _learning_updates(_load_uncredited_claims([entity])[entity], record["value"])
+        if updates:
+            on_shard_commit("trust_deltas", {"updates": updates})
+        _advance_watermarks([(entity, high_water_mark)])
 
     # -------------------------------------------------
-    # 5. Trust learning
+    # 5. Persist resolution
     # -------------------------------------------------
-    if result["status"] == "resolved":
-        resolved_value = result["value"]
+    _store_resolutions([record])
+    return record
+
 
-        for c in claims:
-            update_trust(
-                agent=c["agent"],
-                correct=(c["value"] == resolved_value),
-                confidence=c["confidence"],
+# =================================================
+# Batch resolution (many entities, one pass)
+# =================================================
+
+def resolve_entities(
+    entities: Iterable[str],
+    scored: Optional[Dict[str, Tuple[int, Optional[Dict]]]] = None,
+) -> Dict[str, Dict]:
+    """
+    Resolve many entities at once:
+    - memo hits and human overrides first
+    - one score query + one vectorized consensus pass for the rest
+    - trust learning + resolution rows in one transaction
+
+    Same records, trust changes and cache behaviour as calling
+    resolve_entity() for each entity in order.
+
+    scored: optional score_entities() output computed elsewhere
+    (e.g. sweeper worker processes); entries whose high-water mark
+    moved since are re-scored here.
+
+    Sharded: one pass per shard, results merged in input order.
+    """
+    entities = list(dict.fromkeys(entities))
+    results: Dict[str, Dict] = {}
+
+    for shard, part in _by_shard(entities).items():
+        with use_shard(shard):
+            results.update(_resolve_shard(part, scored))
+
+    return {entity: results[entity] for entity in entities}
+
+
+def _resolve_shard(
+    entities: List[str],
+    scored: Optional[Dict[str, Tuple[int, Optional[Dict]]]],
+) -> Dict[str, Dict]:
+    """
+    resolve_entities for entities of the current shard.
+    """
+    now = time.time()
+
+    results: Dict[str, Dict] = {}
+    keys = {}
+    pending: List[str] = []
+    audit: List[tuple] = []
+
+    high_water_marks = get_high_water_marks(entities)
+
+    for entity in entities:
+        key = RESOLUTION_CACHE.key(high_water_marks.get(entity, 0))
+        cached = RESOLUTION_CACHE.get(entity, key)
+        if cached is not None:
+            results[entity] = cached
+            continue
+
+        keys[entity] = key
+        override = check_override(entity)
+        if override:
+            results[entity] = _override_record(entity, override, now)
+            audit.append(("HUMAN_OVERRIDE_USED", results[entity]))
+        else:
+            pending.append(entity)
+
+    # -------------------------------------------------
+    # Vectorized consensus over entity_value_scores
+    # -------------------------------------------------
+    scored = scored or {}
+    consensus = {
+        e: scored[e][1]
+        for e in pending
+        if e in scored and scored[e][0] == high_water_marks.get(e, 0)
+    }
+    consensus.update(_score([e for e in pending if e not in consensus]))
+
+    resolved = [
+        e for e in pending
+        if (consensus[e] or {}).get("status") == "resolved" and not is_request_entity(e)
+    ]
+    uncredited = _load_uncredited_claims(resolved)
+    updates: List[Dict] = []
+
+    for entity in pending:
+        result = consensus[entity]
+        if result is None:
+            results[entity] = _unknown_record(entity, now)
+            continue
+
+        audit.append(("CONSENSUS_RESULT", {"entity": entity, "result": result}))
+        results[entity] = _consensus_record(entity, result, now)
+        if entity in uncredited:
+            updates.extend(_learning_updates(uncredited[entity], result["value"]))
+
+    fresh = [results[e] for e in entities if e in keys]
+
+    with transaction() as conn:
+        if updates:
+            on_shard_commit("trust_deltas", {"updates": updates})
+        _advance_watermarks((e, high_water_marks.get(e, 0)) for e in resolved)
+        _store_resolutions(fresh)
+        clear_dirty(conn, ((e, high_water_marks.get(e, 0)) for e in entities))
+        for record in fresh:
+            RESOLUTION_CACHE.put(record["entity"], keys[record["entity"]], record)
+
+    log_events(audit)
+    return {entity: results[entity] for entity in entities}
+
+
+def score_entities(entities: List[str]) -> Dict[str, Tuple[int, Optional[Dict]]]:
+    """
+    Read-only consensus: {entity: (high-water mark, result or None)}.
+    Safe to run in another process (its own connection).
+    """
+    # high-water marks first: a claim landing in between makes the
+    # scores newer than the mark, so resolve_entities re-scores them
+    scored: Dict[str, Tuple[int, Optional[Dict]]] = {}
+
+    for shard, part in _by_shard(list(entities)).items():
+        with use_shard(shard):
+            high_water_marks = get_high_water_marks(part)
+            scored.update(
+                (entity, (high_water_marks.get(entity, 0), result))
+                for entity, result in _score(part).items()
             )
 
-        record = {
+    return {entity: scored[entity] for entity in entities}
+
+
+def _by_shard(entities: List[str]) -> Dict[int, List[str]]:
+    groups: Dict[int, List[str]] = {}
+    for entity in entities:
+        groups.setdefault(shard_of(entity), []).append(entity)
+    return groups
+
+
+def _score(entities: List[str]) -> Dict[str, Optional[Dict]]:
+    """
+    Batch consensus; None for entities without claims.
+    Grouping runs on value digests; only winning values are fetched as text.
+    """
+    rows = get_value_scores_many(entities)
+    consensus = resolve_consensus_batch(
+        [r[0] for r in rows],
+        [r[1] for r in rows],
+        [r[2] for r in rows],
+        [1.0] * len(rows),
+        [r[3] for r in rows],
+    ) if rows else {}
+
+    texts = get_values(r["value"] for r in consensus.values() if "value" in r)
+    return {
+        entity: _with_value_text(consensus[entity], texts) if entity in consensus else None
+        for entity in entities
+    }
+
+
+def _with_value_text(result: Dict, texts: Optional[Dict[bytes, str]] = None) -> Dict:
+    """
+    Consensus result with the winning digest replaced by its text.
+    """
+    if "value" not in result:
+        return result
+    if texts is None:
+        texts = get_values([result["value"]])
+    return {**result, "value": texts[result["value"]]}
+
+
+# =================================================
+# Internal helpers – resolution records
+# =================================================
+
+def _override_record(entity: str, override: Dict, now: float) -> Dict:
+    return {
+        "entity": entity,
+        "value": override["value"],
+        "status": "human_override",
+        "reason": override["reason"],
+        "timestamp": now,
+    }
+
+
+def _unknown_record(entity: str, now: float) -> Dict:
+    return {
+        "entity": entity,
+        "value": None,
+        "status": "unknown",
+        "reason": "No claims available",
+        "timestamp": now,
+    }
+
+
+def _consensus_record(entity: str, result: Dict, now: float) -> Dict:
+    if result["status"] == "resolved":
+        return {
             "entity": entity,
-            "value": resolved_value,
+            "value": result["value"],
             "status": "resolved",
             "reason": result["reason"],
             "timestamp": now,
         }
-    else:
-        record = {
-            "entity": entity,
-            "value": None,
-            "status": result["status"],
-            "reason": result.get("reason"),
-            "timestamp": now,
-        }
 
-    # -------------------------------------------------
-    # 6. Persist resolution
-    # -------------------------------------------------
-    _store_resolution(record)
-    return record
+    return {
+        "entity": entity,
+        "value": None,
+        "status": result["status"],
+        "reason": result.get("reason"),
+        "timestamp": now,
+    }
+
+
+def _learning_updates(claims: List[Dict], resolved_value: str) -> List[Dict]:
+    resolved_hash = value_hash(resolved_value)
+    return [
+        {
+            "agent": c["agent"],
+            "correct": c["value_hash"] == resolved_hash,
+            "confidence": c["confidence"],
+        }
+        for c in claims
+    ]
 
 
 # =================================================
-# Internal helper – persist resolution
+# Internal helpers – claims for trust learning
 # =================================================
 
-def _store_resolution(record: Dict) -> None:
+def _load_uncredited_claims(entities: List[str]) -> Dict[str, List[Dict]]:
+    """
+    Claims past each entity's learning watermark, in claim-id order –
+    hot ones and those archived for age before any resolved outcome.
     """
-    Store a resolution record into SQLite.
+    claims: Dict[str, List[Dict]] = {entity: [] for entity in entities}
+    batch = SQL_BATCH_SIZE // 2  # the IN list appears twice
+
+    with connection() as conn:
+        for i in range(0, len(entities), batch):
+            chunk = entities[i:i + batch]
+            placeholders = ",".join("?" * len(chunk))
+            for r in conn.execute(
+                f"""
+                SELECT c.id, c.entity, c.agent, c.value_hash, c.confidence
+                FROM claims c
+                LEFT JOIN learning_watermarks w ON w.entity = c.entity
+                WHERE c.entity IN ({placeholders})
+                  AND c.id > COALESCE(w.last_credited_claim_id, 0)
+                UNION ALL
+                SELECT a.id, a.entity, a.agent, a.value_hash, a.confidence
+                FROM claims_archive a
+                LEFT JOIN learning_watermarks w ON w.entity = a.entity
+                WHERE a.entity IN ({placeholders})
+                  AND a.id > COALESCE(w.last_credited_claim_id, 0)
+                ORDER BY 1
+                """,
+                (*chunk, *chunk),
+            ):
+                claims[r[1]].append(
+                    {"agent": r[2], "value_hash": r[3], "confidence": float(r[4])}
+                )
+
+    return claims
+
+
+def _advance_watermarks(marks: Iterable[Tuple[str, int]]) -> None:
     """
-    conn = get_connection()
-    cur = conn.cursor()
+    marks: (entity, newest claim id now credited).
+    """
+    with transaction() as conn:
+        conn.executemany(
+            """
+            INSERT INTO learning_watermarks (entity, last_credited_claim_id)
+            VALUES (?, ?)
+            ON CONFLICT(entity) DO UPDATE SET
+                last_credited_claim_id = MAX(last_credited_claim_id, excluded.last_credited_claim_id)
+            """,
+            list(marks),
+        )
 
-    cur.execute(
-        """
-        INSERT INTO resolutions (entity, value, status, reason, timestamp)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (
-            record.get("entity"),
-            record.get("value"),
-            record.get("status"),
-            record.get("reason"),
-            record.get("timestamp"),
-        ),
-    )
 
-    conn.commit()
-    conn.close()
\ No newline at end of file
+# =================================================
+# Internal helper – persist resolution
+# =================================================
+
+def _store_resolutions(records: List[Dict]) -> None:
+    """
+    Store resolution records into SQLite (one executemany).
+    """
+    if not records:
+        return
+
+    with transaction() as conn:
+        conn.executemany(
+            """
+            INSERT INTO resolutions (entity, value, status, reason, timestamp)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    record.get("entity"),
+                    record.get("value"),
+                    record.get("status"),
+                    record.get("reason"),
+                    record.get("timestamp"),
+                )
+                for record in records
+            ],
+        )
@@ -2,210 +2,589 @@
 v0.15 – SQLite Memory Layer (STABLE, SINGLE SOURCE OF TRUTH)
 
 Responsibilities:
-- Provide SQLite connection
-- Initialize all core tables
+- Provide SQLite connections (pooled, one long-lived connection per thread
+  and DB file)
+- Optionally shard entity-scoped tables across N files (CRE_DB_SHARDS)
+- Initialize all core tables (lazily, on first connection to a DB)
 - Persist trust, claims, resolutions
+- Register the SQL functions index expressions use (every connection)
 - Support Error Review Agent system
 """
 
+import math
+import os
 import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from kernel.core.migrations import apply_migrations
 
 # =================================================
 # Database Path
 # =================================================
+# CRE_DB_PATH=":memory:" → one shared-cache in-memory DB per process
+# (tests / benchmarks). Nothing touches the disk until first use.
+
+MEMORY_DB = ":memory:"
+MEMORY_DB_URI = "file:cre_memory?mode=memory&cache=shared"
 
-DB_PATH = Path("data/cre_memory.db")
+DB_PATH = Path(os.environ.get("CRE_DB_PATH", "data/cre_memory.db"))
 
 
 # =================================================
-# Connection Helper
+# Sharding (optional)
 # =================================================
+# CRE_DB_SHARDS=N > 1 → entity-scoped tables (claims, value scores,
+# resolutions, dirty marks, error reviews, ...) live in N files next to
+# DB_PATH, routed by shard_of(entity). trust, trust_events, penalty
+# events and the route summary stay in DB_PATH (the global store).
+# N = 1: every shard IS DB_PATH (unsharded, the default).
+#
+# Writes spanning the global store and a shard are two transactions
+# (SQLite cannot commit across files atomically): the global side of a
+# shard's unit of work is queued in the shard's outbox, in the shard
+# transaction, and applied to the global store after it commits
+# (kernel.core.outbox) – a rolled-back shard write never leaves trust
+# credited for it, a committed one is credited exactly once.
+
+SHARD_COUNT = max(1, int(os.environ.get("CRE_DB_SHARDS", "1")))
+
+
+def shard_of(entity: str, shards: Optional[int] = None) -> int:
+    """
+    Shard of an entity. Stable across processes (unlike hash()).
+    """
+    return zlib.crc32(entity.encode("utf-8")) % (shards or SHARD_COUNT)
+
 
-def get_connection() -> sqlite3.Connection:
+def shards() -> List[int]:
+    return list(range(SHARD_COUNT))
+
+
+def shard_path(shard: Optional[int]) -> Path:
     """
-    Return SQLite connection with Row access.
+    DB file of a shard (None = the global store).
     """
-    conn = sqlite3.connect(DB_PATH)
+    if shard is None or SHARD_COUNT <= 1:
+        return DB_PATH
+    if _is_memory(DB_PATH):
+        return Path(f"{MEMORY_DB}shard{shard}")
+    return DB_PATH.with_name(f"{DB_PATH.stem}.shard{shard}{DB_PATH.suffix}")
+
+
+# =================================================
+# Connection Tuning
+# =================================================
+# - WAL lets readers run while a writer commits
+# - synchronous=NORMAL skips the fsync per commit (WAL stays durable
+#   across application crashes, only an OS crash can lose the last commits)
+# - cache / mmap sizes are configurable per deployment
+
+CACHE_SIZE_KIB = int(os.environ.get("CRE_DB_CACHE_KIB", "16384"))
+MMAP_SIZE_BYTES = int(os.environ.get("CRE_DB_MMAP_BYTES", str(128 * 1024 * 1024)))
+BUSY_TIMEOUT_SECONDS = float(os.environ.get("CRE_DB_BUSY_TIMEOUT", "5.0"))
+
+# Max bound parameters per IN (...) list (SQLite default limit is 999)
+SQL_BATCH_SIZE = 500
+
+
+# Paths whose schema is already migrated in this process
+_initialized: set = set()
+_init_lock = threading.Lock()
+
+# Keep the shared in-memory DBs alive while pooled connections come and go
+_memory_anchors: Dict[str, sqlite3.Connection] = {}
+
+
+def _is_memory(path: Path) -> bool:
+    return str(path).startswith(MEMORY_DB)
+
+
+def _memory_uri(path: Path) -> str:
+    suffix = str(path)[len(MEMORY_DB):]
+    return MEMORY_DB_URI.replace("cre_memory", f"cre_memory_{suffix}") if suffix else MEMORY_DB_URI
+
+
+# =================================================
+# SQL Functions (registered on every connection)
+# =================================================
+# An index on an expression calling one of these is maintained by every
+# write to its table, so every connection must know them.
+
+def decay_key(
+    trust: float,
+    last_updated: Optional[float],
+    default: float,
+    half_life: float,
+) -> float:
+    """
+    Time-independent position of a decaying trust row. At any `now`,
+    DEFAULT + (trust - DEFAULT) × 2^(-(now - last_updated) / half-life)
+    orders rows like sign(trust - DEFAULT) ×
+    (log2|trust - DEFAULT| + last_updated / half-life), so an index on
+    it serves the decayed ranking at every time.
+
+    The + 64 keeps rows above DEFAULT positive and those below negative
+    (|trust - DEFAULT| > 2^-64, last_updated >= 0). A row decayed to
+    `now` is >= x exactly when its key is >= decay_key(x, now, ...).
+    """
+    diff = float(trust) - default
+    if diff == 0:
+        return 0.0
+    magnitude = math.log2(abs(diff)) + float(last_updated or 0.0) / half_life + 64.0
+    return magnitude if diff > 0 else -magnitude
+
+
+def _open_connection(path: Path, pooled: bool = False) -> sqlite3.Connection:
+    """
+    Open a tuned SQLite connection with Row access.
+
+    The first connection to a DB migrates its schema (lazy init_db).
+    Pooled connections are only ever USED by their owning thread,
+    but close_connections() may close them from another thread.
+    """
+    if _is_memory(path):
+        target, uri = _memory_uri(path), True
+    else:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        target, uri = path, False
+
+    conn = sqlite3.connect(
+        target,
+        timeout=BUSY_TIMEOUT_SECONDS,
+        check_same_thread=not pooled,
+        uri=uri,
+    )
     conn.row_factory = sqlite3.Row
+
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA cache_size=-{int(CACHE_SIZE_KIB)}")
+    conn.execute(f"PRAGMA mmap_size={int(MMAP_SIZE_BYTES)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.create_function("cre_decay_key", 4, decay_key, deterministic=True)
+
+    key = str(path)
+    if key not in _initialized:
+        with _init_lock:
+            if key not in _initialized:
+                if _is_memory(path) and key not in _memory_anchors:
+                    _memory_anchors[key] = sqlite3.connect(
+                        target, uri=True, check_same_thread=False
+                    )
+                apply_migrations(conn)
+                _initialized.add(key)
+
     return conn
 
 
 # =================================================
-# DB Initialization (CALLED ON IMPORT)
+# Connection Helper (caller-owned, legacy)
 # =================================================
 
-def init_db() -> None:
+def get_connection(path: Optional[Path] = None) -> sqlite3.Connection:
     """
-    Create all required tables if not exist.
+    Return a NEW SQLite connection with Row access (default: DB_PATH).
+
+    The caller owns it and must close it.
+    Kernel modules use connection() / transaction() instead.
     """
-    conn = get_connection()
-    cur = conn.cursor()
+    return _open_connection(path if path is not None else DB_PATH)
 
-    # ------------------------------
-    # Trust table
-    # ------------------------------
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS trust (
-        agent TEXT PRIMARY KEY,
-        trust REAL NOT NULL,
-        last_updated REAL
-    )
-    """)
-
-    # ------------------------------
-    # Trust events (explainability)
-    # ------------------------------
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS trust_events (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        agent TEXT NOT NULL,
-        change REAL NOT NULL,
-        reason TEXT NOT NULL,
-        confidence REAL,
-        timestamp REAL NOT NULL
-    )
-    """)
-
-    # ------------------------------
-    # Claims
-    # ------------------------------
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS claims (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        agent TEXT NOT NULL,
-        entity TEXT NOT NULL,
-        value TEXT NOT NULL,
-        confidence REAL NOT NULL,
-        trust REAL NOT NULL,
-        timestamp REAL NOT NULL
-    )
-    """)
-
-    # ------------------------------
-    # Resolutions
-    # ------------------------------
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS resolutions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        entity TEXT NOT NULL,
-        value TEXT,
-        status TEXT NOT NULL,
-        reason TEXT,
-        timestamp REAL NOT NULL
-    )
-    """)
 
-    # ------------------------------
-    # Error reviews (Agent → Agent)
-    # ------------------------------
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS error_reviews (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
+# =================================================
+# Connection Pool (one connection per thread and DB file)
+# =================================================
 
-        reviewer_agent TEXT NOT NULL,
-        target_agent   TEXT NOT NULL,
+_local = threading.local()
+_pool_lock = threading.Lock()
+_pool: List[sqlite3.Connection] = []
+_pool_generation = 0
+_close_hooks: List[Callable[[], None]] = []
 
-        entity TEXT NOT NULL,
 
-        observed_value TEXT,
-        expected_value TEXT,
+class _ThreadDB:
+    """
+    One thread's pooled connection to one DB file + its transaction state.
+    """
 
-        error_type TEXT NOT NULL,
-        confidence REAL NOT NULL,
+    __slots__ = ("conn", "tx_depth", "commit_hooks", "rollback_hooks")
 
-        evidence TEXT,
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.tx_depth = 0
+        self.commit_hooks: List[Callable[[], None]] = []
+        self.rollback_hooks: List[Callable[[], None]] = []
 
-        timestamp REAL NOT NULL
-    )
-    """)
 
-    # ------------------------------
-    # Error resolutions (consensus)
-    # ------------------------------
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS error_resolutions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
+@contextmanager
+def use_shard(shard: Optional[int]) -> Iterator[None]:
+    """
+    Route this thread's connection() / transaction() to a shard
+    (None = the global store) for the duration of the block.
+    """
+    previous = getattr(_local, "shard", None)
+    _local.shard = shard
+    try:
+        yield
+    finally:
+        _local.shard = previous
 
-        entity TEXT NOT NULL,
-        target_agent TEXT NOT NULL,
 
-        status TEXT NOT NULL,
-        error_type TEXT,
+def routed_shard() -> Optional[int]:
+    """
+    Shard this thread's connection() is routed to
+    (None = the global store, which every shard is when not sharded).
+    """
+    if SHARD_COUNT <= 1:
+        return None
+    return getattr(_local, "shard", None)
 
-        reason TEXT,
 
-        reviewer_count INTEGER,
-        avg_confidence REAL,
+def use_global():
+    """
+    use_shard(None): trust and other non-entity tables.
+    """
+    return use_shard(None)
+
+
+T = TypeVar("T")
 
-        timestamp REAL NOT NULL
-    )
-    """)
-
-    # ------------------------------
-    # Error penalty events (audit)
-    # ------------------------------
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS error_penalty_events (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        agent TEXT NOT NULL,
-        entity TEXT NOT NULL,
-        error_type TEXT NOT NULL,
-        weight REAL NOT NULL,
-        confidence REAL NOT NULL,
-        final_penalty_strength REAL NOT NULL,
-        reason TEXT NOT NULL,
-        timestamp REAL NOT NULL
-    )
-    """)
 
-    conn.commit()
-    conn.close()
+def fan_out(query: Callable[[sqlite3.Connection], T]) -> List[T]:
+    """
+    Run query(conn) on every shard (in shard order) – the caller merges.
+    """
+    results = []
+    for shard in shards():
+        with use_shard(shard), connection() as conn:
+            results.append(query(conn))
+    return results
 
 
-# 🔥 IMPORTANT: initialize DB on import
-init_db()
+def _thread_dbs() -> Dict[Path, _ThreadDB]:
+    # close_connections() since last use → every connection is gone
+    if getattr(_local, "generation", None) != _pool_generation:
+        _local.dbs = {}
+        _local.generation = _pool_generation
+    return _local.dbs
+
+
+def _current_path() -> Path:
+    return shard_path(getattr(_local, "shard", None))
+
+
+def _thread_db() -> _ThreadDB:
+    """
+    This thread's long-lived connection to the routed DB, opened on first use.
+
+    A connection is reopened when DB_PATH changes or after close_connections().
+    """
+    dbs = _thread_dbs()
+    path = _current_path()
+    db = dbs.get(path)
+    if db is not None:
+        return db
+
+    conn = _open_connection(path, pooled=True)
+    with _pool_lock:
+        _pool.append(conn)
+        if _local.generation != _pool_generation:
+            # close_connections() ran meanwhile: the others are gone, this one is new
+            dbs = _local.dbs = {}
+            _local.generation = _pool_generation
+
+    db = dbs[path] = _ThreadDB(conn)
+    return db
+
+
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    """
+    Borrow this thread's pooled connection (read access).
+
+    Do NOT close it – it is reused by every call on this thread.
+    """
+    yield _thread_db().conn
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Run a block of writes as ONE transaction on the pooled connection.
+
+    - commits on success, rolls back on error
+    - nested transaction() blocks on the same DB join the outermost one
+      (a single commit for the whole unit of work)
+    - on_commit / on_rollback hooks fire once the outermost block ends
+    """
+    db = _thread_db()
+    conn = db.conn
+    depth = db.tx_depth
+    db.tx_depth = depth + 1
+
+    if depth == 0:
+        db.commit_hooks = []
+        db.rollback_hooks = []
+
+    try:
+        yield conn
+        if depth == 0:
+            conn.commit()
+    except BaseException:
+        if depth == 0:
+            conn.rollback()
+            hooks, db.rollback_hooks = db.rollback_hooks, []
+            for hook in reversed(hooks):
+                hook()
+        raise
+    finally:
+        db.tx_depth = depth
+
+    if depth == 0:
+        hooks, db.commit_hooks = db.commit_hooks, []
+        _run_hooks(hooks)
+
+
+class CommitHookError(Exception):
+    """
+    An on_commit hook failed AFTER its transaction committed: the
+    writes are durable (the hook's error is the __cause__).
+    """
+
+
+def _run_hooks(hooks: List[Callable[[], None]]) -> None:
+    # the transaction is committed: one failing hook must not skip the rest
+    error: Optional[BaseException] = None
+    for hook in hooks:
+        try:
+            hook()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise CommitHookError(f"after-commit hook failed: {error}") from error
+
+
+@contextmanager
+def savepoint() -> Iterator[sqlite3.Connection]:
+    """
+    All-or-nothing block INSIDE a transaction (SQLite SAVEPOINT).
+
+    On error only this block is rolled back (and its on_rollback hooks
+    run); the surrounding transaction stays usable.
+    """
+    with transaction() as conn:
+        db = _thread_db()
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+
+        name = f"sp_{db.tx_depth}"
+        commit_mark = len(db.commit_hooks)
+        rollback_mark = len(db.rollback_hooks)
+
+        conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {name}")
+            conn.execute(f"RELEASE {name}")
+
+            hooks = db.rollback_hooks[rollback_mark:]
+            del db.rollback_hooks[rollback_mark:]
+            del db.commit_hooks[commit_mark:]
+            for hook in reversed(hooks):
+                hook()
+            raise
+
+        conn.execute(f"RELEASE {name}")
+
+
+@contextmanager
+def snapshot() -> Iterator[sqlite3.Connection]:
+    """
+    Several reads that must see ONE state of the DB: a deferred
+    transaction that only reads (no write lock). Inside a transaction()
+    it simply joins it.
+    """
+    with transaction() as conn:
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        yield conn
+
+
+def in_transaction() -> bool:
+    """
+    True while this thread is inside a transaction() block on the routed DB.
+    """
+    db = _thread_dbs().get(_current_path())
+    return db is not None and db.tx_depth > 0
+
+
+def on_commit(hook: Callable[[], None]) -> None:
+    """
+    Run hook after the current transaction commits (now if none is open).
+    """
+    if in_transaction():
+        _thread_db().commit_hooks.append(hook)
+    else:
+        hook()
+
+
+def on_rollback(hook: Callable[[], None]) -> None:
+    """
+    Run hook if the current transaction rolls back (no-op outside one).
+    """
+    if in_transaction():
+        _thread_db().rollback_hooks.append(hook)
+
+
+def on_close(hook: Callable[[], None]) -> None:
+    """
+    Register a hook run by close_connections() BEFORE connections close
+    (e.g. flushing write-behind caches).
+    """
+    _close_hooks.append(hook)
+
+
+def close_connections() -> None:
+    """
+    Close every pooled connection (shutdown / tests).
+
+    Threads transparently reopen a connection on next use.
+    """
+    global _pool_generation
+
+    for hook in _close_hooks:
+        hook()
+
+    with _pool_lock:
+        for conn in _pool:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _pool.clear()
+        _pool_generation += 1
+
+
+# =================================================
+# DB Initialization (LAZY – first connection per DB)
+# =================================================
+
+def init_db() -> None:
+    """
+    Bring the schema up to date (see kernel.core.migrations).
+
+    Optional: the first connection does this anyway.
+    Call it at startup to keep migrations off the first request.
+    Covers the global store and every shard.
+    """
+    for shard in [None, *shards()]:
+        with use_shard(shard), connection() as conn:
+            apply_migrations(conn)
+
+
+def configure(db_path, shard_count: Optional[int] = None) -> None:
+    """
+    Point the memory layer at another DB (path or ":memory:"),
+    optionally changing the shard count.
+
+    Pending cache writes are flushed to the current DB first.
+    """
+    global DB_PATH, SHARD_COUNT
+
+    close_connections()
+
+    with _init_lock:
+        for key, anchor in _memory_anchors.items():
+            anchor.close()
+            _initialized.discard(key)
+        _memory_anchors.clear()
+
+    DB_PATH = Path(db_path)
+    if shard_count is not None:
+        SHARD_COUNT = max(1, int(shard_count))
 
 
 # =================================================
-# Trust Helpers (USED BY trust.py)
+# Trust Helpers (USED BY trust.py, global store)
 # =================================================
 
 def db_get_trust(agent: str) -> Optional[float]:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT trust FROM trust WHERE agent = ?",
-        (agent,),
-    )
-    row = cur.fetchone()
-    conn.close()
+    with use_global(), connection() as conn:
+        row = conn.execute(
+            "SELECT trust FROM trust WHERE agent = ?",
+            (agent,),
+        ).fetchone()
     return row["trust"] if row else None
 
 
 def db_set_trust(agent: str, trust: float) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO trust (agent, trust, last_updated)
-        VALUES (?, ?, strftime('%s','now'))
-        ON CONFLICT(agent)
-        DO UPDATE SET
-            trust = excluded.trust,
-            last_updated = excluded.last_updated
-        """,
-        (agent, trust),
-    )
-    conn.commit()
-    conn.close()
+    with use_global(), transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO trust (agent, trust, last_updated)
+            VALUES (?, ?, strftime('%s','now'))
+            ON CONFLICT(agent)
+            DO UPDATE SET
+                trust = excluded.trust,
+                last_updated = excluded.last_updated
+            """,
+            (agent, trust),
+        )
+
+
+def db_get_trust_many(agents: Iterable[str]) -> Dict[str, float]:
+    """
+    Trust for many agents in as few queries as possible.
+    Unknown agents are simply absent from the result.
+    """
+    agents = list(dict.fromkeys(agents))
+    found: Dict[str, float] = {}
+
+    with use_global(), connection() as conn:
+        for i in range(0, len(agents), SQL_BATCH_SIZE):
+            chunk = agents[i:i + SQL_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT agent, trust FROM trust WHERE agent IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            found.update((r["agent"], r["trust"]) for r in rows)
+
+    return found
+
+
+def db_get_trust_rows_many(agents: Iterable[str]) -> Dict[str, Tuple[float, Optional[float]]]:
+    """
+    (trust, last_updated) for many agents (unknown agents absent).
+    """
+    agents = list(dict.fromkeys(agents))
+    found: Dict[str, Tuple[float, Optional[float]]] = {}
+
+    with use_global(), connection() as conn:
+        for i in range(0, len(agents), SQL_BATCH_SIZE):
+            chunk = agents[i:i + SQL_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT agent, trust, last_updated FROM trust WHERE agent IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            found.update((r["agent"], (r["trust"], r["last_updated"])) for r in rows)
+
+    return found
+
+
+def db_get_all_trust_rows() -> Dict[str, Tuple[float, Optional[float]]]:
+    with use_global(), connection() as conn:
+        rows = conn.execute("SELECT agent, trust, last_updated FROM trust").fetchall()
+    return {r["agent"]: (r["trust"], r["last_updated"]) for r in rows}
 
 
 def db_get_all_trust() -> Dict[str, float]:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT agent, trust FROM trust")
-    rows = cur.fetchall()
-    conn.close()
+    with use_global(), connection() as conn:
+        rows = conn.execute("SELECT agent, trust FROM trust").fetchall()
     return {r["agent"]: r["trust"] for r in rows}
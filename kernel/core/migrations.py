@@ -0,0 +1,676 @@
+"""
+v0.16 – Schema Migrations (PRAGMA user_version)
+
+Responsibilities:
+- Versioned, forward-only schema changes
+- Each migration runs in its own transaction together with
+  the user_version bump (all-or-nothing)
+- Safe when several processes start at once (BEGIN IMMEDIATE + re-check)
+- Replaces the ad-hoc migrate_trust*.py scripts
+
+Usage:
+    python -m kernel.core.migrations [db_path]
+"""
+
+import sqlite3
+import time
+from typing import Callable, List, Tuple
+
+
+def _v1_base_schema(cur: sqlite3.Cursor) -> None:
+    """
+    Core tables (v0.15 layout). IF NOT EXISTS keeps pre-migration DBs valid.
+    """
+    # ------------------------------
+    # Trust table
+    # ------------------------------
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS trust (
+        agent TEXT PRIMARY KEY,
+        trust REAL NOT NULL,
+        last_updated REAL
+    )
+    """)
+
+    # ------------------------------
+    # Trust events (explainability)
+    # ------------------------------
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS trust_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        agent TEXT NOT NULL,
+        change REAL NOT NULL,
+        reason TEXT NOT NULL,
+        confidence REAL,
+        timestamp REAL NOT NULL
+    )
+    """)
+
+    # ------------------------------
+    # Claims
+    # ------------------------------
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS claims (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        agent TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        value TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        trust REAL NOT NULL,
+        timestamp REAL NOT NULL
+    )
+    """)
+
+    # ------------------------------
+    # Resolutions
+    # ------------------------------
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS resolutions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        entity TEXT NOT NULL,
+        value TEXT,
+        status TEXT NOT NULL,
+        reason TEXT,
+        timestamp REAL NOT NULL
+    )
+    """)
+
+    # ------------------------------
+    # Error reviews (Agent → Agent)
+    # ------------------------------
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS error_reviews (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+        reviewer_agent TEXT NOT NULL,
+        target_agent   TEXT NOT NULL,
+
+        entity TEXT NOT NULL,
+
+        observed_value TEXT,
+        expected_value TEXT,
+
+        error_type TEXT NOT NULL,
+        confidence REAL NOT NULL,
+
+        evidence TEXT,
+
+        timestamp REAL NOT NULL
+    )
+    """)
+
+    # ------------------------------
+    # Error resolutions (consensus)
+    # ------------------------------
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS error_resolutions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+        entity TEXT NOT NULL,
+        target_agent TEXT NOT NULL,
+
+        status TEXT NOT NULL,
+        error_type TEXT,
+
+        reason TEXT,
+
+        reviewer_count INTEGER,
+        avg_confidence REAL,
+
+        timestamp REAL NOT NULL
+    )
+    """)
+
+    # ------------------------------
+    # Error penalty events (audit)
+    # ------------------------------
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS error_penalty_events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        agent TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        error_type TEXT NOT NULL,
+        weight REAL NOT NULL,
+        confidence REAL NOT NULL,
+        final_penalty_strength REAL NOT NULL,
+        reason TEXT NOT NULL,
+        timestamp REAL NOT NULL
+    )
+    """)
+
+
+def _v2_trust_last_updated(cur: sqlite3.Cursor) -> None:
+    """
+    trust.last_updated for DBs created before v0.12 (was migrate_trust*.py).
+    """
+    columns = {row[1] for row in cur.execute("PRAGMA table_info(trust)")}
+    if "last_updated" not in columns:
+        cur.execute("ALTER TABLE trust ADD COLUMN last_updated REAL")
+
+    cur.execute(
+        "UPDATE trust SET last_updated = ? WHERE last_updated IS NULL",
+        (time.time(),),
+    )
+
+
+def _v3_hot_path_indexes(cur: sqlite3.Cursor) -> None:
+    """
+    Indexes for every query the ledger and the API run per request.
+    """
+    # resolve_entity: claims WHERE entity = ?
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_claims_entity ON claims(entity)")
+
+    # /trust/timeline: WHERE agent = ? ORDER BY timestamp
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_trust_events_agent_ts "
+        "ON trust_events(agent, timestamp)"
+    )
+
+    # /trust/events: ORDER BY timestamp DESC LIMIT ?
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_trust_events_ts "
+        "ON trust_events(timestamp)"
+    )
+
+    # apply_error_penalties: WHERE entity = ? GROUP BY target_agent, error_type
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_error_reviews_entity "
+        "ON error_reviews(entity, target_agent, error_type)"
+    )
+
+    # /audit/error-reviews: ORDER BY timestamp DESC LIMIT ?
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_error_reviews_ts "
+        "ON error_reviews(timestamp)"
+    )
+
+    # latest resolution per entity
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_resolutions_entity_ts "
+        "ON resolutions(entity, timestamp)"
+    )
+
+
+def _v4_claim_archive(cur: sqlite3.Cursor) -> None:
+    """
+    Cold storage for claims (see kernel.core.archive).
+    """
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS claims_archive (
+        id INTEGER PRIMARY KEY,
+        agent TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        value TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        trust REAL NOT NULL,
+        timestamp REAL NOT NULL,
+        archived_at REAL NOT NULL
+    )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_claims_archive_entity "
+        "ON claims_archive(entity)"
+    )
+
+    # Consensus input for the archived portion of an entity
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS claim_archive_aggregates (
+        entity TEXT NOT NULL,
+        value TEXT NOT NULL,
+        score REAL NOT NULL,
+        count INTEGER NOT NULL,
+        first_claim_id INTEGER NOT NULL,
+        PRIMARY KEY (entity, value)
+    )
+    """)
+
+    # retention scan: claims WHERE timestamp < ?
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_claims_timestamp ON claims(timestamp)")
+
+
+def _v5_entity_value_scores(cur: sqlite3.Cursor) -> None:
+    """
+    Per-(entity, value) consensus scores, maintained on claim insert
+    (see kernel.core.value_scores). Supersedes claim_archive_aggregates.
+    """
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS entity_value_scores (
+        entity TEXT NOT NULL,
+        value TEXT NOT NULL,
+        score REAL NOT NULL,
+        count INTEGER NOT NULL,
+        first_claim_id INTEGER NOT NULL,
+        last_claim_id INTEGER NOT NULL,
+        PRIMARY KEY (entity, value)
+    )
+    """)
+    cur.execute("DROP TABLE IF EXISTS claim_archive_aggregates")
+
+    # Backfill in claim-id order (same float summation as add_claim)
+    scores = {}
+    for entity, value, score, claim_id in cur.execute("""
+        SELECT entity, value, confidence * trust, id FROM claims
+        UNION ALL
+        SELECT entity, value, confidence * trust, id FROM claims_archive
+        ORDER BY 4
+    """).fetchall():
+        s = scores.setdefault((entity, value), [0.0, 0, claim_id, claim_id])
+        s[0] += score
+        s[1] += 1
+        s[3] = claim_id
+
+    cur.executemany(
+        """
+        INSERT INTO entity_value_scores
+            (entity, value, score, count, first_claim_id, last_claim_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [(e, v, *s) for (e, v), s in scores.items()],
+    )
+
+
+def _v6_dirty_entities(cur: sqlite3.Cursor) -> None:
+    """
+    Entities whose stored resolution is stale (see kernel.core.dirty_entities).
+    """
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS dirty_entities (
+        entity TEXT PRIMARY KEY,
+        last_claim_id INTEGER NOT NULL,
+        dirtied_at REAL NOT NULL
+    )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dirty_entities_dirtied_at "
+        "ON dirty_entities(dirtied_at)"
+    )
+
+    # Nothing says which existing resolutions are current → sweep everything once
+    cur.execute(
+        """
+        INSERT OR IGNORE INTO dirty_entities (entity, last_claim_id, dirtied_at)
+        SELECT entity, MAX(last_claim_id), ?
+        FROM entity_value_scores
+        GROUP BY entity
+        """,
+        (time.time(),),
+    )
+
+
+def _v7_learning_watermarks(cur: sqlite3.Cursor) -> None:
+    """
+    Newest claim id already credited to trust, per entity
+    (trust learning applies once per claim).
+    """
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS learning_watermarks (
+        entity TEXT PRIMARY KEY,
+        last_credited_claim_id INTEGER NOT NULL
+    )
+    """)
+
+    # Every claim that existed at an entity's latest 'resolved'
+    # resolution was credited by it (learning used to replay them all)
+    cur.execute("""
+    INSERT OR IGNORE INTO learning_watermarks (entity, last_credited_claim_id)
+    SELECT c.entity, MAX(c.id)
+    FROM (
+        SELECT id, entity, timestamp FROM claims
+        UNION ALL
+        SELECT id, entity, timestamp FROM claims_archive
+    ) c
+    JOIN (
+        SELECT entity, MAX(timestamp) AS resolved_at
+        FROM resolutions
+        WHERE status = 'resolved'
+        GROUP BY entity
+    ) r ON r.entity = c.entity AND c.timestamp <= r.resolved_at
+    GROUP BY c.entity
+    """)
+
+
+def _v8_adapter_route_summary(cur: sqlite3.Cursor) -> None:
+    """
+    Per-adapter rollup of /kernel/route replies (see kernel.core.route_summary).
+    """
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS adapter_route_summary (
+        adapter TEXT PRIMARY KEY,
+        routes INTEGER NOT NULL,
+        confidence_sum REAL NOT NULL,
+        low_confidence INTEGER NOT NULL,
+        last_entity TEXT,
+        last_routed_at REAL
+    )
+    """)
+
+    # Replies routed so far all live on the shared adapter_response entity
+    cur.execute("""
+    INSERT OR IGNORE INTO adapter_route_summary
+        (adapter, routes, confidence_sum, low_confidence, last_entity, last_routed_at)
+    SELECT agent, COUNT(*), SUM(confidence), SUM(confidence < 0.5),
+           'adapter_response', MAX(timestamp)
+    FROM (
+        SELECT agent, confidence, timestamp FROM claims WHERE entity = 'adapter_response'
+        UNION ALL
+        SELECT agent, confidence, timestamp FROM claims_archive WHERE entity = 'adapter_response'
+    )
+    GROUP BY agent
+    """)
+
+
+def _v9_claim_value_store(cur: sqlite3.Cursor) -> None:
+    """
+    Content-hashed, deduplicated claim values (see kernel.core.claim_values):
+    claims, claims_archive and entity_value_scores keep only the digest.
+    """
+    from kernel.core.claim_values import encode_value, value_hash
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS claim_values (
+        value_hash BLOB PRIMARY KEY,
+        codec INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        size INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """)
+
+    values = [row[0] for row in cur.execute("""
+        SELECT value FROM claims
+        UNION SELECT value FROM claims_archive
+        UNION SELECT value FROM entity_value_scores
+    """).fetchall()]
+    cur.executemany(
+        "INSERT OR IGNORE INTO claim_values (value_hash, codec, data, size) VALUES (?, ?, ?, ?)",
+        [(value_hash(v), *encode_value(v), len(v.encode("utf-8"))) for v in values],
+    )
+
+    cur.connection.create_function("cre_value_hash", 1, value_hash, deterministic=True)
+
+    # ids (and the AUTOINCREMENT sequence) stay as they are
+    for table in ("claims", "claims_archive"):
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN value_hash BLOB")
+        cur.execute(f"UPDATE {table} SET value_hash = cre_value_hash(value)")
+        cur.execute(f"ALTER TABLE {table} DROP COLUMN value")
+
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_claims_value_hash ON claims(value_hash)")
+
+    # value is part of the primary key → rebuild
+    cur.execute("""
+    CREATE TABLE entity_value_scores_v9 (
+        entity TEXT NOT NULL,
+        value_hash BLOB NOT NULL,
+        score REAL NOT NULL,
+        count INTEGER NOT NULL,
+        first_claim_id INTEGER NOT NULL,
+        last_claim_id INTEGER NOT NULL,
+        PRIMARY KEY (entity, value_hash)
+    )
+    """)
+    cur.execute("""
+    INSERT INTO entity_value_scores_v9
+    SELECT entity, cre_value_hash(value), score, count, first_claim_id, last_claim_id
+    FROM entity_value_scores
+    """)
+    cur.execute("DROP TABLE entity_value_scores")
+    cur.execute("ALTER TABLE entity_value_scores_v9 RENAME TO entity_value_scores")
+
+
+def _v10_claim_upsert(cur: sqlite3.Cursor) -> None:
+    """
+    Opt-in upsert claims: one hot row per (agent, entity), counting
+    submissions. Appended claims keep submissions NULL (no uniqueness).
+    """
+    cur.execute("ALTER TABLE claims ADD COLUMN submissions INTEGER")
+    cur.execute("ALTER TABLE claims_archive ADD COLUMN submissions INTEGER")
+    cur.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_claims_agent_entity_upsert "
+        "ON claims(agent, entity) WHERE submissions IS NOT NULL"
+    )
+
+
+def _v11_trust_timeline(cur: sqlite3.Cursor) -> None:
+    """
+    trust_events.trust_after + per-period trust_checkpoints
+    (see kernel.core.trust_timeline).
+    """
+    # frozen at this version: DEFAULT_TRUST, default checkpoint period
+    # (another CRE_TRUST_CHECKPOINT_SECONDS needs a rebuild anyway)
+    default_trust = 0.1
+    checkpoint_seconds = 3600.0
+
+    cur.execute("ALTER TABLE trust_events ADD COLUMN trust_after REAL")
+
+    # Backfill the way /trust/timeline reconstructed it: current trust
+    # minus every later change of the agent
+    cur.execute(
+        """
+        WITH after AS (
+            SELECT e.id,
+                   ROUND(COALESCE(t.trust, ?) - COALESCE(SUM(e.change) OVER (
+                       PARTITION BY e.agent ORDER BY e.timestamp DESC, e.id DESC
+                       ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                   ), 0), 4) AS trust_after
+            FROM trust_events e LEFT JOIN trust t ON t.agent = e.agent
+        )
+        UPDATE trust_events SET trust_after = after.trust_after
+        FROM after WHERE trust_events.id = after.id
+        """,
+        (default_trust,),
+    )
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS trust_checkpoints (
+        agent TEXT NOT NULL,
+        period_start REAL NOT NULL,
+        events INTEGER NOT NULL,
+        trust_min REAL NOT NULL,
+        min_at REAL NOT NULL,
+        trust_max REAL NOT NULL,
+        max_at REAL NOT NULL,
+        trust_last REAL NOT NULL,
+        last_at REAL NOT NULL,
+        PRIMARY KEY (agent, period_start)
+    ) WITHOUT ROWID
+    """)
+
+    # Backfill: per (agent, period) the event count, the first minimum /
+    # maximum with their time and the last value (ties: latest id)
+    cur.execute(
+        """
+        INSERT INTO trust_checkpoints
+            (agent, period_start, events, trust_min, min_at, trust_max, max_at, trust_last, last_at)
+        SELECT agent, period_start, COUNT(*),
+               MIN(trust_after), MIN(min_at), MAX(trust_after), MIN(max_at), MIN(trust_last), MAX(timestamp)
+        FROM (
+            SELECT agent, period_start, trust_after, timestamp,
+                   FIRST_VALUE(timestamp) OVER (
+                       PARTITION BY agent, period_start ORDER BY trust_after, id
+                   ) AS min_at,
+                   FIRST_VALUE(timestamp) OVER (
+                       PARTITION BY agent, period_start ORDER BY trust_after DESC, id
+                   ) AS max_at,
+                   FIRST_VALUE(trust_after) OVER (
+                       PARTITION BY agent, period_start ORDER BY timestamp DESC, id DESC
+                   ) AS trust_last
+            FROM (
+                SELECT id, agent, trust_after, timestamp, CAST(timestamp / ? AS INTEGER) * ? AS period_start
+                FROM trust_events
+                WHERE trust_after IS NOT NULL
+            )
+        )
+        GROUP BY agent, period_start
+        """,
+        (checkpoint_seconds, checkpoint_seconds),
+    )
+
+
+def _v12_event_rollups(cur: sqlite3.Cursor) -> None:
+    """
+    Hourly / daily rollups of trust_events and error_penalty_events,
+    plus the retention watermark (see kernel.core.event_rollups).
+    """
+    rollups = {
+        "trust_events": ("reason", "change", "change"),
+        "error_penalty_events": ("error_type", "final_penalty_strength", "penalty"),
+    }
+    for source, (key, value, p) in rollups.items():
+        for grain, seconds in (("hourly", 3600.0), ("daily", 86400.0)):
+            cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS {source}_{grain} (
+                agent TEXT NOT NULL,
+                period_start REAL NOT NULL,
+                {key} TEXT NOT NULL,
+                events INTEGER NOT NULL,
+                {p}_sum REAL NOT NULL,
+                {p}_min REAL NOT NULL,
+                {p}_max REAL NOT NULL,
+                PRIMARY KEY (agent, period_start, {key})
+            ) WITHOUT ROWID
+            """)
+            # dashboards over every agent: WHERE period_start BETWEEN ? AND ?
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{source}_{grain}_period "
+                f"ON {source}_{grain}(period_start)"
+            )
+            # Backfill from every raw event
+            cur.execute(
+                f"""
+                INSERT INTO {source}_{grain} (agent, period_start, {key}, events, {p}_sum, {p}_min, {p}_max)
+                SELECT agent, CAST(timestamp / ? AS INTEGER) * ?, {key},
+                       COUNT(*), SUM({value}), MIN({value}), MAX({value})
+                FROM {source}
+                GROUP BY 1, 2, 3
+                """,
+                (seconds, seconds),
+            )
+
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS event_retention (
+        source TEXT PRIMARY KEY,
+        pruned_before REAL NOT NULL
+    )
+    """)
+
+    # retention scan: error_penalty_events WHERE timestamp < ?
+    # (trust_events has idx_trust_events_ts)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_error_penalty_events_ts "
+        "ON error_penalty_events(timestamp)"
+    )
+
+
+def _v13_trust_leaderboard(cur: sqlite3.Cursor) -> None:
+    """
+    Trust ranked by value (see kernel.core.trust_leaderboard): keyset
+    pages and the histogram are range scans of this index.
+    """
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_trust_trust ON trust(trust, agent)")
+
+
+def _v14_global_outbox(cur: sqlite3.Cursor) -> None:
+    """
+    Global-store writes of shard transactions (see kernel.core.outbox):
+    queued in the shard's global_outbox with its data, applied on the
+    global store, which keeps how far it got per shard.
+    """
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS global_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS global_outbox_applied (
+            shard INTEGER PRIMARY KEY,
+            last_id INTEGER NOT NULL
+        )
+        """
+    )
+
+
+# =================================================
+# Migration Registry (append only – NEVER reorder)
+# =================================================
+
+Migration = Tuple[int, str, Callable[[sqlite3.Cursor], None]]
+
+MIGRATIONS: List[Migration] = [
+    (1, "base schema", _v1_base_schema),
+    (2, "trust.last_updated", _v2_trust_last_updated),
+    (3, "hot-path indexes", _v3_hot_path_indexes),
+    (4, "claim archive", _v4_claim_archive),
+    (5, "entity value scores", _v5_entity_value_scores),
+    (6, "dirty entities", _v6_dirty_entities),
+    (7, "learning watermarks", _v7_learning_watermarks),
+    (8, "adapter route summary", _v8_adapter_route_summary),
+    (9, "claim value store", _v9_claim_value_store),
+    (10, "claim upsert", _v10_claim_upsert),
+    (11, "trust timeline", _v11_trust_timeline),
+    (12, "event rollups", _v12_event_rollups),
+    (13, "trust leaderboard index", _v13_trust_leaderboard),
+    (14, "global outbox", _v14_global_outbox),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# =================================================
+# Runner
+# =================================================
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Apply every pending migration and return the resulting schema version.
+    """
+    if get_schema_version(conn) >= LATEST_VERSION:
+        return get_schema_version(conn)
+
+    for version, _description, migrate in MIGRATIONS:
+        if conn.in_transaction:
+            conn.commit()
+
+        # Take the write lock, then re-check (another process may have won)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+
+            migrate(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    return get_schema_version(conn)
+
+
+# =================================================
+# CLI
+# =================================================
+
+if __name__ == "__main__":
+    import sys
+    from pathlib import Path
+
+    from kernel.core import memory_db
+
+    if len(sys.argv) > 1:
+        memory_db.configure(Path(sys.argv[1]))
+
+    with memory_db.connection() as conn:
+        before = get_schema_version(conn)
+        after = apply_migrations(conn)
+
+    print(f"schema version: {before} -> {after} ({memory_db.DB_PATH})")
@@ -0,0 +1,231 @@
+"""
+v0.32 – Global Outbox (SHARD → GLOBAL STORE, EXACTLY ONCE)
+
+Responsibilities:
+- Queue a shard transaction's global-store writes (trust learning,
+  route credits) in the shard's global_outbox, IN that transaction:
+  a rolled-back shard write queues nothing, a committed one cannot
+  lose its credit
+- Apply queued rows on the global store in id order, each in a
+  savepoint; the applied mark (global_outbox_applied) commits with
+  the writes, so every row is applied exactly once
+- Run the apply through the global writer when queued on a writer
+  thread (never inline in another writer's batch), inline otherwise
+- Never raise after the shard commit: a failing row stays queued and
+  is retried by the next drain (drain_outboxes, e.g. the API loop)
+- Expose backlog and apply / failure counters
+
+Unsharded the shard IS the global store: on_shard_commit applies the
+write right away, in the caller's transaction.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from kernel.core import memory_db
+from kernel.core.memory_db import connection, on_commit, savepoint, transaction, use_global, use_shard
+from kernel.core.route_summary import bump_route_summary
+from kernel.core.trust import apply_trust_deltas, reward_agent
+from kernel.core.writer import WRITER, current_writer
+
+# =================================================
+# Configuration
+# =================================================
+
+# rows read per page while draining a shard
+OUTBOX_BATCH = int(os.environ.get("CRE_OUTBOX_BATCH", "500"))
+
+# applied rows are deleted from the shard every N queued rows
+OUTBOX_PRUNE_EVERY = int(os.environ.get("CRE_OUTBOX_PRUNE_EVERY", "64"))
+
+# seconds between retries of the API's drain loop
+OUTBOX_RETRY_SECONDS = float(os.environ.get("CRE_OUTBOX_RETRY_SECONDS", "5"))
+
+# =================================================
+# Handlers (kind → global-store write)
+# =================================================
+
+
+def _apply_trust_deltas(payload: Dict) -> None:
+    apply_trust_deltas(payload["updates"])
+
+
+def _apply_route_credit(payload: Dict) -> None:
+    with use_global(), transaction() as conn:
+        bump_route_summary(
+            conn, [(payload["agent"], payload["entity"], payload["confidence"], payload["timestamp"])]
+        )
+        reward_agent(payload["agent"], payload["confidence"], reason="adapter_route_claim")
+
+
+HANDLERS: Dict[str, Callable[[Dict], None]] = {
+    "trust_deltas": _apply_trust_deltas,
+    "route_credit": _apply_route_credit,
+}
+
+# =================================================
+# Counters
+# =================================================
+
+_lock = threading.Lock()
+_scheduled: set = set()
+_stats: Dict[str, Any] = {"drains": 0, "applied": 0, "failed": 0, "last_error": None}
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _lock:
+        _stats[key] += n
+
+
+# =================================================
+# Queueing (inside the shard transaction)
+# =================================================
+
+
+def on_shard_commit(kind: str, payload: Dict) -> None:
+    """
+    Write payload to the global store (HANDLERS[kind]) on behalf of the
+    routed shard's transaction: applied once that transaction commits,
+    dropped if it (or the enclosing savepoint) rolls back.
+    """
+    shard = memory_db.routed_shard()
+    if shard is None:
+        HANDLERS[kind](payload)
+        return
+
+    with transaction() as conn:
+        cur = conn.execute(
+            "INSERT INTO global_outbox (kind, payload, created_at) VALUES (?, ?, ?)",
+            (kind, json.dumps(payload), time.time()),
+        )
+        if cur.lastrowid % OUTBOX_PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM global_outbox WHERE id <= ?", (_applied_mark(shard),))
+        on_commit(lambda: _schedule(shard))
+
+
+def _applied_mark(shard: int) -> int:
+    with use_global(), connection() as conn:
+        row = conn.execute(
+            "SELECT last_id FROM global_outbox_applied WHERE shard = ?", (shard,)
+        ).fetchone()
+    return row[0] if row else 0
+
+
+def _schedule(shard: int) -> None:
+    """
+    Drain the shard after its commit – on the global writer from a
+    writer thread (coalesced), inline for direct callers.
+    """
+    if current_writer() is None:
+        _drain_quietly(shard)
+        return
+
+    with _lock:
+        if shard in _scheduled:
+            return
+        _scheduled.add(shard)
+    WRITER.submit(_drain_quietly, shard)
+
+
+def _drain_quietly(shard: int) -> None:
+    try:
+        drain_outbox(shard)
+    except Exception as e:
+        # the rows stay queued: the next drain retries them
+        _count("failed")
+        with _lock:
+            _stats["last_error"] = f"shard {shard}: {e}"
+
+
+# =================================================
+# Draining (global store)
+# =================================================
+
+
+def drain_outbox(shard: int) -> int:
+    """
+    Apply the shard's queued rows in id order, in ONE global transaction.
+
+    Stops at the first failing row (later rows of the shard may depend
+    on it); what was applied before it commits. Returns rows applied.
+    """
+    with _lock:
+        _scheduled.discard(shard)
+
+    applied = 0
+    with use_global(), transaction() as conn:
+        # write lock first: concurrent drains of a shard serialize on it
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+
+        mark = _applied_mark(shard)
+        failed = False
+        while not failed:
+            rows = _queued(shard, mark, OUTBOX_BATCH)
+            for row_id, kind, payload in rows:
+                try:
+                    with savepoint():
+                        HANDLERS[kind](json.loads(payload))
+                except Exception as e:
+                    failed = True
+                    _count("failed")
+                    with _lock:
+                        _stats["last_error"] = f"shard {shard} row {row_id} ({kind}): {e}"
+                    break
+                mark = row_id
+                applied += 1
+            if len(rows) < OUTBOX_BATCH:
+                break
+
+        if applied:
+            conn.execute(
+                """
+                INSERT INTO global_outbox_applied (shard, last_id) VALUES (?, ?)
+                ON CONFLICT(shard) DO UPDATE SET last_id = excluded.last_id
+                """,
+                (shard, mark),
+            )
+
+    _count("drains")
+    _count("applied", applied)
+    return applied
+
+
+def _queued(shard: int, after: int, limit: int) -> List[tuple]:
+    with use_shard(shard), connection() as conn:
+        return [
+            tuple(r)
+            for r in conn.execute(
+                "SELECT id, kind, payload FROM global_outbox WHERE id > ? ORDER BY id LIMIT ?",
+                (after, limit),
+            )
+        ]
+
+
+def drain_outboxes() -> int:
+    """
+    Drain every shard (startup after a crash, periodic retry).
+    """
+    if memory_db.SHARD_COUNT <= 1:
+        return 0
+    return sum(drain_outbox(shard) for shard in memory_db.shards())
+
+
+def outbox_stats() -> Dict:
+    """
+    Queued-but-unapplied rows per shard + apply / failure counters.
+    """
+    backlog: Dict[int, int] = {}
+    if memory_db.SHARD_COUNT > 1:
+        for shard in memory_db.shards():
+            mark = _applied_mark(shard)
+            with use_shard(shard), connection() as conn:
+                backlog[shard] = conn.execute(
+                    "SELECT COUNT(*) FROM global_outbox WHERE id > ?", (mark,)
+                ).fetchone()[0]
+
+    with _lock:
+        return {"backlog": sum(backlog.values()), "shards": backlog, **_stats}
@@ -0,0 +1,651 @@
+"""
+v0.28 – Replay Engine (DETERMINISTIC, IN MEMORY)
+
+Responsibilities:
+- Rebuild trust, trust_events and resolutions from history, entirely
+  in memory, with the live rules:
+  - claim scores = sum(confidence × trust snapshot), first appearance
+    breaks ties (value_scores / resolve_ranked_consensus)
+  - each claim is credited once, by the first resolution that
+    resolves its entity (learning watermarks); per-request route
+    entities never are
+  - an upserted claim removes the claim it replaces (scores recomputed
+    in claim-id order, like refresh_value_scores)
+  - reward / penalty steps clamp and round exactly like trust.py
+  - trust changes outside consensus (route rewards, error review
+    penalties, ...) apply their recorded step at their time
+- Read history from the claims tables (hot + archived, every shard)
+  or from audit_log.jsonl, plus those changes from trust_events
+- Take the trust parameters as arguments (what-if analysis)
+- Write the rebuilt state back in bulk (disaster recovery)
+
+History sources:
+- claims_history: claims in (timestamp, shard, id) order. Claims do not
+  record when entities were resolved, so resolutions follow a schedule:
+  (upsert mode keeps only each agent's latest claim, so that is all
+  this source can replay)
+  every entity touched in the last `resolve_every` claims is resolved
+  (first touch first) – the sweeper's rhythm – or, by default, each
+  entity once after all claims.
+- audit_history: CLAIM_ADDED / CONSENSUS_RESULT / HUMAN_OVERRIDE_USED
+  in log order – the resolutions that actually happened.
+
+- trust_adjustments: trust_events other than consensus credits, merged
+  into either source by timestamp (with_adjustments; rebuild does it
+  itself). What-if parameters do not re-derive their steps.
+
+Not replayed: time decay (CRE_TRUST_DECAY_HALF_LIFE_SECONDS) and
+archival timing (archived claims are credited like hot ones).
+
+Usage:
+    python -m kernel.core.replay [claims | <audit_log.jsonl>] [--write]
+"""
+
+import heapq
+import json
+import os
+import time
+from array import array
+from bisect import bisect_left
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from kernel.core import audit
+from kernel.core.claim_values import get_values
+from kernel.core.consensus import resolve_ranked_consensus
+from kernel.core.event_rollups import rebuild_rollups, reset_pruned
+from kernel.core.memory_db import (
+    connection,
+    shard_of,
+    shards,
+    transaction,
+    use_global,
+    use_shard,
+)
+from kernel.core.resolution_cache import RESOLUTION_CACHE
+from kernel.core.route_summary import is_request_entity
+from kernel.core.trust import (
+    BASE_PENALTY,
+    BASE_REWARD,
+    DEFAULT_TRUST,
+    TRUST_CEILING,
+    TRUST_FLOOR,
+)
+from kernel.core.trust_cache import TRUST_CACHE
+from kernel.core.trust_timeline import rebuild_trust_checkpoints
+
+# =================================================
+# Configuration
+# =================================================
+
+# claims per page read from SQLite / trust events per bulk INSERT
+REPLAY_CHUNK = int(os.environ.get("CRE_REPLAY_CHUNK", "50000"))
+
+# History events (plain tuples – millions of them)
+CLAIM = 0      # (CLAIM, claim_id, agent, entity, value, confidence, trust, timestamp, replaces)
+RESOLVE = 1    # (RESOLVE, entity, timestamp, logged result or None)
+OVERRIDE = 2   # (OVERRIDE, entity, value, reason, timestamp)
+ADJUST = 3     # (ADJUST, agent, change, reason, confidence, timestamp)
+
+# trust_events written by consensus learning (replayed, not adjustments)
+CONSENSUS_REASONS = ("consensus_correct", "consensus_incorrect")
+
+
+# =================================================
+# Engine
+# =================================================
+
+class _Entity:
+    """
+    One entity's replay state: value scores + its claims, columnar.
+
+    Every claim keeps (id, value code, weight) – 24 bytes – so a replaced
+    one can be taken out; the uncredited ones (always the newest) also
+    keep (agent, confidence) until credited.
+    """
+
+    __slots__ = (
+        "codes", "values", "scores", "ids", "value_codes", "weights",
+        "agents", "confidence", "last_claim_id",
+    )
+
+    def __init__(self) -> None:
+        self.codes: Dict[Any, int] = {}   # value → code, first appearance order
+        self.values: List[Any] = []
+        self.scores: List[float] = []
+        self.ids = array("q")
+        self.value_codes = array("q")
+        self.weights = array("d")
+        # aligned with the last len(agents) claims
+        self.agents = array("q")
+        self.confidence = array("d")
+        self.last_claim_id = 0
+
+    def drop(self, claim_id: int) -> None:
+        """
+        Remove a replaced claim; scores and first appearance are
+        recomputed over the remaining claims in id order.
+        """
+        i = bisect_left(self.ids, claim_id)
+        if i == len(self.ids) or self.ids[i] != claim_id:
+            return   # not in this history (archived before it started)
+
+        credited = len(self.ids) - len(self.agents)
+        del self.ids[i], self.value_codes[i], self.weights[i]
+        if i >= credited:
+            del self.agents[i - credited], self.confidence[i - credited]
+
+        old_values = self.values
+        self.codes, self.values, self.scores = {}, [], []
+        for j, (code, weight) in enumerate(zip(self.value_codes, self.weights)):
+            value = old_values[code]
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.values)
+                self.values.append(value)
+                self.scores.append(0.0)
+            self.scores[code] += weight
+            self.value_codes[j] = code
+
+
+class TrustReplay:
+    """
+    Trust / consensus state machine fed with history events.
+
+    recorded_trust=True weights claims with their stored trust snapshot
+    (what the live scores used); False re-derives each snapshot from the
+    replayed trust (what-if runs with other parameters).
+    """
+
+    def __init__(
+        self,
+        base_reward: float = BASE_REWARD,
+        base_penalty: float = BASE_PENALTY,
+        trust_floor: float = TRUST_FLOOR,
+        trust_ceiling: float = TRUST_CEILING,
+        default_trust: float = DEFAULT_TRUST,
+        recorded_trust: bool = True,
+    ) -> None:
+        self.base_reward = base_reward
+        self.base_penalty = base_penalty
+        self.trust_floor = trust_floor
+        self.trust_ceiling = trust_ceiling
+        self.default_trust = default_trust
+        self.recorded_trust = recorded_trust
+
+        self._agent_codes: Dict[str, int] = {}
+        self._agents: List[str] = []
+        self._trust: List[float] = []
+        self._has_row = bytearray()   # agent got a trust row (was credited)
+        self._entities: Dict[str, _Entity] = {}
+
+        # (agent, change, reason, confidence, timestamp, trust_after) – drained by the writer
+        self.trust_events: List[tuple] = []
+        # (entity, value, status, reason, timestamp)
+        self.resolutions: List[tuple] = []
+        self.watermarks: Dict[str, int] = {}
+
+        self.stats = {
+            "claims": 0,
+            "resolutions": 0,
+            "resolved": 0,
+            "overrides": 0,
+            "adjustments": 0,
+            "trust_events": 0,
+            "outcomes_changed": 0,
+        }
+
+    # -------------------------------------------------
+    # Results
+    # -------------------------------------------------
+
+    @property
+    def trust(self) -> Dict[str, float]:
+        """
+        Replayed trust table (agents that were ever credited).
+        """
+        return {
+            agent: trust
+            for agent, trust, has_row in zip(self._agents, self._trust, self._has_row)
+            if has_row
+        }
+
+    def take_trust_events(self) -> List[tuple]:
+        events, self.trust_events = self.trust_events, []
+        return events
+
+    # -------------------------------------------------
+    # Events
+    # -------------------------------------------------
+
+    def run(self, history: Iterable[tuple]) -> "TrustReplay":
+        """
+        Apply events in order. Claims are handled inline (the hot loop).
+        """
+        resolve, override, adjust = self.resolve, self.override, self.adjust
+        agent_codes, agent = self._agent_codes, self._agent
+        replayed_trust, entities = self._trust, self._entities
+        recorded = self.recorded_trust
+        claims = 0
+
+        try:
+            for event in history:
+                kind = event[0]
+                if kind != CLAIM:
+                    if kind == RESOLVE:
+                        resolve(*event[1:])
+                    elif kind == OVERRIDE:
+                        override(*event[1:])
+                    else:
+                        adjust(*event[1:])
+                    continue
+
+                _, claim_id, name, entity, value, confidence, trust, _ts, replaces = event
+                a = agent_codes.get(name)
+                if a is None:
+                    a = agent(name)
+                if trust is None or not recorded:
+                    trust = replayed_trust[a]
+
+                state = entities.get(entity)
+                if state is None:
+                    state = entities[entity] = _Entity()
+
+                code = state.codes.get(value)
+                if code is None:
+                    code = state.codes[value] = len(state.values)
+                    state.values.append(value)
+                    state.scores.append(0.0)
+
+                confidence = float(confidence)
+                weight = confidence * float(trust)
+                state.scores[code] += weight
+                state.ids.append(claim_id)
+                state.value_codes.append(code)
+                state.weights.append(weight)
+                state.agents.append(a)
+                state.confidence.append(confidence)
+                state.last_claim_id = claim_id
+                if replaces is not None:
+                    state.drop(replaces)
+                claims += 1
+        finally:
+            self.stats["claims"] += claims
+        return self
+
+    def _agent(self, agent: str) -> int:
+        code = self._agent_codes.get(agent)
+        if code is None:
+            code = self._agent_codes[agent] = len(self._agents)
+            self._agents.append(agent)
+            self._trust.append(self.default_trust)
+            self._has_row.append(0)
+        return code
+
+    def claim(
+        self,
+        claim_id: int,
+        agent: str,
+        entity: str,
+        value: Any,
+        confidence: float,
+        trust: Optional[float],
+        timestamp: float,
+        replaces: Optional[int] = None,
+    ) -> None:
+        """
+        trust: the claim's recorded snapshot (None = replayed trust).
+        replaces: id of the claim this upsert supersedes.
+        """
+        self.run([(CLAIM, claim_id, agent, entity, value, confidence, trust, timestamp, replaces)])
+
+    def resolve(self, entity: str, timestamp: float, logged: Optional[Dict] = None) -> None:
+        self.stats["resolutions"] += 1
+        state = self._entities.get(entity)
+
+        if state is None:
+            self.resolutions.append((entity, None, "unknown", "No claims available", timestamp))
+            return
+
+        # two best values: score desc, first appearance breaks ties
+        scores = state.scores
+        first = second = -1
+        for code, score in enumerate(scores):
+            if first < 0 or score > scores[first]:
+                first, second = code, first
+            elif second < 0 or score > scores[second]:
+                second = code
+
+        top = [(state.values[first], scores[first])]
+        if second >= 0:
+            top.append((state.values[second], scores[second]))
+        result = resolve_ranked_consensus(top, len(state.ids), len(scores))
+
+        if logged is not None and (logged.get("status"), logged.get("value")) != (
+            result["status"], result.get("value")
+        ):
+            self.stats["outcomes_changed"] += 1
+
+        if result["status"] != "resolved":
+            self.resolutions.append((entity, None, result["status"], result.get("reason"), timestamp))
+            return
+
+        if not is_request_entity(entity):
+            self._credit(state, first, timestamp)
+            self.watermarks[entity] = state.last_claim_id
+        self.resolutions.append((entity, result["value"], "resolved", result["reason"], timestamp))
+        self.stats["resolved"] += 1
+
+    def _credit(self, state: _Entity, winner: int, timestamp: float) -> None:
+        """
+        Trust learning over the entity's uncredited claims, in claim order
+        (apply_trust_deltas: clamp, step, round – per claim).
+        """
+        trust, names, has_row = self._trust, self._agents, self._has_row
+        events = self.trust_events
+        reward, penalty = self.base_reward, self.base_penalty
+        floor, ceiling = self.trust_floor, self.trust_ceiling
+
+        pending = islice(state.value_codes, len(state.ids) - len(state.agents), None)
+        for a, code, conf in zip(state.agents, pending, state.confidence):
+            conf = max(0.0, min(conf, 1.0))
+            old = trust[a]
+            if code == winner:
+                new = round(min(old + reward * conf, ceiling), 4)
+                reason = "consensus_correct"
+            else:
+                new = round(max(old - penalty * conf, floor), 4)
+                reason = "consensus_incorrect"
+            trust[a] = new
+            has_row[a] = 1
+            events.append((names[a], float(round(new - old, 4)), reason, float(conf), timestamp, new))
+
+        self.stats["trust_events"] += len(state.agents)
+        state.agents = array("q")
+        state.confidence = array("d")
+
+    def override(self, entity: str, value: Any, reason: str, timestamp: float) -> None:
+        # human override: recorded, no learning
+        self.resolutions.append((entity, value, "human_override", reason, timestamp))
+        self.stats["resolutions"] += 1
+        self.stats["overrides"] += 1
+
+    def adjust(self, agent: str, change: float, reason: str, confidence: float, timestamp: float) -> None:
+        """
+        Trust change outside consensus: its recorded step, clamped and
+        rounded like trust.py (the live step, given the same trust before).
+        """
+        a = self._agent(agent)
+        old = self._trust[a]
+        new = round(max(self.trust_floor, min(old + change, self.trust_ceiling)), 4)
+        self._trust[a] = new
+        self._has_row[a] = 1
+        self.trust_events.append((agent, float(round(new - old, 4)), reason, float(confidence), timestamp, new))
+        self.stats["trust_events"] += 1
+        self.stats["adjustments"] += 1
+
+
+# =================================================
+# History sources
+# =================================================
+
+def _shard_claims(shard: int, page_size: int) -> Iterator[tuple]:
+    """
+    (timestamp, shard, id, agent, entity, value_hash, confidence, trust)
+    of one shard's hot + archived claims, in id order, page by page.
+    """
+    after = 0
+    while True:
+        with use_shard(shard), connection() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            rows = cur.execute(
+                """
+                SELECT timestamp, ?, id, agent, entity, value_hash, confidence, trust
+                FROM claims WHERE id > ?
+                UNION ALL
+                SELECT timestamp, ?, id, agent, entity, value_hash, confidence, trust
+                FROM claims_archive WHERE id > ?
+                ORDER BY 3
+                LIMIT ?
+                """,
+                (shard, after, shard, after, page_size),
+            ).fetchall()
+
+        yield from rows
+        if len(rows) < page_size:
+            return
+        after = rows[-1][2]
+
+
+def claims_history(
+    resolve_every: Optional[int] = None,
+    page_size: int = REPLAY_CHUNK,
+) -> Iterator[tuple]:
+    """
+    Replay events from the claims tables (see module docstring).
+    Values are digests (resolution values are looked up when written).
+    """
+    streams = [_shard_claims(shard, page_size) for shard in shards()]
+    rows = streams[0] if len(streams) == 1 else heapq.merge(*streams)
+
+    touched: Dict[str, None] = {}
+    clock = 0.0
+    n = 0
+
+    for ts, _shard, claim_id, agent, entity, digest, confidence, trust in rows:
+        clock = ts
+        yield (CLAIM, claim_id, agent, entity, bytes(digest), confidence, trust, ts, None)
+        touched[entity] = None
+
+        n += 1
+        if resolve_every and n % resolve_every == 0:
+            for e in touched:
+                yield (RESOLVE, e, clock, None)
+            touched.clear()
+
+    for e in touched:
+        yield (RESOLVE, e, clock, None)
+
+
+def audit_history(path: Optional[Path] = None) -> Iterator[tuple]:
+    """
+    Replay events from an audit log (default: the live AUDIT_LOG_FILE).
+    """
+    with Path(path or audit.AUDIT_LOG_FILE).open(encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            event, data = entry["event"], entry["data"]
+
+            if event == "CLAIM_ADDED":
+                yield (
+                    CLAIM, data["id"], data["agent"], data["entity"], data["value"],
+                    data["confidence"], data.get("trust"), data["timestamp"], data.get("replaces"),
+                )
+            elif event == "CONSENSUS_RESULT":
+                yield (RESOLVE, data["entity"], entry["timestamp"], data["result"])
+            elif event == "HUMAN_OVERRIDE_USED":
+                yield (OVERRIDE, data["entity"], data["value"], data["reason"], data["timestamp"])
+
+
+def trust_adjustments(table: str = "trust_events", page_size: int = REPLAY_CHUNK) -> Iterator[tuple]:
+    """
+    ADJUST events: the trust changes of `table` (trust_events layout)
+    outside consensus learning, in id order, page by page.
+    """
+    after = 0
+    while True:
+        with use_global(), connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT rowid, agent, change, reason, confidence, timestamp FROM {table}
+                WHERE rowid > ? AND reason NOT IN (?, ?)
+                ORDER BY rowid
+                LIMIT ?
+                """,
+                (after, *CONSENSUS_REASONS, page_size),
+            ).fetchall()
+
+        for r in rows:
+            yield (ADJUST, r[1], r[2], r[3], r[4], r[5])
+        if len(rows) < page_size:
+            return
+        after = rows[-1][0]
+
+
+def with_adjustments(history: Iterable[tuple], adjustments: Iterable[tuple]) -> Iterator[tuple]:
+    """
+    Merge ADJUST events into a history, by timestamp (adjustments after
+    history events of the same time).
+    """
+    return heapq.merge(history, adjustments, key=_event_time)
+
+
+# timestamp position per event kind
+_TIME_FIELD = {CLAIM: 7, RESOLVE: 2, OVERRIDE: 4, ADJUST: 5}
+
+
+def _event_time(event: tuple) -> float:
+    return event[_TIME_FIELD[event[0]]]
+
+
+def _applied(engine: TrustReplay) -> int:
+    stats = engine.stats
+    return stats["claims"] + stats["resolutions"] + stats["adjustments"]
+
+
+# =================================================
+# What-if (no writes)
+# =================================================
+
+def replay(history: Iterable[tuple], **params) -> TrustReplay:
+    """
+    Replay history in memory; trust events are counted, not kept.
+    params: TrustReplay arguments (trust parameters, recorded_trust).
+    """
+    engine = TrustReplay(**params)
+    history = iter(history)
+    while True:
+        n = _applied(engine)
+        engine.run(islice(history, REPLAY_CHUNK))
+        engine.take_trust_events()
+        if _applied(engine) == n:
+            return engine
+
+
+# =================================================
+# Rebuild (bulk write)
+# =================================================
+
+def rebuild(history: Iterable[tuple], engine: Optional[TrustReplay] = None) -> Dict:
+    """
+    Replace trust, trust_events (+ checkpoints, rollups), resolutions and learning
+    watermarks with the replay of history. Returns the replay stats.
+
+    history: claims / consensus events (claims_history, audit_history).
+    The trust changes outside consensus already in trust_events are
+    staged first and replayed in place (with_adjustments), so route
+    rewards and review penalties survive the rebuild.
+
+    Global store first (one transaction, trust events inserted as they
+    are produced), then each shard. Claims and value scores are not
+    touched, so only recorded-snapshot replays may be written.
+    """
+    engine = engine or TrustReplay()
+    if not engine.recorded_trust:
+        raise ValueError("only recorded-trust replays can be written (claims keep their snapshots)")
+
+    insert_events = """
+        INSERT INTO trust_events (agent, change, reason, confidence, timestamp, trust_after)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+
+    # pending write-behind trust would land on top of the rebuild
+    TRUST_CACHE.clear()
+    RESOLUTION_CACHE.clear()
+
+    with use_global(), transaction() as conn:
+        conn.execute(
+            """
+            CREATE TEMP TABLE replay_adjustments AS
+            SELECT agent, change, reason, confidence, timestamp FROM trust_events
+            WHERE reason NOT IN (?, ?)
+            ORDER BY id
+            """,
+            CONSENSUS_REASONS,
+        )
+        conn.execute("DELETE FROM trust_events")
+
+        history = with_adjustments(history, trust_adjustments("temp.replay_adjustments"))
+        while True:
+            n = _applied(engine)
+            engine.run(islice(history, REPLAY_CHUNK))
+            conn.executemany(insert_events, engine.take_trust_events())
+            if _applied(engine) == n:
+                break
+        conn.execute("DROP TABLE temp.replay_adjustments")
+        # the replay wrote the whole history: nothing is pruned any more
+        reset_pruned(conn, "trust_events")
+        rebuild_trust_checkpoints()
+        rebuild_rollups("trust_events")
+
+        now = time.time()
+        conn.execute("DELETE FROM trust")
+        conn.executemany(
+            "INSERT INTO trust (agent, trust, last_updated) VALUES (?, ?, ?)",
+            [(agent, trust, now) for agent, trust in engine.trust.items()],
+        )
+
+        # unsharded: same DB → joins this transaction (one commit)
+        by_shard: Dict[int, List[tuple]] = {shard: [] for shard in shards()}
+        for record in engine.resolutions:
+            by_shard[shard_of(record[0])].append(record)
+        for shard, records in by_shard.items():
+            _rebuild_shard(shard, records, engine.watermarks)
+
+    TRUST_CACHE.clear()
+    RESOLUTION_CACHE.clear()
+    return engine.stats
+
+
+def _rebuild_shard(shard: int, records: List[tuple], watermarks: Dict[str, int]) -> None:
+    with use_shard(shard), transaction() as conn:
+        digests = [r[1] for r in records if isinstance(r[1], bytes)]
+        texts = get_values(digests) if digests else {}
+
+        conn.execute("DELETE FROM resolutions")
+        conn.executemany(
+            """
+            INSERT INTO resolutions (entity, value, status, reason, timestamp)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (entity, texts[value] if isinstance(value, bytes) else value, status, reason, ts)
+                for entity, value, status, reason, ts in records
+            ],
+        )
+
+        conn.execute("DELETE FROM learning_watermarks")
+        conn.executemany(
+            "INSERT INTO learning_watermarks (entity, last_credited_claim_id) VALUES (?, ?)",
+            [(e, claim_id) for e, claim_id in watermarks.items() if shard_of(e) == shard],
+        )
+
+
+# =================================================
+# CLI
+# =================================================
+
+if __name__ == "__main__":
+    import sys
+
+    args = [a for a in sys.argv[1:] if a != "--write"]
+    source = args[0] if args else "claims"
+    history = claims_history() if source == "claims" else audit_history(Path(source))
+
+    if "--write" in sys.argv:
+        stats = rebuild(history)
+    else:
+        stats = replay(with_adjustments(history, trust_adjustments())).stats
+    print(json.dumps(stats, indent=2))
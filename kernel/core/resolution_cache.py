@@ -0,0 +1,154 @@
+"""
+v0.22 – Resolution Cache (MEMOIZED resolve_entity)
+
+Responsibilities:
+- Remember the last resolution per entity (LRU)
+- Key it on exactly what can change the outcome:
+  - claim high-water mark (newest claim id of the entity)
+  - trust epoch (bumped when stored claim-trust snapshots are rewritten,
+    e.g. value-score rebuilds – live trust updates never change
+    consensus, which uses the trust snapshotted at claim time)
+- Human override set / cleared (governance) → that entity's entry is
+  dropped, and a resolution of it still in flight (keyed before the
+  override) is never stored. Recent overrides are remembered per entity
+  in a bounded LRU; a resolution keyed before the oldest one remembered
+  is not stored either (it simply misses next time)
+- Hit → return the stored resolution, write NOTHING
+- Expose hit-rate metrics
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from kernel.core import memory_db
+
+MAX_ENTRIES = int(os.environ.get("CRE_RESOLUTION_CACHE_SIZE", "10000"))
+
+CacheKey = Tuple[int, int, int]   # (high-water mark, trust epoch, override ticket)
+
+
+class ResolutionCache:
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[CacheKey, Dict]]" = OrderedDict()
+        self.trust_epoch = 0
+
+        # entity → sequence number of its latest override change (LRU, bounded)
+        self._overrides: "OrderedDict[str, int]" = OrderedDict()
+        self._override_seq = 0
+        self._override_floor = 0  # newest sequence number forgotten
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    # -------------------------------------------------
+    # Keys
+    # -------------------------------------------------
+
+    def key(self, high_water_mark: int) -> CacheKey:
+        """
+        The override ticket only guards put() (see invalidate): lookups
+        compare the high-water mark and trust epoch.
+        """
+        return (int(high_water_mark), self.trust_epoch, self._override_seq)
+
+    # -------------------------------------------------
+    # Lookup / store
+    # -------------------------------------------------
+
+    def get(self, entity: str, key: CacheKey) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(entity)
+            if entry is None or entry[0] != key[:2]:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(entity)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, entity: str, key: CacheKey, record: Dict) -> None:
+        """
+        Store once the surrounding transaction commits
+        (a rolled-back resolution must never be served).
+        """
+        def store() -> None:
+            with self._lock:
+                if self._overridden_since(entity, key[2]):
+                    return
+                self._entries[entity] = (key[:2], dict(record))
+                self._entries.move_to_end(entity)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        memory_db.on_commit(store)
+
+    # -------------------------------------------------
+    # Invalidation
+    # -------------------------------------------------
+
+    def invalidate(self, entity: str) -> None:
+        """
+        Human override set / cleared for entity: drop its entry; a
+        resolution of it keyed before now will not be stored.
+        """
+        with self._lock:
+            self._override_seq += 1
+            self._overrides[entity] = self._override_seq
+            self._overrides.move_to_end(entity)
+            while len(self._overrides) > self.max_entries:
+                _, seq = self._overrides.popitem(last=False)
+                self._override_floor = seq
+            if self._entries.pop(entity, None) is not None:
+                self.invalidations += 1
+
+    def _overridden_since(self, entity: str, ticket: int) -> bool:
+        # caller holds _lock. Forgotten overrides may concern any entity
+        return ticket < self._override_floor or self._overrides.get(entity, 0) > ticket
+
+    def bump_trust_epoch(self) -> None:
+        """
+        Stored claim-trust snapshots changed → every entry is stale.
+        """
+        with self._lock:
+            self.trust_epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    # -------------------------------------------------
+    # Metrics
+    # -------------------------------------------------
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "invalidations": self.invalidations,
+                "trust_epoch": self.trust_epoch,
+                "overrides_tracked": len(self._overrides),
+            }
+
+
+# =================================================
+# Process-wide instance
+# =================================================
+
+RESOLUTION_CACHE = ResolutionCache()
+
+# switching / closing the DB → cached resolutions belong to the old one
+memory_db.on_close(RESOLUTION_CACHE.clear)
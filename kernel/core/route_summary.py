@@ -0,0 +1,101 @@
+"""
+v0.25 – Route Summary (PER-ADAPTER ROLLUP)
+
+Responsibilities:
+- Key routed replies per conversation / per request
+  (adapter_response:conversation:<id>, adapter_response:request:<uuid>)
+  instead of one ever-growing `adapter_response` entity
+- Per-request entities hold one reply each: never queued for the
+  sweeper nor credited by consensus (the reply would always win)
+- Roll every routed reply up per adapter
+  (routes, confidence sum, low-confidence count, last entity)
+  inside the route transaction
+- Serve the rollup
+"""
+
+import sqlite3
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kernel.core.memory_db import connection, use_global
+
+ROUTE_ENTITY = "adapter_response"
+REQUEST_ENTITY_PREFIX = f"{ROUTE_ENTITY}:request:"
+
+# replies below this confidence also get an error review
+LOW_CONFIDENCE_THRESHOLD = 0.5
+
+
+def route_entity(conversation_id: Optional[str] = None) -> str:
+    """
+    Claim entity for one routed reply.
+    """
+    if conversation_id:
+        return f"{ROUTE_ENTITY}:conversation:{conversation_id}"
+    return f"{REQUEST_ENTITY_PREFIX}{uuid.uuid4().hex}"
+
+
+def is_request_entity(entity: str) -> bool:
+    """
+    One-off entity of a single routed reply (no conversation id).
+    """
+    return entity.startswith(REQUEST_ENTITY_PREFIX)
+
+
+# =================================================
+# Write path (called inside a global-store transaction)
+# =================================================
+
+def bump_route_summary(conn: sqlite3.Connection, routes: Iterable[Tuple]) -> None:
+    """
+    routes: (adapter, entity, confidence, timestamp), in route order.
+    """
+    conn.executemany(
+        """
+        INSERT INTO adapter_route_summary
+            (adapter, routes, confidence_sum, low_confidence, last_entity, last_routed_at)
+        VALUES (?, 1, ?, ?, ?, ?)
+        ON CONFLICT(adapter) DO UPDATE SET
+            routes = routes + 1,
+            confidence_sum = confidence_sum + excluded.confidence_sum,
+            low_confidence = low_confidence + excluded.low_confidence,
+            last_entity = excluded.last_entity,
+            last_routed_at = excluded.last_routed_at
+        """,
+        [
+            (adapter, float(confidence), int(confidence < LOW_CONFIDENCE_THRESHOLD), entity, ts)
+            for adapter, entity, confidence, ts in routes
+        ],
+    )
+
+
+# =================================================
+# Read path
+# =================================================
+
+def get_route_summary(adapter: Optional[str] = None) -> List[Dict]:
+    where = "WHERE adapter = ?" if adapter is not None else ""
+    params = (adapter,) if adapter is not None else ()
+
+    with use_global(), connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT adapter, routes, confidence_sum, low_confidence, last_entity, last_routed_at
+            FROM adapter_route_summary
+            {where}
+            ORDER BY adapter
+            """,
+            params,
+        ).fetchall()
+
+    return [
+        {
+            "adapter": r["adapter"],
+            "routes": r["routes"],
+            "avg_confidence": round(r["confidence_sum"] / r["routes"], 4) if r["routes"] else 0.0,
+            "low_confidence": r["low_confidence"],
+            "last_entity": r["last_entity"],
+            "last_routed_at": r["last_routed_at"],
+        }
+        for r in rows
+    ]
@@ -0,0 +1,214 @@
+"""
+v0.24 – Resolution Sweeper (BACKGROUND RE-RESOLUTION)
+
+Responsibilities:
+- Re-resolve dirty entities in batches, oldest change first
+  (resolutions land in `resolutions`, so reads can serve them directly)
+- Optionally score batches in a process pool, one entity shard per
+  worker; writes go through the runner of the ledger shard
+  (e.g. run_on_shard → that shard's writer)
+- Expose backlog, lag and throughput
+
+Usage:
+    python -m kernel.core.sweeper       # sweep until nothing is dirty
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from kernel.core import memory_db
+from kernel.core.dirty_entities import dirty_stats, take_dirty
+from kernel.core.ledger import resolve_entities, score_entities
+
+# =================================================
+# Configuration
+# =================================================
+
+SWEEP_INTERVAL_SECONDS = float(os.environ.get("CRE_SWEEP_INTERVAL", "1.0"))
+SWEEP_BATCH_SIZE = int(os.environ.get("CRE_SWEEP_BATCH_SIZE", "1000"))
+SWEEP_WORKERS = int(os.environ.get("CRE_SWEEP_WORKERS", "0"))
+
+
+def _init_worker(db_path: str, shard_count: int) -> None:
+    memory_db.configure(db_path, shard_count)
+
+
+class ResolutionSweeper:
+    """
+    runner(shard, fn, *args) executes each resolve batch (run_on_shard
+    in the API process); default: inline. workers > 1 scores in a process pool
+    (file DBs only – an in-memory DB is private to its process).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = SWEEP_BATCH_SIZE,
+        interval: float = SWEEP_INTERVAL_SECONDS,
+        workers: int = SWEEP_WORKERS,
+        runner: Optional[Callable[..., Any]] = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.interval = interval
+        self.workers = workers
+        self.runner = runner or (lambda shard, fn, *args: fn(*args))
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_path: Optional[str] = None
+
+        self.sweeps = 0
+        self.entities_resolved = 0
+        self.busy_seconds = 0.0
+        self.last_sweep_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    # -------------------------------------------------
+    # Sweeping
+    # -------------------------------------------------
+
+    def sweep_once(self) -> int:
+        """
+        Resolve one batch of dirty entities per ledger shard.
+        Returns how many.
+        """
+        total = 0
+        for shard in memory_db.shards():
+            entities = take_dirty(self.batch_size, shard)
+            if not entities:
+                continue
+
+            started = time.perf_counter()
+            scored = self._score(entities)
+            self.runner(shard, resolve_entities, entities, scored)
+
+            with self._lock:
+                self.sweeps += 1
+                self.entities_resolved += len(entities)
+                self.busy_seconds += time.perf_counter() - started
+                self.last_sweep_at = time.time()
+            total += len(entities)
+        return total
+
+    def sweep(self) -> int:
+        """
+        Sweep until a batch comes back short (backlog drained).
+        """
+        total = 0
+        while True:
+            n = self.sweep_once()
+            total += n
+            if n < self.batch_size:
+                return total
+
+    def _score(self, entities: List[str]) -> Optional[Dict]:
+        pool = self._get_pool()
+        if pool is None:
+            return None  # resolve_entities scores inline
+
+        shards: List[List[str]] = [[] for _ in range(self.workers)]
+        for entity in entities:
+            shards[memory_db.shard_of(entity, self.workers)].append(entity)
+
+        scored: Dict = {}
+        for part in pool.map(score_entities, [s for s in shards if s]):
+            scored.update(part)
+        return scored
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        path = str(memory_db.DB_PATH)
+        if self.workers <= 1 or path.startswith(memory_db.MEMORY_DB):
+            return None
+
+        if self._pool is None or self._pool_path != path:
+            self._shutdown_pool()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(path, memory_db.SHARD_COUNT),
+            )
+            self._pool_path = path
+        return self._pool
+
+    def _shutdown_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # -------------------------------------------------
+    # Background thread
+    # -------------------------------------------------
+
+    def start(self) -> bool:
+        """
+        Sweep every interval in a background thread.
+        False if already running.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop,
+                name="cre-resolution-sweeper",
+                daemon=True,
+            )
+            self._thread.start()
+            return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+        self._shutdown_pool()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                # keep going while full batches come back
+                while self.sweep_once() >= self.batch_size and not self._stop.is_set():
+                    pass
+            except Exception as e:
+                self.last_error = str(e)
+
+    # -------------------------------------------------
+    # Metrics
+    # -------------------------------------------------
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "workers": self.workers,
+                "sweeps": self.sweeps,
+                "entities_resolved": self.entities_resolved,
+                "entities_per_second": (
+                    round(self.entities_resolved / self.busy_seconds, 1)
+                    if self.busy_seconds else 0.0
+                ),
+                "last_sweep_at": self.last_sweep_at,
+                "last_error": self.last_error,
+            }
+        stats.update(dirty_stats())
+        return stats
+
+
+# =================================================
+# CLI
+# =================================================
+
+if __name__ == "__main__":
+    sweeper = ResolutionSweeper()
+    try:
+        print(f"resolved {sweeper.sweep()} entities")
+    finally:
+        sweeper.stop()
+    print(sweeper.stats())
@@ -1,9 +1,14 @@
-"""SQLite-backed trust system with trust event logging."""
+"""SQLite-backed trust system with trust event logging (global store, never sharded)."""
 
+import math
+import os
 import time
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
 
-from kernel.core.memory_db import db_get_all_trust, db_get_trust, db_set_trust, get_connection
+from kernel.core.event_rollups import record_rollups
+from kernel.core.memory_db import db_get_all_trust_rows, transaction, use_global
+from kernel.core.trust_cache import TRUST_CACHE, Stamped
+from kernel.core.trust_timeline import record_checkpoints
 
 # =================================================
 # Trust Configuration
@@ -16,22 +21,59 @@ TRUST_CEILING = 1.0
 BASE_REWARD = 0.05
 BASE_PENALTY = 0.05
 
+# Time decay toward DEFAULT_TRUST: the distance halves every half-life
+# (0 = no decay). Computed at read time from trust.last_updated.
+TRUST_DECAY_HALF_LIFE_SECONDS = float(os.environ.get("CRE_TRUST_DECAY_HALF_LIFE_SECONDS", "0"))
+
 # =================================================
 # Internal helpers
 # =================================================
 
-def _log_trust_event(agent: str, change: float, reason: str, confidence: float) -> None:
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO trust_events (agent, change, reason, confidence, timestamp)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (agent, float(change), reason, float(confidence), time.time()),
-    )
-    conn.commit()
-    conn.close()
+def _log_trust_event(agent: str, change: float, reason: str, confidence: float, trust_after: float) -> None:
+    now = time.time()
+    with use_global(), transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO trust_events (agent, change, reason, confidence, timestamp, trust_after)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (agent, float(change), reason, float(confidence), now, trust_after),
+        )
+        record_checkpoints(conn, [(agent, trust_after, now)])
+        record_rollups(conn, "trust_events", [(agent, reason, float(change), now)])
+
+
+def _clamp_confidence(confidence: Optional[float]) -> float:
+    conf = confidence if confidence is not None else 1.0
+    return max(0.0, min(conf, 1.0))
+
+
+def _rewarded(old: float, conf: float) -> float:
+    return round(min(old + BASE_REWARD * conf, TRUST_CEILING), 4)
+
+
+def _penalized(old: float, conf: float) -> float:
+    return round(max(old - BASE_PENALTY * conf, TRUST_FLOOR), 4)
+
+
+def decayed_trust(trust: float, last_updated: Optional[float], now: float) -> float:
+    """
+    Closed-form decay of a stored trust value to `now`:
+    DEFAULT + (trust - DEFAULT) × 2^(-elapsed / half-life).
+
+    O(1) per read. Decay only lands in the trust table when the row is
+    written (reward / penalty: the step applies to the decayed value) or
+    compacted (decay_all_agents). It is not a trust event.
+    """
+    half_life = TRUST_DECAY_HALF_LIFE_SECONDS
+    if half_life <= 0 or last_updated is None or now <= last_updated:
+        return float(trust)
+    factor = math.exp(-math.log(2) * (now - last_updated) / half_life)
+    return round(DEFAULT_TRUST + (trust - DEFAULT_TRUST) * factor, 4)
+
+
+def _current(row: Optional[Stamped], now: float) -> float:
+    return DEFAULT_TRUST if row is None else decayed_trust(row[0], row[1], now)
 
 
 # =================================================
@@ -39,12 +81,22 @@ def _log_trust_event(agent: str, change: float, reason: str, confidence: float)
 # =================================================
 
 def get_trust(agent: str) -> float:
-    trust = db_get_trust(agent)
-    return float(trust if trust is not None else DEFAULT_TRUST)
+    return _current(TRUST_CACHE.get_many_stamped([agent])[agent], time.time())
+
+
+def get_trust_many(agents: Iterable[str]) -> Dict[str, float]:
+    now = time.time()
+    return {
+        agent: _current(row, now)
+        for agent, row in TRUST_CACHE.get_many_stamped(agents).items()
+    }
 
 
 def get_all_trust() -> Dict[str, float]:
-    return db_get_all_trust()
+    # full dump comes from SQLite → drain pending writes first
+    TRUST_CACHE.flush()
+    now = time.time()
+    return {agent: _current(row, now) for agent, row in db_get_all_trust_rows().items()}
 
 
 # =================================================
@@ -52,27 +104,91 @@ def get_all_trust() -> Dict[str, float]:
 # =================================================
 
 def reward_agent(agent: str, confidence: Optional[float] = None, reason: str = "reward") -> None:
-    old = get_trust(agent)
-    conf = confidence if confidence is not None else 1.0
-    conf = max(0.0, min(conf, 1.0))
+    conf = _clamp_confidence(confidence)
 
-    delta = BASE_REWARD * conf
-    new = min(old + delta, TRUST_CEILING)
-    rounded_new = round(new, 4)
-    db_set_trust(agent, rounded_new)
-    _log_trust_event(agent=agent, change=round(rounded_new - old, 4), reason=reason, confidence=conf)
+    # read + write + event = one transaction (one commit)
+    with use_global(), transaction():
+        old = get_trust(agent)
+        rounded_new = _rewarded(old, conf)
+        TRUST_CACHE.set(agent, rounded_new)
+        _log_trust_event(
+            agent=agent, change=round(rounded_new - old, 4), reason=reason, confidence=conf,
+            trust_after=rounded_new,
+        )
 
 
 def penalize_agent(agent: str, confidence: Optional[float] = None, reason: str = "penalty") -> None:
-    old = get_trust(agent)
-    conf = confidence if confidence is not None else 1.0
-    conf = max(0.0, min(conf, 1.0))
+    conf = _clamp_confidence(confidence)
+
+    with use_global(), transaction():
+        old = get_trust(agent)
+        rounded_new = _penalized(old, conf)
+        TRUST_CACHE.set(agent, rounded_new)
+        _log_trust_event(
+            agent=agent, change=round(rounded_new - old, 4), reason=reason, confidence=conf,
+            trust_after=rounded_new,
+        )
+
+
+# =================================================
+# Batch Learning (WRITE, one transaction)
+# =================================================
+
+def apply_trust_deltas(updates: Iterable[Dict]) -> Dict[str, float]:
+    """
+    Apply many reward / penalty updates in ONE transaction.
 
-    delta = BASE_PENALTY * conf
-    new = max(old - delta, TRUST_FLOOR)
-    rounded_new = round(new, 4)
-    db_set_trust(agent, rounded_new)
-    _log_trust_event(agent=agent, change=round(rounded_new - old, 4), reason=reason, confidence=conf)
+    Each update:
+      - agent
+      - correct: True → reward, False → penalty
+      - confidence: optional (same default / clamping as reward_agent)
+      - reason: optional (defaults to consensus_correct / consensus_incorrect)
+
+    Updates are applied in order with exactly the per-claim rules
+    (clamping + rounding after every step), so the final trust and the
+    logged trust_events match calling update_trust() once per update.
+    Each agent's trust is written once (through the trust cache).
+
+    Returns the new trust per touched agent.
+    """
+    updates = list(updates)
+    if not updates:
+        return {}
+
+    now = time.time()
+
+    with use_global(), transaction() as conn:
+        stored = get_trust_many(u["agent"] for u in updates)
+        current: Dict[str, float] = {}
+        events: List[tuple] = []
+
+        for u in updates:
+            agent = u["agent"]
+            old = current.get(agent, stored[agent])
+            conf = _clamp_confidence(u.get("confidence"))
+
+            if u["correct"]:
+                new = _rewarded(old, conf)
+                reason = u.get("reason", "consensus_correct")
+            else:
+                new = _penalized(old, conf)
+                reason = u.get("reason", "consensus_incorrect")
+
+            current[agent] = new
+            events.append((agent, float(round(new - old, 4)), reason, float(conf), now, new))
+
+        TRUST_CACHE.set_many(current.items())
+        conn.executemany(
+            """
+            INSERT INTO trust_events (agent, change, reason, confidence, timestamp, trust_after)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            events,
+        )
+        record_checkpoints(conn, ((e[0], e[5], now) for e in events))
+        record_rollups(conn, "trust_events", ((e[0], e[2], e[1], now) for e in events))
+
+    return current
 
 
 # =================================================
@@ -94,12 +210,35 @@ def update_trust(
 
 
 # =================================================
-# Future hook (safe stub)
+# Decay compaction (explicit, never on the hot path)
 # =================================================
 
-def decay_all_agents() -> None:
+def decay_all_agents(now: Optional[float] = None) -> int:
     """
-    v0.11 stub.
-    Time-based decay will be implemented in v0.12+.
+    Materialize decay into every trust row in ONE set-based UPDATE
+    (last_updated → now). Reads decay lazily either way: compacting
+    changes no value anyone observes (up to the 4-decimal rounding).
+    Rows already at DEFAULT_TRUST never move and are skipped.
+
+    Cached stamps stay valid: (trust, last_updated) before and after
+    decay to the same value. Returns the number of rows rewritten.
     """
-    return
+    if TRUST_DECAY_HALF_LIFE_SECONDS <= 0:
+        return 0
+    now = time.time() if now is None else now
+
+    with use_global(), transaction() as conn:
+        # Python closed form (SQLite's exp() is a compile-time option)
+        conn.create_function(
+            "cre_decayed_trust", 2, lambda trust, updated: decayed_trust(trust, updated, now),
+            deterministic=True,
+        )
+        cur = conn.execute(
+            """
+            UPDATE trust
+            SET trust = cre_decayed_trust(trust, last_updated), last_updated = ?
+            WHERE last_updated < ? AND trust != ?
+            """,
+            (now, now, DEFAULT_TRUST),
+        )
+    return cur.rowcount
@@ -0,0 +1,287 @@
+"""
+v0.18 – Trust Cache (IN-PROCESS, WRITE-BEHIND)
+
+Responsibilities:
+- Serve trust reads from memory (hit / miss counters), with the
+  row's last_updated stamp (lazy decay, see kernel.core.trust)
+- Track dirty agents and flush them to the trust table
+  every FLUSH_INTERVAL_SECONDS or once FLUSH_THRESHOLD agents are dirty
+- Flush synchronously on shutdown (close_connections() / atexit)
+- Stay bounded: at most MAX_ENTRIES agents, least recently used clean
+  ones evicted first (unflushed writes always stay)
+
+Consistency:
+- Reads are consistent within the process
+- Cache writes follow the SQLite transaction they happen in
+  (undone on rollback, flush considered only after commit)
+- Other processes may see trust rows up to one flush interval late;
+  trust_events are still written synchronously
+"""
+
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterable, Optional, Tuple
+
+from kernel.core import memory_db
+
+Stamped = Tuple[float, Optional[float]]   # (trust, last_updated)
+
+# =================================================
+# Configuration
+# =================================================
+
+FLUSH_INTERVAL_SECONDS = float(os.environ.get("CRE_TRUST_FLUSH_INTERVAL", "1.0"))
+FLUSH_THRESHOLD = int(os.environ.get("CRE_TRUST_FLUSH_THRESHOLD", "256"))
+# cached agents kept (LRU; agents with unflushed writes are never evicted)
+MAX_ENTRIES = int(os.environ.get("CRE_TRUST_CACHE_SIZE", "100000"))
+
+_ABSENT = object()
+
+
+class TrustCache:
+    """
+    agent → (trust, last_updated) (None = no row in the trust table).
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        flush_threshold: int = FLUSH_THRESHOLD,
+        max_entries: int = MAX_ENTRIES,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self._path: Optional[Path] = None
+        self._values: "OrderedDict[str, Optional[Stamped]]" = OrderedDict()
+        self._dirty: Dict[str, float] = {}  # agent → last_updated
+        self._flushing: Dict[str, Stamped] = {}  # taken by the running flush, not written yet
+        self._last_flush = time.monotonic()
+
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.evictions = 0
+
+    # -------------------------------------------------
+    # Reads
+    # -------------------------------------------------
+
+    def get(self, agent: str) -> Optional[float]:
+        return self.get_many([agent])[agent]
+
+    def get_many(self, agents: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        Stored trust (as last written, no decay) for many agents.
+        """
+        return {
+            agent: row[0] if row is not None else None
+            for agent, row in self.get_many_stamped(agents).items()
+        }
+
+    def get_many_stamped(self, agents: Iterable[str]) -> Dict[str, Optional[Stamped]]:
+        """
+        Cached (trust, last_updated) for many agents; misses are loaded in one query.
+        """
+        agents = list(dict.fromkeys(agents))
+        self._check_path()
+
+        with self._lock:
+            found = {a: self._values[a] for a in agents if a in self._values}
+            for agent in found:
+                self._values.move_to_end(agent)
+            missing = [a for a in agents if a not in found]
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        if missing:
+            loaded = memory_db.db_get_trust_rows_many(missing)
+            with self._lock:
+                for agent in missing:
+                    # a concurrent set() wins over what we just read
+                    found[agent] = self._values.setdefault(agent, loaded.get(agent))
+                self._evict()
+
+        return found
+
+    def pending(self) -> Dict[str, Stamped]:
+        """
+        (trust, last_updated) of every agent whose latest write may not be
+        in SQLite yet – dirty or being flushed. Bulk readers of the trust
+        table overlay these instead of flushing (a read stays a read).
+        """
+        self._check_path()
+        with self._lock:
+            found = dict(self._flushing)
+            found.update((a, self._values[a]) for a in self._dirty)
+        return found
+
+    # -------------------------------------------------
+    # Writes (write-behind)
+    # -------------------------------------------------
+
+    def set(self, agent: str, trust: float) -> None:
+        self.set_many([(agent, trust)])
+
+    def set_many(self, items: Iterable[Tuple[str, float]]) -> None:
+        now = time.time()
+        self._check_path()
+
+        with self._lock:
+            previous = {}
+            for agent, trust in items:
+                if agent not in previous:
+                    previous[agent] = (
+                        self._values.get(agent, _ABSENT),
+                        self._dirty.get(agent),
+                    )
+                self._values[agent] = (float(trust), now)
+                self._values.move_to_end(agent)
+                self._dirty[agent] = now
+            self._evict()
+
+        memory_db.on_rollback(lambda: self._undo(previous))
+        memory_db.on_commit(self._maybe_flush)
+
+    def _undo(self, previous: Dict[str, tuple]) -> None:
+        with self._lock:
+            for agent, (value, dirty_ts) in previous.items():
+                if value is _ABSENT:
+                    self._values.pop(agent, None)
+                else:
+                    self._values[agent] = value
+
+                if dirty_ts is None:
+                    self._dirty.pop(agent, None)
+                else:
+                    self._dirty[agent] = dirty_ts
+
+    def _evict(self) -> None:
+        # caller holds _lock. Least recently used CLEAN agents only: a
+        # dirty or in-flight value is not in SQLite yet
+        excess = len(self._values) - self.max_entries
+        if excess <= 0:
+            return
+        unflushed = len(self._dirty) + len(self._flushing)
+        for agent in list(islice(self._values, excess + unflushed)):
+            if excess <= 0:
+                break
+            if agent in self._dirty or agent in self._flushing:
+                continue
+            del self._values[agent]
+            excess -= 1
+            self.evictions += 1
+
+    # -------------------------------------------------
+    # Flushing
+    # -------------------------------------------------
+
+    def _maybe_flush(self) -> None:
+        due = (
+            len(self._dirty) >= self.flush_threshold
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        )
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write every dirty agent to the trust table. Returns rows written.
+
+        Uses its own connection so a flush never joins (or is rolled
+        back with) a caller's transaction.
+        """
+        with self._flush_lock:
+            with self._lock:
+                path = self._path
+                rows = [(a, self._values[a][0], ts) for a, ts in self._dirty.items()]
+                self._flushing = {a: (trust, ts) for a, trust, ts in rows}
+                self._dirty.clear()
+                self._last_flush = time.monotonic()
+
+            if not rows:
+                return 0
+
+            try:
+                conn = memory_db.get_connection(path)
+                try:
+                    with conn:
+                        conn.executemany(
+                            """
+                            INSERT INTO trust (agent, trust, last_updated)
+                            VALUES (?, ?, ?)
+                            ON CONFLICT(agent)
+                            DO UPDATE SET
+                                trust = excluded.trust,
+                                last_updated = excluded.last_updated
+                            """,
+                            rows,
+                        )
+                finally:
+                    conn.close()
+            except BaseException:
+                # keep them dirty (unless a newer write already is)
+                with self._lock:
+                    for agent, _trust, ts in rows:
+                        self._dirty.setdefault(agent, ts)
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+            self.flushes += 1
+            return len(rows)
+
+    def clear(self) -> None:
+        """
+        Flush, then forget everything (next reads go to SQLite).
+        """
+        self.flush()
+        with self._lock:
+            self._values.clear()
+            self._path = None
+
+    def _check_path(self) -> None:
+        # DB_PATH was switched (tests / benchmarks): drain to the old DB
+        if self._path != memory_db.DB_PATH:
+            if self._path is not None:
+                self.clear()
+            with self._lock:
+                self._path = memory_db.DB_PATH
+
+    # -------------------------------------------------
+    # Metrics
+    # -------------------------------------------------
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._values),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "dirty": len(self._dirty),
+                "flushes": self.flushes,
+            }
+
+
+# =================================================
+# Process-wide instance
+# =================================================
+
+TRUST_CACHE = TrustCache()
+
+memory_db.on_close(TRUST_CACHE.clear)
+atexit.register(TRUST_CACHE.flush)
@@ -0,0 +1,316 @@
+"""
+v0.31 – Trust Leaderboard (INDEXED, KEYSET-PAGED)
+
+Responsibilities:
+- Serve agents ranked by trust – top-N (desc) or bottom-N (asc),
+  optionally within [min_trust, max_trust] – one page at a time, straight
+  off idx_trust_trust(trust, agent): each page is one index range scan,
+  resumed from an opaque cursor (position, agent, rank), never an OFFSET
+- Summarize the whole trust table in SQL: agent count, avg / min / max
+  and a fixed-width histogram (one index range count per bucket)
+
+Neither ever materializes the full agent → trust map (get_all_trust).
+Both are pure reads: trust writes still waiting in the write-behind
+cache are overlaid on the SQLite rows, never flushed from here.
+
+With time decay on (CRE_TRUST_DECAY_HALF_LIFE_SECONDS) both report the
+decayed trust get_trust returns, as of the first page's time (kept in
+the cursor):
+- the leaderboard pages off idx_trust_decay_key, an index on
+  memory_db.decay_key – decayed trust ranks like it at any time, so
+  pages stay index range scans. The first page after a half-life change
+  (re)builds that index
+- the summary is one streamed pass over the trust table (decayed values
+  have no stored order a sum or a rounded bucket could use)
+"""
+
+import os
+import sqlite3
+import time
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from kernel.core import trust
+from kernel.core.export import decode_cursor, encode_cursor
+from kernel.core.memory_db import (
+    SQL_BATCH_SIZE,
+    connection,
+    decay_key,
+    snapshot,
+    transaction,
+    use_global,
+)
+from kernel.core.trust import DEFAULT_TRUST, TRUST_CEILING, TRUST_FLOOR, decayed_trust
+from kernel.core.trust_cache import TRUST_CACHE
+
+# =================================================
+# Configuration
+# =================================================
+
+LEADERBOARD_MAX_LIMIT = int(os.environ.get("CRE_TRUST_LEADERBOARD_MAX_LIMIT", "1000"))
+HISTOGRAM_MAX_BUCKETS = 1000
+
+# cursor key: agent is text, so it goes first (written last, see export)
+_CURSOR_KEY_TYPES = (str, float, int, float)
+
+_ORDERS = {
+    "desc": ("DESC", "<"),
+    "asc": ("ASC", ">"),
+}
+
+# decayed trust is rounded to 4 decimals: range filters on the decay key
+# are widened by one step, then applied exactly to the reported value
+_ROUNDING_SLACK = 0.0001
+
+
+# =================================================
+# Leaderboard
+# =================================================
+
+def get_trust_leaderboard(
+    limit: int = 50,
+    order: str = "desc",
+    min_trust: Optional[float] = None,
+    max_trust: Optional[float] = None,
+    cursor: Optional[str] = None,
+) -> Dict:
+    """
+    {"items": [{"rank", "agent", "trust"}], "next_cursor"}: the next
+    `limit` agents by trust (ties by agent name – with decay on, by
+    the unrounded decayed trust first), within the range.
+    next_cursor is None on the last page.
+    """
+    if order not in _ORDERS:
+        raise ValueError(f"order must be one of {', '.join(_ORDERS)}")
+    if not 1 <= limit <= LEADERBOARD_MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {LEADERBOARD_MAX_LIMIT}")
+    direction, after = _ORDERS[order]
+
+    rank, now, resume = 0, time.time(), None
+    if cursor is not None:
+        try:
+            _, (agent, position, rank, now) = decode_cursor(cursor, _CURSOR_KEY_TYPES)
+        except ValueError as e:
+            raise ValueError("invalid leaderboard cursor") from e
+        resume = (position, agent)
+
+    half_life = trust.TRUST_DECAY_HALF_LIFE_SECONDS
+    if half_life > 0:
+        column, slack = _decay_key_index(half_life), _ROUNDING_SLACK
+
+        def position_of(t: float, last_updated: Optional[float]) -> float:
+            return decay_key(t, last_updated, DEFAULT_TRUST, half_life)
+    else:
+        column, slack = "trust", 0.0
+
+        def position_of(t: float, last_updated: Optional[float]) -> float:
+            return t
+
+    where, params = [], []
+    if min_trust is not None:
+        where.append(f"{column} >= ?")
+        params.append(position_of(min_trust - slack, now))
+    if max_trust is not None:
+        where.append(f"{column} <= ?")
+        params.append(position_of(max_trust + slack, now))
+
+    def wanted(v: float) -> bool:
+        return not (min_trust is not None and v < min_trust or max_trust is not None and v > max_trust)
+
+    def past(key: Tuple[float, str]) -> bool:
+        return resume is None or (key < resume if order == "desc" else key > resume)
+
+    # taken BEFORE the query: a flush in between is then seen twice,
+    # never missed. Their rows may be stale → skipped, merged from here
+    pending = TRUST_CACHE.pending()
+
+    ranked: List[Tuple[float, str, float]] = []
+    for agent, (t, last_updated) in pending.items():
+        position, v = position_of(t, last_updated), decayed_trust(t, last_updated, now)
+        if wanted(v) and past((position, agent)):
+            ranked.append((position, agent, v))
+
+    # limit + 1 stored rows past the cursor; skipped ones cost another scan step
+    found, start = 0, resume
+    with use_global(), connection() as conn:
+        while found <= limit:
+            clauses, resume_params = list(where), []
+            if start is not None:
+                # spelled out: a row value over an expression is no index seek
+                clauses.append(f"{column} {after}= ? AND ({column} {after} ? OR agent {after} ?)")
+                resume_params = [start[0], *start]
+            rows = conn.execute(
+                f"""
+                SELECT {column}, agent, trust, last_updated FROM trust
+                {'WHERE ' + ' AND '.join(clauses) if clauses else ''}
+                ORDER BY {column} {direction}, agent {direction}
+                LIMIT ?
+                """,
+                (*params, *resume_params, limit + 1),
+            ).fetchall()
+            for position, agent, t, last_updated in rows:
+                v = decayed_trust(t, last_updated, now)
+                if agent not in pending and wanted(v):
+                    ranked.append((position, agent, v))
+                    found += 1
+            if len(rows) <= limit:
+                break
+            start = (rows[-1][0], rows[-1][1])
+
+    ranked.sort(key=lambda r: r[:2], reverse=order == "desc")
+
+    items = [
+        {"rank": rank + i + 1, "agent": agent, "trust": v}
+        for i, (_, agent, v) in enumerate(ranked[:limit])
+    ]
+    next_cursor = None
+    if len(ranked) > limit:
+        position, agent, _ = ranked[limit - 1]
+        next_cursor = encode_cursor(None, (agent, position, rank + limit, now))
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _decay_key_index(half_life: float) -> str:
+    """
+    The decay key column expression at this half-life. Its index is
+    built on first use and rebuilt when the half-life changes.
+    """
+    column = f"cre_decay_key(trust, last_updated, {DEFAULT_TRUST!r}, {float(half_life)!r})"
+    ddl = f"CREATE INDEX idx_trust_decay_key ON trust({column}, agent)"
+
+    with use_global(), connection() as conn:
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_trust_decay_key'").fetchone()
+    if row is None or row[0] != ddl:
+        with use_global(), transaction() as conn:
+            conn.execute("DROP INDEX IF EXISTS idx_trust_decay_key")
+            conn.execute(ddl)
+    return column
+
+
+# =================================================
+# Summary
+# =================================================
+
+def get_trust_summary(buckets: int = 20, low: float = TRUST_FLOOR, high: float = TRUST_CEILING) -> Dict:
+    """
+    {"agents", "avg", "min", "max", "histogram": [{"from", "to", "agents"}]}
+    over every stored trust row. The histogram splits [low, high] into
+    equal buckets (a value on a boundary counts in the upper one, `high`
+    in the last); values outside the range are left out of it.
+    """
+    if not 1 <= buckets <= HISTOGRAM_MAX_BUCKETS:
+        raise ValueError(f"buckets must be between 1 and {HISTOGRAM_MAX_BUCKETS}")
+    if not high > low:
+        raise ValueError("high must be above low")
+    width = (high - low) / buckets
+    # ROUND: a 4-decimal trust on a bucket boundary must not fall one bucket below
+    edges = [low] + [round(low + b * width, 9) for b in range(1, buckets)] + [high]
+
+    if trust.TRUST_DECAY_HALF_LIFE_SECONDS > 0:
+        agents, total, counts, values = _decayed_stats(edges, TRUST_CACHE.pending(), time.time())
+    else:
+        agents, total, counts, values = _stored_stats(
+            edges, {agent: t for agent, (t, _) in TRUST_CACHE.pending().items()}
+        )
+
+    return {
+        "agents": agents,
+        "avg": round(total / agents, 4) if agents else None,
+        "min": min(values, default=None),
+        "max": max(values, default=None),
+        "histogram": [
+            {"from": round(edges[b], 6), "to": round(edges[b + 1], 6), "agents": counts[b]}
+            for b in range(buckets)
+        ],
+    }
+
+
+def _stored_stats(edges: List[float], pending: Dict[str, float]) -> Tuple[int, float, List[int], List[float]]:
+    """
+    (agents, trust sum, bucket counts, min / max candidates) off
+    idx_trust_trust, pending writes overlaid.
+    """
+    buckets = len(edges) - 1
+
+    # each bucket is an index range count on idx_trust_trust – the ranges
+    # together walk the index once, whatever the bucket count; no
+    # per-row expression
+    ranges = ", ".join(
+        ["(SELECT COUNT(*) FROM trust WHERE trust >= ? AND trust < ?)"] * (buckets - 1)
+        + ["(SELECT COUNT(*) FROM trust WHERE trust >= ? AND trust <= ?)"]
+    )
+    params = [edge for b in range(buckets) for edge in (edges[b], edges[b + 1])]
+
+    # one read snapshot: the stats and the rows the pending writes replace
+    with use_global(), snapshot() as conn:
+        agents, total, *counts = conn.execute(
+            f"SELECT (SELECT COUNT(*) FROM trust), (SELECT SUM(trust) FROM trust), {ranges}",
+            params,
+        ).fetchone()
+        extremes = [_extreme(conn, "ASC", pending), _extreme(conn, "DESC", pending)]
+        replaced = _stored(conn, list(pending))
+
+    total = total or 0.0
+    for agent, t in pending.items():
+        if agent in replaced:
+            agents, total = agents - 1, total - replaced[agent]
+            _count(counts, edges, replaced[agent], -1)
+        agents, total = agents + 1, total + t
+        _count(counts, edges, t, 1)
+    return agents, total, counts, [v for v in extremes if v is not None] + list(pending.values())
+
+
+def _decayed_stats(
+    edges: List[float],
+    pending: Dict[str, Tuple[float, Optional[float]]],
+    now: float,
+) -> Tuple[int, float, List[int], List[float]]:
+    """
+    _stored_stats over the trust get_trust reports at `now`: one streamed
+    pass (constant memory), rows replaced by pending writes skipped.
+    """
+    agents, total, counts = 0, 0.0, [0] * (len(edges) - 1)
+    low = high = None
+
+    def add(v: float) -> None:
+        nonlocal agents, total, low, high
+        agents, total = agents + 1, total + v
+        low = v if low is None or v < low else low
+        high = v if high is None or v > high else high
+        _count(counts, edges, v, 1)
+
+    with use_global(), snapshot() as conn:
+        for agent, t, last_updated in conn.execute("SELECT agent, trust, last_updated FROM trust"):
+            if agent not in pending:
+                add(decayed_trust(t, last_updated, now))
+    for t, last_updated in pending.values():
+        add(decayed_trust(t, last_updated, now))
+
+    return agents, total, counts, [v for v in (low, high) if v is not None]
+
+
+def _extreme(conn: sqlite3.Connection, direction: str, pending: Dict[str, float]) -> Optional[float]:
+    # lowest / highest stored trust not replaced by a pending write
+    for t, agent in conn.execute(
+        f"SELECT trust, agent FROM trust ORDER BY trust {direction} LIMIT ?", (len(pending) + 1,)
+    ):
+        if agent not in pending:
+            return t
+    return None
+
+
+def _stored(conn: sqlite3.Connection, agents: List[str]) -> Dict[str, float]:
+    stored: Dict[str, float] = {}
+    for i in range(0, len(agents), SQL_BATCH_SIZE):
+        chunk = agents[i:i + SQL_BATCH_SIZE]
+        stored.update(conn.execute(
+            f"SELECT agent, trust FROM trust WHERE agent IN ({','.join('?' * len(chunk))})", chunk
+        ).fetchall())
+    return stored
+
+
+def _count(counts: List[int], edges: List[float], value: float, step: int) -> None:
+    # same buckets as the SQL ranges
+    if edges[0] <= value <= edges[-1]:
+        counts[min(bisect_right(edges, value) - 1, len(counts) - 1)] += step
@@ -0,0 +1,392 @@
+"""
+v0.29 – Trust Timeline (CHECKPOINTED, DOWNSAMPLED)
+
+Responsibilities:
+- Every trust event stores the agent's trust after it (trust_after),
+  so any point of the history is one indexed read – no walk back
+  from the current trust
+- Keep one checkpoint per agent per CHECKPOINT_SECONDS period
+  (events, min / max with their time, last value) inside the
+  transaction that writes the events
+- Serve an agent's timeline over a time range, downsampled server-side
+  to at most max_points (min / max per bucket): whole periods are read
+  from the checkpoints, only the partial periods at the range edges
+  from trust_events
+- Serve many agents' trust on one shared time grid (forward-filled
+  bucket closes, NumPy), columnar – one request per multi-agent plot
+- Rebuild the checkpoints from trust_events
+
+Changing CRE_TRUST_CHECKPOINT_SECONDS requires a rebuild.
+
+Checkpoints outlive event retention (kernel.core.event_rollups): once
+raw events are pruned, their periods are served from the checkpoints
+alone, and rebuilds keep them.
+
+Usage:
+    python -m kernel.core.trust_timeline    # rebuild checkpoints
+"""
+
+import math
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from kernel.core.event_rollups import pruned_before
+from kernel.core.memory_db import connection, transaction, use_global
+
+# =================================================
+# Configuration
+# =================================================
+
+CHECKPOINT_SECONDS = float(os.environ.get("CRE_TRUST_CHECKPOINT_SECONDS", "3600"))
+
+# /trust/timeline default (0 = every event)
+TIMELINE_MAX_POINTS = int(os.environ.get("CRE_TRUST_TIMELINE_MAX_POINTS", "1000"))
+
+# largest grid get_trust_grid serves (buckets per agent)
+GRID_MAX_POINTS = int(os.environ.get("CRE_TRUST_GRID_MAX_POINTS", "10000"))
+
+REBUILD_CHUNK = 50_000
+
+
+def period_of(timestamp: float) -> float:
+    return math.floor(timestamp / CHECKPOINT_SECONDS) * CHECKPOINT_SECONDS
+
+
+# =================================================
+# Write path (called inside the trust-event transaction)
+# =================================================
+
+def record_checkpoints(conn: sqlite3.Connection, events: Iterable[Tuple[str, float, float]]) -> None:
+    """
+    events: (agent, trust_after, timestamp), in write order.
+    Folded per (agent, period) first: one upsert per checkpoint touched.
+    """
+    folded: Dict[Tuple[str, float], list] = {}
+    for agent, trust, ts in events:
+        key = (agent, period_of(ts))
+        c = folded.get(key)
+        if c is None:
+            folded[key] = [1, trust, ts, trust, ts, trust, ts]
+            continue
+        c[0] += 1
+        if trust < c[1]:
+            c[1], c[2] = trust, ts
+        if trust > c[3]:
+            c[3], c[4] = trust, ts
+        if ts >= c[6]:
+            c[5], c[6] = trust, ts
+
+    # SET expressions all read the pre-update row
+    conn.executemany(
+        """
+        INSERT INTO trust_checkpoints
+            (agent, period_start, events, trust_min, min_at, trust_max, max_at, trust_last, last_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(agent, period_start) DO UPDATE SET
+            events = events + excluded.events,
+            trust_min = MIN(trust_min, excluded.trust_min),
+            min_at = CASE WHEN excluded.trust_min < trust_min THEN excluded.min_at ELSE min_at END,
+            trust_max = MAX(trust_max, excluded.trust_max),
+            max_at = CASE WHEN excluded.trust_max > trust_max THEN excluded.max_at ELSE max_at END,
+            trust_last = CASE WHEN excluded.last_at >= last_at THEN excluded.trust_last ELSE trust_last END,
+            last_at = MAX(last_at, excluded.last_at)
+        """,
+        [(agent, period, *c) for (agent, period), c in folded.items()],
+    )
+
+
+# =================================================
+# Read path
+# =================================================
+
+Point = Tuple[float, float]   # (timestamp, trust)
+
+
+def get_trust_timeline(
+    agent: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    max_points: Optional[int] = None,
+) -> List[Dict]:
+    """
+    [{"timestamp", "trust"}] of the agent's trust events in [start, end]
+    (default: the whole history), oldest first.
+
+    max_points (0 / None = every event, else at least 2): above it, the
+    range is split into max_points // 2 equal buckets, each contributing
+    its minimum and maximum (in time order).
+    """
+    if max_points and max_points < 2:
+        raise ValueError("max_points must be 0 (every event) or at least 2")
+
+    with use_global(), connection() as conn:
+        if start is None or end is None:
+            first, last = _bounds(conn, agent)
+            if first is None:
+                return []
+            start = first if start is None else start
+            end = last if end is None else end
+
+        buckets = max_points // 2 if max_points else 0
+        width = (end - start) / buckets if buckets else 0.0
+
+        if width < CHECKPOINT_SECONDS:
+            points = _events(conn, agent, start, end)
+            if buckets and len(points) > max_points:
+                points = _downsample(points, start, width, buckets)
+        else:
+            # whole periods from checkpoints, partial ones from raw events
+            inner_start = math.ceil(start / CHECKPOINT_SECONDS) * CHECKPOINT_SECONDS
+            inner_end = period_of(end)
+            samples = _events(conn, agent, start, inner_start, upper_open=True)
+            for r in conn.execute(
+                """
+                SELECT min_at, trust_min, max_at, trust_max
+                FROM trust_checkpoints
+                WHERE agent = ? AND period_start >= ? AND period_start < ?
+                ORDER BY period_start
+                """,
+                (agent, inner_start, inner_end),
+            ):
+                samples.extend(sorted(((r[0], r[1]), (r[2], r[3]))))
+            samples.extend(_events(conn, agent, inner_end, end))
+            points = _downsample(samples, start, width, buckets)
+
+    return [{"timestamp": ts, "trust": trust} for ts, trust in points]
+
+
+def _events(
+    conn: sqlite3.Connection, agent: str, start: float, end: float, upper_open: bool = False
+) -> List[Point]:
+    rows = conn.execute(
+        f"""
+        SELECT timestamp, trust_after
+        FROM trust_events
+        WHERE agent = ? AND timestamp >= ? AND timestamp {'<' if upper_open else '<='} ?
+          AND trust_after IS NOT NULL
+        ORDER BY timestamp, id
+        """,
+        (agent, start, end),
+    )
+    return [(r[0], r[1]) for r in rows]
+
+
+def _downsample(points: Iterable[Point], start: float, width: float, buckets: int) -> List[Point]:
+    """
+    Min / max bucketing of time-ordered points.
+    """
+    lows: Dict[int, Point] = {}
+    highs: Dict[int, Point] = {}
+    for ts, trust in points:
+        b = min(int((ts - start) / width), buckets - 1) if width > 0 else 0
+        if b not in lows or trust < lows[b][1]:
+            lows[b] = (ts, trust)
+        if b not in highs or trust > highs[b][1]:
+            highs[b] = (ts, trust)
+
+    out: List[Point] = []
+    for b in sorted(lows):
+        low, high = lows[b], highs[b]
+        if low == high:
+            out.append(low)
+        else:
+            out.extend(sorted((low, high)))
+    return out
+
+
+# =================================================
+# Multi-agent grid
+# =================================================
+
+def get_trust_grid(
+    agents: List[str],
+    bucket_seconds: float,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Dict:
+    """
+    Every agent's trust resampled to one grid, columnar:
+
+        {"bucket_seconds", "timestamps": [bucket starts],
+         "series": {agent: [trust or None, ...]}}
+
+    Buckets are aligned to multiples of bucket_seconds and cover
+    [start, end] (default: the agents' whole history). Each value is the
+    bucket's close: the trust after the agent's last event before the
+    bucket ends, forward-filled; None before its first event.
+
+    Buckets that are whole checkpoint periods read the checkpoints'
+    last values instead of the events.
+    """
+    if not bucket_seconds > 0:
+        raise ValueError("bucket_seconds must be positive")
+    agents = list(dict.fromkeys(agents))
+    empty = {"bucket_seconds": bucket_seconds, "timestamps": [], "series": {a: [] for a in agents}}
+    if not agents:
+        return empty
+
+    with use_global(), connection() as conn:
+        if start is None or end is None:
+            bounds = [_bounds(conn, agent) for agent in agents]
+            firsts = [b[0] for b in bounds if b[0] is not None]
+            if not firsts:
+                return empty
+            start = min(firsts) if start is None else start
+            end = max(b[1] for b in bounds if b[1] is not None) if end is None else end
+
+        first_bucket = math.floor(start / bucket_seconds)
+        n = math.floor(end / bucket_seconds) - first_bucket + 1
+        if n <= 0:
+            return empty
+        if n > GRID_MAX_POINTS:
+            raise ValueError(f"grid of {n} buckets exceeds {GRID_MAX_POINTS}; use larger buckets")
+
+        labels = (first_bucket + np.arange(n)) * bucket_seconds
+        grid_start, grid_end = float(labels[0]), float(labels[-1] + bucket_seconds)
+        closes = labels + bucket_seconds
+
+        # whole periods per bucket: a checkpoint's last event is before
+        # a bucket end exactly when its period is
+        from_checkpoints = (bucket_seconds / CHECKPOINT_SECONDS).is_integer()
+        # raw events before this are gone: their periods' closes stand in
+        pruned = max(grid_start, min(pruned_before(conn, "trust_events") or grid_start, grid_end))
+
+        series: Dict[str, list] = {}
+        for agent in agents:
+            if from_checkpoints:
+                rows = _grid_rows(conn, agent, grid_start, grid_end, bucket_seconds, True)
+            else:
+                rows = np.concatenate((
+                    _grid_rows(conn, agent, grid_start, pruned, CHECKPOINT_SECONDS, True),
+                    _grid_rows(conn, agent, pruned, grid_end, bucket_seconds, False),
+                ))
+            seed = _value_before(conn, agent, grid_start, from_checkpoints)
+            # forward fill: index of the last row strictly before each close,
+            # -1 (→ the seed) for buckets that close before the first one
+            idx = np.searchsorted(rows[:, 0], closes, side="left") - 1
+            values = np.concatenate(([np.nan if seed is None else seed], rows[:, 1]))
+            filled = values[idx + 1]
+            series[agent] = [None if v != v else v for v in filled.tolist()]
+
+    return {"bucket_seconds": bucket_seconds, "timestamps": labels.tolist(), "series": series}
+
+
+def _bounds(conn: sqlite3.Connection, agent: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    (first, last) event time of the agent – history pruned from
+    trust_events starts at its first checkpoint instead.
+    """
+    # two queries: each is one index probe, MIN + MAX together scan
+    first, last = (
+        conn.execute(f"SELECT {fn}(timestamp) FROM trust_events WHERE agent = ?", (agent,)).fetchone()[0]
+        for fn in ("MIN", "MAX")
+    )
+    oldest = conn.execute(
+        "SELECT period_start FROM trust_checkpoints WHERE agent = ? ORDER BY period_start LIMIT 1", (agent,)
+    ).fetchone()
+    if oldest is not None and (first is None or oldest[0] < period_of(first)):
+        first = oldest[0]
+    if first is not None and last is None:
+        last = conn.execute(
+            "SELECT last_at FROM trust_checkpoints WHERE agent = ? ORDER BY period_start DESC LIMIT 1", (agent,)
+        ).fetchone()[0]
+    return first, last
+
+
+def _grid_rows(
+    conn: sqlite3.Connection, agent: str, start: float, end: float, width: float, from_checkpoints: bool
+) -> np.ndarray:
+    """
+    (timestamp, trust) rows of the agent in [start, end), time-ordered:
+    every event, or – on whole-period buckets – only each bucket's last
+    checkpoint (the only one a close can land on).
+    """
+    if from_checkpoints:
+        # bare trust_last comes from the row with the MAX (periods never tie)
+        rows = conn.execute(
+            """
+            SELECT MAX(last_at), trust_last FROM trust_checkpoints
+            WHERE agent = ? AND period_start >= ? AND period_start < ?
+            GROUP BY CAST((period_start - ?) / ? AS INTEGER)
+            """,
+            (agent, start, end, start, width),
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            """
+            SELECT timestamp, trust_after FROM trust_events
+            WHERE agent = ? AND timestamp >= ? AND timestamp < ? AND trust_after IS NOT NULL
+            ORDER BY timestamp, id
+            """,
+            (agent, start, end),
+        ).fetchall()
+
+    rows = np.array(rows, dtype=float).reshape(-1, 2)
+    return rows[np.argsort(rows[:, 0], kind="stable")] if from_checkpoints else rows
+
+
+def _value_before(conn: sqlite3.Connection, agent: str, when: float, from_checkpoints: bool) -> Optional[float]:
+    row = None
+    if not from_checkpoints:
+        row = conn.execute(
+            """
+            SELECT trust_after FROM trust_events
+            WHERE agent = ? AND timestamp < ? AND trust_after IS NOT NULL
+            ORDER BY timestamp DESC, id DESC LIMIT 1
+            """,
+            (agent, when),
+        ).fetchone()
+        # pruned raw events: the close of the last whole period before
+        when = period_of(when)
+    if row is None:
+        row = conn.execute(
+            """
+            SELECT trust_last FROM trust_checkpoints
+            WHERE agent = ? AND period_start < ?
+            ORDER BY period_start DESC LIMIT 1
+            """,
+            (agent, when),
+        ).fetchone()
+    return None if row is None else row[0]
+
+
+# =================================================
+# Rebuild
+# =================================================
+
+def rebuild_trust_checkpoints() -> int:
+    """
+    Regenerate trust_checkpoints from trust_events. Returns the checkpoint count.
+    """
+    with use_global(), transaction() as conn:
+        return _rebuild(conn, pruned_before(conn, "trust_events"))
+
+
+def _rebuild(conn: sqlite3.Connection, since: Optional[float] = None) -> int:
+    """
+    Checkpoints of periods before since (pruned raw events) are kept.
+    """
+    since = -math.inf if since is None else period_of(since)
+    conn.execute("DELETE FROM trust_checkpoints WHERE period_start >= ?", (since,))
+    cur = conn.execute(
+        "SELECT agent, trust_after, timestamp FROM trust_events "
+        "WHERE trust_after IS NOT NULL AND timestamp >= ? ORDER BY id",
+        (since,),
+    )
+    while True:
+        rows = cur.fetchmany(REBUILD_CHUNK)
+        if not rows:
+            break
+        record_checkpoints(conn, [tuple(r) for r in rows])
+    return conn.execute("SELECT COUNT(*) FROM trust_checkpoints").fetchone()[0]
+
+
+# =================================================
+# CLI
+# =================================================
+
+if __name__ == "__main__":
+    print(f"rebuilt {rebuild_trust_checkpoints()} trust checkpoints")
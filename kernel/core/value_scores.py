@@ -0,0 +1,261 @@
+"""
+v0.21 – Entity Value Scores (INCREMENTAL CONSENSUS INPUT)
+
+Responsibilities:
+- Maintain entity_value_scores(entity, value_hash, score, count,
+  first_claim_id, last_claim_id) inside the claim-insert transaction
+  (score = sum(confidence × trust) over every claim, hot or archived)
+- Serve resolve_entity the two best values of an entity
+  (ranked in SQL) instead of every claim row
+- Recompute entities whose claims were replaced (upsert mode)
+- Rebuild the table from claims + claims_archive (rebuilt entities are
+  marked dirty: their stored resolution may no longer hold)
+
+Scores are accumulated in claim-id order, so they are bit-for-bit the
+sums resolve_consensus computes over the raw claims.
+
+Values are identified by their digest (kernel.core.claim_values);
+callers turn the winning digest back into text.
+
+Usage:
+    python -m kernel.core.value_scores [entity]    # rebuild
+"""
+
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from kernel.core.dirty_entities import mark_dirty
+from kernel.core.memory_db import (
+    SQL_BATCH_SIZE,
+    connection,
+    shard_of,
+    shards,
+    transaction,
+    use_shard,
+)
+from kernel.core.resolution_cache import RESOLUTION_CACHE
+
+
+# =================================================
+# Write path (called inside the claim transaction)
+# =================================================
+
+def bump_value_scores(conn: sqlite3.Connection, claims: Iterable[Tuple]) -> None:
+    """
+    claims: (id, entity, value_hash, confidence, trust), in id order.
+    """
+    conn.executemany(
+        """
+        INSERT INTO entity_value_scores
+            (entity, value_hash, score, count, first_claim_id, last_claim_id)
+        VALUES (?, ?, ?, 1, ?, ?)
+        ON CONFLICT(entity, value_hash) DO UPDATE SET
+            score = score + excluded.score,
+            count = count + 1,
+            last_claim_id = excluded.last_claim_id
+        """,
+        [
+            (entity, digest, float(confidence) * float(trust), claim_id, claim_id)
+            for claim_id, entity, digest, confidence, trust in claims
+        ],
+    )
+
+
+def refresh_value_scores(conn: sqlite3.Connection, entities: List[str]) -> None:
+    """
+    Recompute the scores of entities whose claims were replaced (an
+    upserted claim takes its old value's score with it), from their
+    current claims. Scores are sums, so there is no exact decrement.
+    """
+    for i in range(0, len(entities), SQL_BATCH_SIZE // 2):
+        chunk = entities[i:i + SQL_BATCH_SIZE // 2]
+        placeholders = ",".join("?" * len(chunk))
+        _recompute(conn, f"WHERE entity IN ({placeholders})", chunk)
+
+
+# =================================================
+# Read path
+# =================================================
+
+def get_value_scores(entity: str) -> List[Tuple[bytes, float, int]]:
+    """
+    (value_hash, score, count) per distinct value, in first-appearance order
+    – the input resolve_scored_consensus expects.
+    """
+    with connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT value_hash, score, count
+            FROM entity_value_scores
+            WHERE entity = ?
+            ORDER BY first_claim_id
+            """,
+            (entity,),
+        ).fetchall()
+    return [(r[0], float(r[1]), int(r[2])) for r in rows]
+
+
+def get_high_water_mark(entity: str) -> int:
+    """
+    Newest claim id of an entity (0 = no claims). Resolution cache key.
+    """
+    with connection() as conn:
+        row = conn.execute(
+            "SELECT COALESCE(MAX(last_claim_id), 0) FROM entity_value_scores WHERE entity = ?",
+            (entity,),
+        ).fetchone()
+    return int(row[0])
+
+
+def get_top_value_scores(entity: str) -> Tuple[List[Tuple[bytes, float]], int, int]:
+    """
+    Ranking pushed into SQL: (top, total_claims, distinct_values), top
+    being the two best (value_hash, score) pairs – the input
+    resolve_ranked_consensus expects. Only those rows leave SQLite.
+    """
+    with connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT value_hash, score,
+                   SUM(count) OVER () AS total_claims,
+                   COUNT(*) OVER () AS distinct_values
+            FROM entity_value_scores
+            WHERE entity = ? AND count > 0
+            ORDER BY score DESC, first_claim_id
+            LIMIT 2
+            """,
+            (entity,),
+        ).fetchall()
+
+    if not rows:
+        return [], 0, 0
+    return [(r[0], float(r[1])) for r in rows], int(rows[0][2]), int(rows[0][3])
+
+
+def get_value_scores_many(entities: List[str]) -> List[Tuple[str, bytes, float, int]]:
+    """
+    (entity, value_hash, score, count) for many entities, grouped by entity,
+    each group in first-appearance order (resolve_consensus_batch input).
+    """
+    rows: List[Tuple[str, bytes, float, int]] = []
+
+    with connection() as conn:
+        for i in range(0, len(entities), SQL_BATCH_SIZE):
+            chunk = entities[i:i + SQL_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(
+                (r[0], r[1], float(r[2]), int(r[3]))
+                for r in conn.execute(
+                    f"""
+                    SELECT entity, value_hash, score, count
+                    FROM entity_value_scores
+                    WHERE entity IN ({placeholders})
+                    ORDER BY entity, first_claim_id
+                    """,
+                    chunk,
+                )
+            )
+
+    return rows
+
+
+def get_high_water_marks(entities: List[str]) -> Dict[str, int]:
+    """
+    get_high_water_mark for many entities (entities without claims omitted).
+    """
+    marks: Dict[str, int] = {}
+
+    with connection() as conn:
+        for i in range(0, len(entities), SQL_BATCH_SIZE):
+            chunk = entities[i:i + SQL_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            marks.update(
+                (r[0], int(r[1]))
+                for r in conn.execute(
+                    f"""
+                    SELECT entity, MAX(last_claim_id)
+                    FROM entity_value_scores
+                    WHERE entity IN ({placeholders})
+                    GROUP BY entity
+                    """,
+                    chunk,
+                )
+            )
+
+    return marks
+
+
+# =================================================
+# Rebuild
+# =================================================
+
+def rebuild_value_scores(entity: Optional[str] = None) -> int:
+    """
+    Regenerate scores from claims + claims_archive (all entities, or one).
+    Returns the number of (entity, value_hash) rows written.
+    """
+    targets = [shard_of(entity)] if entity is not None else shards()
+    written = 0
+    for shard in targets:
+        with use_shard(shard):
+            written += _rebuild_shard(entity)
+
+    RESOLUTION_CACHE.bump_trust_epoch()
+    return written
+
+
+def _rebuild_shard(entity: Optional[str]) -> int:
+    with transaction() as conn:
+        if entity is None:
+            return _recompute(conn, "", [])
+        return _recompute(conn, "WHERE entity = ?", [entity])
+
+
+def _recompute(conn: sqlite3.Connection, where: str, params: List) -> int:
+    """
+    Replace the scores selected by where (on entity) with sums over the
+    hot + archived claims, in claim-id order, and mark those entities
+    dirty (GET /resolve serves stored resolutions of clean entities only).
+    """
+    scores: Dict[Tuple[str, bytes], list] = {}
+
+    for e, digest, score, claim_id in conn.execute(
+        f"""
+        SELECT entity, value_hash, confidence * trust, id FROM claims {where}
+        UNION ALL
+        SELECT entity, value_hash, confidence * trust, id FROM claims_archive {where}
+        ORDER BY 4
+        """,
+        [*params, *params],
+    ):
+        s = scores.setdefault((e, digest), [0.0, 0, claim_id, claim_id])
+        s[0] += score
+        s[1] += 1
+        s[3] = claim_id
+
+    conn.execute(f"DELETE FROM entity_value_scores {where}", params)
+    conn.executemany(
+        """
+        INSERT INTO entity_value_scores
+            (entity, value_hash, score, count, first_claim_id, last_claim_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [(e, v, *s) for (e, v), s in scores.items()],
+    )
+
+    marks: Dict[str, int] = {}
+    for (e, _), s in scores.items():
+        marks[e] = max(marks.get(e, 0), s[3])
+    mark_dirty(conn, marks.items())
+    return len(scores)
+
+
+# =================================================
+# CLI
+# =================================================
+
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else None
+    print(f"rebuilt {rebuild_value_scores(target)} entity/value scores")
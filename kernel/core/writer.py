@@ -0,0 +1,271 @@
+"""
+v0.19 – Single SQLite Writer (GROUP COMMIT)
+
+Responsibilities:
+- Own the ONLY write path of the API process (one dedicated thread)
+- Batch jobs from all callers into one transaction (group commit):
+  up to MAX_BATCH jobs, waiting at most MAX_LATENCY for stragglers
+- Isolate jobs with SAVEPOINTs (a failing job never aborts its batch)
+- Hand results back as futures (await asyncio.wrap_future(...) in async code)
+- Sharded ledger (CRE_DB_SHARDS > 1): one writer per shard file,
+  so shards commit in parallel. A shard job's global-store writes
+  (trust learning) are queued in the shard's outbox with its data and
+  applied by the global writer (kernel.core.outbox)
+- A post-commit hook that fails never fails the committed jobs
+
+Reads are NOT routed here – they keep running concurrently on each
+thread's pooled reader connection (WAL).
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from kernel.core import memory_db
+from kernel.core.memory_db import CommitHookError, savepoint, transaction, use_shard
+
+# =================================================
+# Configuration
+# =================================================
+
+MAX_BATCH = int(os.environ.get("CRE_WRITER_MAX_BATCH", "64"))
+MAX_LATENCY_SECONDS = float(os.environ.get("CRE_WRITER_MAX_LATENCY_MS", "2")) / 1000
+
+_STOP = object()
+
+_local = threading.local()
+
+
+def current_writer() -> Optional["SQLiteWriter"]:
+    """
+    The writer whose thread this is (None off writer threads).
+    """
+    return getattr(_local, "writer", None)
+
+
+class SQLiteWriter:
+    """
+    Queue-fed writer thread. Jobs are plain callables that use the
+    normal kernel write APIs (their transaction() blocks on the
+    writer's DB join the batch).
+
+    shard: ledger shard whose file the batch transaction is opened on
+    (None = the global store).
+    """
+
+    def __init__(
+        self,
+        max_batch: int = MAX_BATCH,
+        max_latency: float = MAX_LATENCY_SECONDS,
+        shard: Optional[int] = None,
+    ) -> None:
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.shard = shard
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.jobs = 0
+        self.failed_jobs = 0
+        self.batches = 0
+        self.hook_errors = 0
+        self.last_hook_error: Optional[str] = None
+
+    # -------------------------------------------------
+    # Public API
+    # -------------------------------------------------
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue fn(*args, **kwargs) for the next group commit.
+
+        The future resolves AFTER the batch containing it has committed.
+        """
+        future: Future = Future()
+
+        # Already on the writer thread (job submitting a job): run inline
+        if threading.current_thread() is self._thread:
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        self._ensure_started()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Blocking submit (for synchronous callers).
+        """
+        return self.submit(fn, *args, **kwargs).result()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Drain queued jobs, then stop the writer thread.
+        """
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+
+        thread.join(timeout)
+        with self._start_lock:
+            self._thread = None
+
+    def stats(self) -> Dict:
+        return {
+            "running": self._thread is not None,
+            "queued": self._queue.qsize(),
+            "jobs": self.jobs,
+            "failed_jobs": self.failed_jobs,
+            "batches": self.batches,
+            "hook_errors": self.hook_errors,
+            "last_hook_error": self.last_hook_error,
+            "avg_batch_size": round(self.jobs / self.batches, 2) if self.batches else 0.0,
+        }
+
+    # -------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._loop,
+                    name="cre-sqlite-writer" if self.shard is None else f"cre-sqlite-writer-{self.shard}",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _loop(self) -> None:
+        _local.writer = self
+        with use_shard(self.shard):
+            self._drain()
+
+    def _drain(self) -> None:
+        stopping = False
+
+        while not stopping:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+
+            batch = [job]
+            deadline = time.monotonic() + self.max_latency
+
+            while len(batch) < self.max_batch:
+                try:
+                    # take whatever is already queued, then wait out the latency budget
+                    job = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stopping = True
+                    break
+                batch.append(job)
+
+            self._commit(batch)
+
+    def _commit(self, batch: List[tuple]) -> None:
+        outcomes = []
+
+        try:
+            with transaction() as conn:
+                # take the write lock up front (no lock upgrade mid-batch)
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+
+                for future, fn, args, kwargs in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with savepoint():
+                            outcomes.append((future, fn(*args, **kwargs), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except CommitHookError as e:
+            # committed: the jobs stand, only an after-commit hook failed
+            self.hook_errors += 1
+            self.last_hook_error = str(e.__cause__ or e)
+        except BaseException as e:
+            # the group commit itself failed → nothing in it is durable
+            for future, _fn, _args, _kwargs in batch:
+                if future.running():
+                    future.set_exception(e)
+            self.batches += 1
+            self.jobs += len(batch)
+            self.failed_jobs += len(batch)
+            return
+
+        self.batches += 1
+        self.jobs += len(outcomes)
+
+        for future, result, error in outcomes:
+            if error is not None:
+                self.failed_jobs += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+# =================================================
+# Process-wide writers (API)
+# =================================================
+
+# global store (also every shard when the ledger is not sharded)
+WRITER = SQLiteWriter()
+
+_shard_writers: Dict[int, SQLiteWriter] = {}
+_shard_writers_lock = threading.Lock()
+
+
+def shard_writer(shard: int) -> SQLiteWriter:
+    """
+    Writer owning a ledger shard (WRITER when not sharded).
+    """
+    if memory_db.SHARD_COUNT <= 1:
+        return WRITER
+
+    with _shard_writers_lock:
+        if shard not in _shard_writers:
+            _shard_writers[shard] = SQLiteWriter(shard=shard)
+        return _shard_writers[shard]
+
+
+def entity_writer(entity: str) -> SQLiteWriter:
+    return shard_writer(memory_db.shard_of(entity))
+
+
+def run_on_shard(shard: int, fn: Callable[..., Any], *args) -> Any:
+    """
+    Blocking run on the shard's writer (runner for background jobs).
+    """
+    return shard_writer(shard).run(fn, *args)
+
+
+def stop_writers(timeout: Optional[float] = None) -> None:
+    with _shard_writers_lock:
+        writers = list(_shard_writers.values())
+    for writer in writers:
+        writer.stop(timeout)
+    WRITER.stop(timeout)
+
+
+def writer_stats() -> Dict:
+    stats = WRITER.stats()
+    with _shard_writers_lock:
+        if _shard_writers:
+            stats["shards"] = {shard: w.stats() for shard, w in sorted(_shard_writers.items())}
+    return stats
@@ -1,6 +1,6 @@
 """
 Multi-agent Trust Timeline Plot
-Client-side aggregation (OPTION 1)
+Server-side grid: every agent in ONE request (/trust/timeline/batch)
 """
 
 import requests
@@ -15,15 +15,20 @@ HEADERS = {"X-Intent": "READ"}
 
 AGENTS = ["Senior", "Junior"]   # add more agents here
 
+BUCKET_SECONDS = 3600           # multiples of the checkpoint period are cheapest
+
 # -----------------------------------------
-# Fetch timeline for one agent
+# Fetch every agent on one time grid
 # -----------------------------------------
 
-def fetch_timeline(agent):
-    url = f"{API_BASE}/trust/timeline?agent={agent}"
-    response = requests.get(url, headers=HEADERS)
+def fetch_grid(agents):
+    response = requests.post(
+        f"{API_BASE}/trust/timeline/batch",
+        json={"agents": agents, "bucket_seconds": BUCKET_SECONDS},
+        headers=HEADERS,
+    )
     response.raise_for_status()
-    return response.json()["timeline"]
+    return response.json()["data"]
 
 # -----------------------------------------
 # Plot multiple agents
@@ -32,17 +37,18 @@ def fetch_timeline(agent):
 def plot_multi_agent():
     plt.figure(figsize=(10, 5))
 
+    grid = fetch_grid(AGENTS)
+    x = grid["timestamps"]
+
     for agent in AGENTS:
-        timeline = fetch_timeline(agent)
+        # None before the agent's first event (a gap in the line)
+        y = grid["series"][agent]
 
-        if not timeline:
+        if not any(v is not None for v in y):
             print(f"⚠️ No data for {agent}")
             continue
 
-        x = [e["timestamp"] for e in timeline]
-        y = [e["trust"] for e in timeline]
-
-        plt.plot(x, y, marker="o", label=agent)
+        plt.plot(x, [float("nan") if v is None else v for v in y], label=agent)
 
     plt.title("Trust Evolution (Multi-Agent)")
     plt.xlabel("Time (unix timestamp)")
@@ -0,0 +1,21 @@
+import os
+
+# Tests never touch data/cre_memory.db (shared in-memory DB by default)
+os.environ.setdefault("CRE_DB_PATH", ":memory:")
+
+import pytest
+
+from kernel.core import audit, memory_db
+
+
+@pytest.fixture
+def tmp_db(tmp_path, monkeypatch):
+    """
+    Point the memory layer at a fresh, isolated SQLite file.
+    """
+    memory_db.close_connections()
+    monkeypatch.setattr(memory_db, "DB_PATH", tmp_path / "cre_memory.db")
+    monkeypatch.setattr(audit, "AUDIT_LOG_FILE", tmp_path / "audit_log.jsonl")
+    memory_db.init_db()
+    yield memory_db.DB_PATH
+    memory_db.close_connections()
@@ -0,0 +1,76 @@
+import random
+
+from kernel.core.archive import ArchiveJob, archive_batch
+from kernel.core.claim_values import get_values
+from kernel.core.consensus import resolve_consensus
+from kernel.core.ledger import add_claim, resolve_entity
+from kernel.core.memory_db import connection
+
+
+def _count(table: str) -> int:
+    with connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def _all_claims(entity: str):
+    with connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT id, value_hash AS value, confidence, trust FROM claims WHERE entity = ?
+            UNION ALL
+            SELECT id, value_hash AS value, confidence, trust FROM claims_archive WHERE entity = ?
+            ORDER BY id
+            """,
+            (entity, entity),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _strip(record):
+    return {k: record.get(k) for k in ("status", "value", "reason")}
+
+
+def test_resolution_is_identical_after_archival(tmp_db) -> None:
+    rng = random.Random(3)
+    for _ in range(40):
+        add_claim(f"agent-{rng.randrange(4)}", "DB_PORT", rng.choice(["5432", "3306"]), rng.random())
+
+    resolve_entity("DB_PORT")
+    assert archive_batch(retention_days=365) and _count("claims") == 0
+
+    # new hot claims on top of the archived history
+    add_claim("agent-9", "DB_PORT", "3306", 1.0)
+    add_claim("agent-8", "DB_PORT", "27017", 0.5)
+
+    expected = resolve_consensus(_all_claims("DB_PORT"))
+    if "value" in expected:
+        expected["value"] = get_values([expected["value"]])[expected["value"]]
+    assert _strip(resolve_entity("DB_PORT")) == _strip(expected)
+
+
+def test_single_archived_claim_keeps_single_claim_reason(tmp_db) -> None:
+    add_claim("senior", "DB_HOST", "db.local", 0.9)
+    resolve_entity("DB_HOST")
+    archive_batch(retention_days=365)
+
+    assert _strip(resolve_entity("DB_HOST")) == {
+        "status": "resolved",
+        "value": "db.local",
+        "reason": "Single claim",
+    }
+
+
+def test_archive_job_reports_progress_and_bounds_hot_table(tmp_db) -> None:
+    for i in range(25):
+        add_claim("junior", f"entity-{i}", "v", 0.5)
+
+    # retention 0 days → everything is past retention
+    seen = []
+    job = ArchiveJob(retention_days=0, batch_size=10, on_progress=seen.append)
+    progress = job.run()
+
+    assert progress["status"] == "done"
+    assert progress["moved"] == progress["total"] == 25
+    assert [p["moved"] for p in seen] == [10, 20, 25]
+    assert _count("claims") == 0
+    assert _count("claims_archive") == 25
@@ -0,0 +1,61 @@
+import random
+
+from kernel.core import memory_db
+from kernel.core.batch_consensus import resolve_consensus_batch
+from kernel.core.consensus import resolve_consensus
+from kernel.core.ledger import add_claims_bulk, resolve_entities, resolve_entity
+from kernel.core.trust import get_all_trust
+
+
+def test_batch_matches_scalar_consensus() -> None:
+    rng = random.Random(23)
+    rows = []
+    claims = {}
+
+    for e in range(300):
+        entity = f"e{e}"
+        # coarse confidences → plenty of exact score ties
+        for _ in range(rng.randint(1, 6)):
+            claim = {
+                "value": rng.choice("abc"),
+                "confidence": rng.choice([0.25, 0.5, 1.0]),
+                "trust": rng.choice([0.5, 1.0]),
+            }
+            claims.setdefault(entity, []).append(claim)
+            rows.append((entity, claim))
+
+    batch = resolve_consensus_batch(
+        [e for e, _ in rows],
+        [c["value"] for _, c in rows],
+        [c["confidence"] for _, c in rows],
+        [c["trust"] for _, c in rows],
+    )
+
+    assert batch == {entity: resolve_consensus(c) for entity, c in claims.items()}
+
+
+def _resolve_in(db_path, claims, resolve):
+    memory_db.configure(db_path)
+    add_claims_bulk(claims)
+    results = resolve()
+    return (
+        {e: {k: v for k, v in r.items() if k != "timestamp"} for e, r in results.items()},
+        get_all_trust(),
+    )
+
+
+def test_resolve_entities_matches_resolve_entity(tmp_db, tmp_path) -> None:
+    rng = random.Random(5)
+    entities = [f"e{i}" for i in range(40)] + ["missing"]
+    claims = [
+        {"agent": f"agent-{rng.randrange(5)}", "entity": rng.choice(entities[:-1]),
+         "value": rng.choice("ab"), "confidence": rng.random()}
+        for _ in range(200)
+    ]
+
+    batch = _resolve_in(tmp_path / "batch.db", claims, lambda: resolve_entities(entities))
+    scalar = _resolve_in(
+        tmp_path / "scalar.db", claims, lambda: {e: resolve_entity(e) for e in entities}
+    )
+
+    assert batch == scalar
@@ -0,0 +1,136 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from kernel.core import ledger
+from kernel.core.archive import archive_batch
+from kernel.core.claim_values import value_hash
+from kernel.core.ledger import add_claim, add_claims_bulk, resolve_entities, resolve_entity
+from kernel.core.memory_db import connection
+from kernel.core.replay import TrustReplay, audit_history
+from kernel.core.trust import get_all_trust
+from kernel.core.trust_cache import TRUST_CACHE
+from kernel.core.value_scores import get_value_scores, rebuild_value_scores
+from kernel.core.writer import stop_writers
+
+
+def _claims() -> list:
+    with connection() as conn:
+        return [tuple(r) for r in conn.execute(
+            "SELECT id, agent, entity, confidence, submissions FROM claims ORDER BY id"
+        )]
+
+
+def test_upsert_keeps_latest_claim_per_agent_and_entity(tmp_db) -> None:
+    first = add_claim("a1", "E", "x", 0.4, upsert=True)
+    assert (first["submissions"], first["replaces"]) == (1, None)
+
+    results = add_claims_bulk(
+        [
+            {"agent": "a1", "entity": "E", "value": "y", "confidence": 0.6},
+            {"agent": "a2", "entity": "E", "value": "y", "confidence": 0.9},
+            {"agent": "a1", "entity": "E", "value": "z", "confidence": 0.8},
+        ],
+        upsert=True,
+    )
+    assert [(r["submissions"], r["replaces"]) for r in results] == [
+        (2, first["id"]), (1, None), (3, results[0]["id"]),
+    ]
+    assert _claims() == [
+        (results[1]["id"], "a2", "E", 0.9, 1),
+        (results[2]["id"], "a1", "E", 0.8, 3),
+    ]
+
+    # append mode is untouched and may sit next to upserted rows
+    appended = add_claim("a1", "E", "z", 0.5)
+    assert "submissions" not in appended and appended["id"] > results[2]["id"]
+    assert len(_claims()) == 3
+
+
+def test_upsert_scores_match_a_rebuild(tmp_db) -> None:
+    rng = random.Random(5)
+    for _ in range(8):
+        add_claims_bulk(
+            [
+                {
+                    "agent": f"a{rng.randrange(4)}",
+                    "entity": f"E{rng.randrange(3)}",
+                    "value": rng.choice("xyz"),
+                    "confidence": rng.random(),
+                }
+                for _ in range(10)
+            ],
+            upsert=rng.random() < 0.7,
+        )
+
+    live = {e: get_value_scores(e) for e in ("E0", "E1", "E2")}
+    rebuild_value_scores()
+    assert {e: get_value_scores(e) for e in ("E0", "E1", "E2")} == live
+
+
+def test_upsert_learns_once_per_submission(tmp_db) -> None:
+    add_claims_bulk(
+        [{"agent": f"a{i}", "entity": "E", "value": "x", "confidence": 0.9} for i in range(3)],
+        upsert=True,
+    )
+    assert resolve_entity("E")["value"] == "x"
+
+    # a1 changes its mind: the replacement is uncredited, the old claim gone
+    add_claim("a1", "E", "y", 0.9, upsert=True)
+    resolve_entities(["E"])
+    TRUST_CACHE.flush()
+    with connection() as conn:
+        events = conn.execute("SELECT agent, reason FROM trust_events ORDER BY id").fetchall()
+    assert [tuple(e) for e in events][3:] == [("a1", "consensus_incorrect")]
+
+
+def test_audit_replay_follows_replacements(tmp_db, monkeypatch) -> None:
+    monkeypatch.setattr(ledger, "CLAIM_UPSERT", True)
+    rng = random.Random(9)
+    for _ in range(6):
+        claims = [
+            {
+                "agent": f"a{rng.randrange(5)}",
+                "entity": f"E{rng.randrange(4)}",
+                "value": rng.choice(["x", "x", "y", "z"]),
+                "confidence": rng.choice([0.3, 0.7, 0.9]),
+            }
+            for _ in range(15)
+        ]
+        add_claims_bulk(claims)
+        resolve_entities(c["entity"] for c in claims)
+
+    TRUST_CACHE.flush()
+    engine = TrustReplay().run(audit_history())
+    assert engine.stats["outcomes_changed"] == 0
+    assert engine.trust == get_all_trust()
+
+
+def test_api_batch_upsert(tmp_db) -> None:
+    client = TestClient(app)
+    body = {"claims": [{"agent": "a", "entity": "E", "value": "x", "confidence": 0.5}] * 2, "upsert": True}
+
+    items = client.post("/claims/batch", json=body, headers={"X-Intent": "WRITE"}).json()["data"]["items"]
+    assert [(i["submissions"], i["replaces"]) for i in items] == [(1, None), (2, items[0]["id"])]
+    assert len(_claims()) == 1
+    stop_writers()
+
+
+def test_upserted_claims_stay_hot_and_count_once(tmp_db) -> None:
+    add_claim("a1", "E", "x", 0.9, upsert=True)
+    add_claim("a2", "E", "x", 0.9)
+    resolve_entity("E")
+
+    # credited and past retention: the appended claim moves, the upserted one stays
+    assert archive_batch(retention_days=-1) == [2]
+
+    add_claim("a1", "E", "y", 0.9, upsert=True)
+    assert [(r[1], r[4]) for r in _claims()] == [("a1", 2)]
+
+    # a1 counts once, with its latest value
+    counts = {h: n for h, _score, n in get_value_scores("E")}
+    assert counts == {value_hash("x"): 1, value_hash("y"): 1}
+    live = get_value_scores("E")
+    rebuild_value_scores()
+    assert get_value_scores("E") == live
@@ -0,0 +1,71 @@
+import sqlite3
+
+from kernel.core import claim_values
+from kernel.core.claim_values import CODEC_ZLIB, get_values, value_hash
+from kernel.core.ledger import add_claim, add_claims_bulk, resolve_entity
+from kernel.core.memory_db import connection
+from kernel.core.migrations import LATEST_VERSION, MIGRATIONS, apply_migrations
+
+
+def _count(table: str) -> int:
+    with connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_each_distinct_value_is_stored_once(tmp_db) -> None:
+    reply = "The primary database listens on port 5432. " * 40
+    add_claim("senior", "DB_PORT", reply, 0.9)
+    add_claims_bulk(
+        {"agent": f"agent-{i}", "entity": f"E{i % 3}", "value": reply, "confidence": 0.5}
+        for i in range(10)
+    )
+    add_claim("junior", "DB_PORT", "3306", 0.2)
+
+    assert _count("claims") == 12
+    assert _count("claim_values") == 2
+
+    with connection() as conn:
+        codec, size = conn.execute(
+            "SELECT codec, size FROM claim_values WHERE value_hash = ?",
+            (value_hash(reply),),
+        ).fetchone()
+    assert codec == CODEC_ZLIB and size == len(reply)
+
+    assert get_values([value_hash(reply)]) == {value_hash(reply): reply}
+    assert resolve_entity("DB_PORT")["value"] == reply
+
+
+def test_small_values_are_stored_raw(tmp_db, monkeypatch) -> None:
+    monkeypatch.setattr(claim_values, "COMPRESS_MIN_BYTES", 1 << 20)
+    add_claim("senior", "DB_HOST", "db.local " * 100, 0.9)
+
+    with connection() as conn:
+        assert conn.execute("SELECT codec FROM claim_values").fetchone()[0] == claim_values.CODEC_RAW
+    assert resolve_entity("DB_HOST")["value"] == "db.local " * 100
+
+
+def test_upgrade_moves_text_values_into_the_store(tmp_path) -> None:
+    conn = sqlite3.connect(tmp_path / "v8.db")
+    for version, _description, migrate in MIGRATIONS:
+        if version < 9:
+            migrate(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {version}")
+    conn.executemany(
+        "INSERT INTO claims (agent, entity, value, confidence, trust, timestamp) VALUES (?, 'E', ?, 0.9, 0.5, 0)",
+        [("a", "x"), ("b", "x"), ("c", "y")],
+    )
+    conn.execute(
+        "INSERT INTO entity_value_scores VALUES ('E', 'x', 0.9, 2, 1, 2), ('E', 'y', 0.45, 1, 3, 3)"
+    )
+    conn.commit()
+
+    assert apply_migrations(conn) == LATEST_VERSION
+
+    assert conn.execute("SELECT COUNT(*) FROM claim_values").fetchone()[0] == 2
+    assert [r[0] for r in conn.execute("SELECT value_hash FROM claims ORDER BY id")] == [
+        value_hash("x"), value_hash("x"), value_hash("y"),
+    ]
+    assert conn.execute(
+        "SELECT count FROM entity_value_scores WHERE value_hash = ?", (value_hash("x"),)
+    ).fetchone()[0] == 2
+    conn.close()
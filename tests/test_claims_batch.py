@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+from api.main import app
+from kernel.core.ledger import add_claims_bulk
+from kernel.core.memory_db import connection, db_set_trust
+
+
+client = TestClient(app)
+
+
+def test_add_claims_bulk_snapshots_trust_and_reports_errors(tmp_db) -> None:
+    db_set_trust("senior", 0.9)
+
+    results = add_claims_bulk([
+        {"agent": "senior", "entity": "DB_PORT", "value": "5432", "confidence": 1.0},
+        {"agent": "junior", "entity": "DB_PORT", "value": "3306"},
+        {"agent": "junior", "entity": "DB_PORT", "value": "3306", "confidence": 0.4},
+    ])
+
+    assert results[0]["trust"] == 0.9
+    assert results[1] == {"error": "'confidence' must be a number"}
+    assert results[2]["trust"] == 0.1
+    assert results[2]["id"] == results[0]["id"] + 1
+
+    with connection() as conn:
+        rows = conn.execute("SELECT id, agent, trust FROM claims ORDER BY id").fetchall()
+    assert [tuple(r) for r in rows] == [
+        (results[0]["id"], "senior", 0.9),
+        (results[2]["id"], "junior", 0.1),
+    ]
+
+
+def test_claims_batch_endpoint_returns_per_item_ids(tmp_db) -> None:
+    response = client.post(
+        "/claims/batch",
+        json={"claims": [
+            {"agent": "senior", "entity": "DB_PORT", "value": "5432", "confidence": 1.0},
+            {"agent": "", "entity": "DB_PORT", "value": "5432", "confidence": 1.0},
+        ]},
+        headers={"X-Intent": "WRITE"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["inserted"] == 1 and data["failed"] == 1
+    assert "id" in data["items"][0]
+    assert data["items"][1] == {"index": 1, "error": "'agent' must be a non-empty string"}
@@ -0,0 +1,158 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from kernel.core import event_rollups
+from kernel.core.error_review import apply_error_penalties, record_error_review
+from kernel.core.event_rollups import get_rollups, prune_events, rebuild_rollups, retention_cutoff
+from kernel.core.memory_db import connection
+from kernel.core.trust import apply_trust_deltas, penalize_agent, reward_agent
+from kernel.core.trust_timeline import get_trust_grid, get_trust_timeline, rebuild_trust_checkpoints
+
+DAY = 86_400.0
+
+
+def _raw_rollup(source: str, grain: str) -> list:
+    key, value, p = event_rollups.SOURCES[source]
+    seconds = event_rollups.GRAINS[grain]
+    with connection() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT CAST(timestamp / ? AS INTEGER) * ? AS period_start, agent, {key},
+                   COUNT(*) AS events, ROUND(SUM({value}), 6) AS {p}_sum,
+                   MIN({value}) AS {p}_min, MAX({value}) AS {p}_max
+            FROM {source} GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+            """,
+            (seconds, seconds),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _rollups(source: str, grain: str, **kwargs) -> list:
+    p = event_rollups.SOURCES[source][2]
+    rows = get_rollups(source, grain, **kwargs)
+    for r in rows:
+        r[f"{p}_sum"] = round(r[f"{p}_sum"], 6)
+    return rows
+
+
+def _seed_days(days: int = 60, per_day: int = 200) -> None:
+    """
+    Trust events of two agents spread over the last `days` days, written
+    straight to trust_events (rollups and checkpoints rebuilt).
+    """
+    rng = random.Random(9)
+    end = retention_cutoff(0)
+    trust = {"senior": 0.5, "junior": 0.5}
+    rows = []
+    for ts in sorted(rng.uniform(end - days * DAY, end) for _ in range(days * per_day)):
+        agent = rng.choice(list(trust))
+        change = rng.choice([0.01, -0.01])
+        trust[agent] = round(min(max(trust[agent] + change, 0.05), 1.0), 4)
+        rows.append((agent, change, rng.choice(["consensus_correct", "route"]), 1.0, ts, trust[agent]))
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO trust_events (agent, change, reason, confidence, timestamp, trust_after) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+    rebuild_trust_checkpoints()
+    rebuild_rollups()
+
+
+def test_rollups_follow_every_event_write(tmp_db) -> None:
+    reward_agent("senior", 0.8)
+    penalize_agent("senior", 0.4, reason="route_low_confidence")
+    apply_trust_deltas(
+        [{"agent": "senior", "correct": i % 3 != 0, "confidence": 0.5} for i in range(10)]
+        + [{"agent": "junior", "correct": False}]
+    )
+    for reviewer in ("r1", "r2"):
+        record_error_review(reviewer, "junior", "DB_PORT", "3306", "5432", "WRONG_VALUE", 0.9)
+    apply_error_penalties("DB_PORT")
+
+    for source in event_rollups.SOURCES:
+        for grain in event_rollups.GRAINS:
+            live = _rollups(source, grain)
+            assert live and live == _raw_rollup(source, grain)
+
+    senior = _rollups("trust_events", "hourly", agent="senior")
+    assert sum(r["events"] for r in senior) == 12
+    assert {r["reason"] for r in senior} == {
+        "reward", "route_low_confidence", "consensus_correct", "consensus_incorrect",
+    }
+
+    live = get_rollups("error_penalty_events", "daily")
+    rebuild_rollups()
+    assert get_rollups("error_penalty_events", "daily") == live
+
+    with pytest.raises(ValueError):
+        get_rollups("trust_events", "weekly")
+
+
+def test_prune_keeps_rollups_checkpoints_and_timeline(tmp_db) -> None:
+    _seed_days()
+    daily = get_rollups("trust_events", "daily")
+    with connection() as conn:
+        checkpoints = conn.execute("SELECT * FROM trust_checkpoints ORDER BY agent, period_start").fetchall()
+        total = conn.execute("SELECT COUNT(*) FROM trust_events").fetchone()[0]
+    end = retention_cutoff(0)
+    grid = get_trust_grid(["senior", "junior"], DAY, end - 60 * DAY, end - 1)
+    unaligned = get_trust_grid(["senior"], DAY / 3 + 7, end - 60 * DAY, end - 1)
+    timeline = get_trust_timeline("senior", max_points=100)
+
+    deleted = prune_events(30, batch_size=500)
+    cutoff = retention_cutoff(30)
+
+    with connection() as conn:
+        oldest, left = conn.execute("SELECT MIN(timestamp), COUNT(*) FROM trust_events").fetchone()
+        assert oldest >= cutoff
+        assert deleted["trust_events"] == total - left > 0
+
+        # rebuilds keep the periods whose raw events are gone
+        rebuild_trust_checkpoints()
+        rebuild_rollups()
+        assert conn.execute("SELECT * FROM trust_checkpoints ORDER BY agent, period_start").fetchall() == checkpoints
+    assert get_rollups("trust_events", "daily") == daily
+
+    # whole periods read checkpoints: unchanged; unaligned buckets: unchanged after the cutoff
+    assert get_trust_grid(["senior", "junior"], DAY, end - 60 * DAY, end - 1) == grid
+    after = get_trust_grid(["senior"], DAY / 3 + 7, end - 60 * DAY, end - 1)
+    kept = [i for i, ts in enumerate(unaligned["timestamps"]) if ts >= cutoff]
+    assert [after["series"]["senior"][i] for i in kept] == [unaligned["series"]["senior"][i] for i in kept]
+    assert None not in after["series"]["senior"][1:]
+
+    # the default range still starts with the pruned history
+    pruned = get_trust_timeline("senior", max_points=100)
+    assert pruned[0]["timestamp"] < cutoff and pruned[-1] == timeline[-1]
+
+    assert not any(prune_events(30, batch_size=500).values())
+    assert prune_events(0) == {}
+
+    # hourly rollups: their own window, daily rollups stay
+    hourly = get_rollups("trust_events", "hourly")
+    deleted = prune_events(30, hourly_retention_days=45)
+    kept = [r for r in hourly if r["period_start"] >= retention_cutoff(45)]
+    assert deleted["trust_events_hourly"] == len(hourly) - len(kept) > 0
+    assert get_rollups("trust_events", "hourly") == kept
+    assert get_rollups("trust_events", "daily") == daily
+
+
+def test_api_rollups(tmp_db) -> None:
+    _seed_days(3, 50)
+    client = TestClient(app)
+    read = {"X-Intent": "READ"}
+
+    data = client.get("/trust/rollups", params={"grain": "hourly", "agent": "junior"}, headers=read).json()["data"]
+    assert data == get_rollups("trust_events", "hourly", agent="junior")
+    assert {r["agent"] for r in data} == {"junior"}
+
+    start = data[5]["period_start"]
+    data = client.get("/trust/rollups", params={"from": start}, headers=read).json()["data"]
+    assert data and all(r["period_start"] >= start for r in data)
+
+    assert client.get("/audit/penalty-rollups", headers=read).json()["data"] == []
+    assert client.get("/trust/rollups", params={"grain": "weekly"}, headers=read).status_code == 400
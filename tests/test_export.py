@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from kernel.core import memory_db
+from kernel.core.export import iter_claims, iter_resolutions, iter_trust_events
+from kernel.core.ledger import add_claims_bulk, resolve_entities
+from kernel.core.trust import penalize_agent, reward_agent
+from kernel.core.writer import stop_writers
+
+
+def _seed(n: int = 30) -> None:
+    add_claims_bulk(
+        {"agent": f"agent-{i % 3}", "entity": f"{ns}:e{i % 5}", "value": f"v{i % 2}", "confidence": 0.8}
+        for i in range(n)
+        for ns in ("alpha", "beta")
+    )
+
+
+def _resume_all(make, page_size: int, stop_every: int, **kwargs) -> list:
+    """
+    Read an export, restarting from the last cursor every stop_every records.
+    """
+    records, cursor = [], None
+    while True:
+        batch = []
+        for record in make(cursor=cursor, page_size=page_size, **kwargs):
+            batch.append(record)
+            if len(batch) == stop_every:
+                break
+        records.extend(batch)
+        if len(batch) < stop_every:
+            return records
+        cursor = batch[-1]["cursor"]
+
+
+def test_claim_export_pages_and_resumes(tmp_db) -> None:
+    _seed()
+
+    full = list(iter_claims(page_size=7))
+    assert len(full) == 60
+    assert [(r["entity"], r["id"]) for r in full] == sorted((r["entity"], r["id"]) for r in full)
+    assert {r["value"] for r in full} == {"v0", "v1"}
+
+    resumed = _resume_all(iter_claims, page_size=4, stop_every=11)
+    assert [r["id"] for r in resumed] == [r["id"] for r in full]
+
+    beta = list(iter_claims(prefix="beta:", page_size=3))
+    assert len(beta) == 30 and all(r["entity"].startswith("beta:") for r in beta)
+
+
+def test_resolution_and_trust_event_exports(tmp_db) -> None:
+    _seed(10)
+    resolve_entities([f"alpha:e{i}" for i in range(5)])
+    add_claims_bulk([{"agent": "agent-9", "entity": "alpha:e0", "value": "v0", "confidence": 0.9}])
+    resolve_entities(["alpha:e0", "beta:e1"])
+
+    resolutions = list(iter_resolutions(prefix="alpha:", page_size=2))
+    assert len(resolutions) == 6
+    assert [r["entity"] for r in resolutions] == sorted(r["entity"] for r in resolutions)
+    assert _resume_all(iter_resolutions, page_size=2, stop_every=3) == list(iter_resolutions())
+
+    reward_agent("agent-0", 0.9)
+    penalize_agent("agent-1", 0.5)
+    events = list(iter_trust_events(agent="agent-0", page_size=1))
+    assert events and {e["agent"] for e in events} == {"agent-0"}
+    assert [(e["timestamp"], e["id"]) for e in events] == sorted((e["timestamp"], e["id"]) for e in events)
+    assert _resume_all(iter_trust_events, page_size=2, stop_every=5) == list(iter_trust_events())
+
+
+def test_export_rejects_foreign_cursors(tmp_db) -> None:
+    _seed(2)
+    reward_agent("agent-0", 0.9)
+    trust_cursor = next(iter_trust_events())["cursor"]
+
+    for bad in ("not-a-cursor", trust_cursor):
+        with pytest.raises(ValueError):
+            iter_claims(cursor=bad)
+
+
+def test_sharded_export_covers_every_shard(tmp_db, monkeypatch) -> None:
+    memory_db.close_connections()
+    monkeypatch.setattr(memory_db, "SHARD_COUNT", 3)
+    memory_db.init_db()
+    _seed()
+
+    full = list(iter_claims(page_size=5))
+    assert len(full) == 60 and len({r["id"] for r in full}) < 60  # ids are per shard
+    resumed = _resume_all(iter_claims, page_size=5, stop_every=7)
+    assert [r["cursor"] for r in resumed] == [r["cursor"] for r in full]
+
+    stop_writers()
+    memory_db.close_connections()
+
+
+def test_api_streams_ndjson(tmp_db) -> None:
+    _seed(10)
+    client = TestClient(app)
+    read = {"X-Intent": "READ"}
+
+    response = client.get("/export/claims", params={"prefix": "alpha:"}, headers=read)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 10
+
+    rest = client.get("/export/claims", params={"prefix": "alpha:", "cursor": lines[3]["cursor"]}, headers=read)
+    assert [json.loads(line)["id"] for line in rest.text.splitlines()] == [r["id"] for r in lines[4:]]
+
+    assert client.get("/export/claims", params={"cursor": "junk"}, headers=read).status_code == 400
+
+    entities = ["beta:e2", "alpha:e0", "beta:e2", "nobody"]
+    streamed = client.post("/resolve/stream", json={"entities": entities}, headers=read)
+    results = [json.loads(line) for line in streamed.text.splitlines()]
+    assert [(r["index"], r["entity"]) for r in results] == [(0, "beta:e2"), (1, "alpha:e0"), (2, "nobody")]
+    stop_writers()
@@ -1,7 +1,14 @@
 from fastapi.testclient import TestClient
 
 from api.main import app
+from kernel.core.dirty_entities import dirty_stats, get_clean_resolution
+from kernel.core.ledger import add_claim, resolve_entities, resolve_entity
 from kernel.core.memory_db import get_connection
+from kernel.core.replay import TrustReplay, audit_history
+from kernel.core.route_summary import route_entity
+from kernel.core.sweeper import ResolutionSweeper
+from kernel.core.trust import get_all_trust
+from kernel.core.trust_cache import TRUST_CACHE
 
 
 client = TestClient(app)
@@ -23,6 +30,7 @@ def test_kernel_route_creates_trust_event_and_error_review_for_low_confidence()
     response = client.post(
         "/kernel/route",
         json={"adapter_id": "mock-agent", "content": "route me"},
+        headers={"X-Intent": "WRITE"},
     )
 
     assert response.status_code == 200
@@ -35,3 +43,56 @@ def test_kernel_route_creates_trust_event_and_error_review_for_low_confidence()
 
     assert after_trust_events > before_trust_events
     assert after_error_reviews > before_error_reviews
+
+
+def test_kernel_route_keys_claims_per_conversation_and_rolls_up_per_adapter() -> None:
+    def route(**extra):
+        response = client.post(
+            "/kernel/route",
+            json={"adapter_id": "mock-agent", "content": "hi", **extra},
+            headers={"X-Intent": "WRITE"},
+        )
+        assert response.status_code == 200
+        return response.json()["data"]["entity"]
+
+    def summary():
+        response = client.get(
+            "/kernel/route/summary",
+            params={"adapter": "mock-agent"},
+            headers={"X-Intent": "READ"},
+        )
+        return response.json()["data"][0]
+
+    routes_before = summary()["routes"] if _count_rows("adapter_route_summary") else 0
+
+    first = route(conversation_id="c-1")
+    assert route(conversation_id="c-1") == first == "adapter_response:conversation:c-1"
+    assert route() != route()
+
+    rollup = summary()
+    assert rollup["routes"] == routes_before + 4
+    assert rollup["avg_confidence"] == 0.42
+
+
+def test_per_request_route_entities_are_not_swept_or_credited(tmp_db) -> None:
+    request, other = route_entity(), route_entity()
+    conversation = route_entity("c-1")
+    for entity in (request, other, conversation):
+        add_claim("mock-agent", entity, "hi", 0.9)
+
+    # only the conversation waits for the sweeper
+    assert dirty_stats()["dirty"] == 1
+    ResolutionSweeper().sweep()
+    assert get_clean_resolution(request) is None
+
+    # resolving one explicitly still answers, without a consensus reward
+    assert resolve_entities([request])[request]["value"] == "hi"
+    assert resolve_entity(other)["value"] == "hi"
+    TRUST_CACHE.flush()
+    assert _count_rows("learning_watermarks") == 1
+    assert [tuple(r) for r in get_connection().execute("SELECT agent, reason FROM trust_events")] == [
+        ("mock-agent", "consensus_correct"),
+    ]
+
+    engine = TrustReplay().run(audit_history())
+    assert engine.trust == get_all_trust()
@@ -0,0 +1,81 @@
+import time
+
+from kernel.core.archive import archive_batch
+from kernel.core.ledger import add_claim, resolve_entity
+from kernel.core.memory_db import connection, transaction
+from kernel.core.migrations import _v7_learning_watermarks
+from kernel.core.resolution_cache import RESOLUTION_CACHE
+from kernel.core.trust import get_trust
+
+
+def _trust_events() -> int:
+    with connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM trust_events").fetchone()[0]
+
+
+def test_each_claim_is_credited_once(tmp_db) -> None:
+    add_claim("senior", "DB_PORT", "5432", 0.9)
+    add_claim("mid", "DB_PORT", "5432", 0.8)
+    resolve_entity("DB_PORT")
+    assert _trust_events() == 2
+
+    # not a memo hit (cache dropped), still nothing left to credit
+    RESOLUTION_CACHE.clear()
+    resolve_entity("DB_PORT")
+    assert _trust_events() == 2
+
+    add_claim("junior", "DB_PORT", "3306", 0.1)
+    resolve_entity("DB_PORT")
+    assert _trust_events() == 3
+
+
+def test_contested_resolutions_defer_credit(tmp_db) -> None:
+    add_claim("a", "E", "x", 0.9)
+    add_claim("b", "E", "y", 0.9)
+    assert resolve_entity("E")["status"] == "contested"
+    assert _trust_events() == 0
+
+    add_claim("c", "E", "x", 0.9)
+    assert resolve_entity("E")["status"] == "resolved"
+    assert _trust_events() == 3
+
+
+def test_migration_credits_claims_before_last_resolved(tmp_db) -> None:
+    add_claim("a", "E", "x", 0.9)
+    add_claim("b", "E", "x", 0.9)
+
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO resolutions (entity, value, status, reason, timestamp) "
+            "VALUES ('E', 'x', 'resolved', 'legacy', ?)",
+            (time.time(),),
+        )
+        conn.execute("DELETE FROM learning_watermarks")
+        _v7_learning_watermarks(conn.cursor())
+
+    add_claim("c", "E", "x", 0.9)
+    resolve_entity("E")
+    assert _trust_events() == 1
+
+
+def test_archived_claims_are_still_credited(tmp_db) -> None:
+    add_claim("a", "E", "x", 0.5)
+    add_claim("b", "E", "y", 0.5)
+    assert resolve_entity("E")["status"] == "contested"
+
+    # contested credits nothing: the claims stay hot
+    assert archive_batch(retention_days=365) == []
+
+    # past retention: archived uncredited, still credited by the next outcome
+    assert archive_batch(retention_days=-1) == [1, 2]
+    add_claim("c", "E", "x", 0.9)
+    add_claim("d", "E", "x", 0.9)
+    assert resolve_entity("E")["status"] == "resolved"
+    assert _trust_events() == 4
+    assert get_trust("a") > get_trust("b")
+
+    # credited: eligible right away, and never credited twice
+    assert archive_batch(retention_days=365) == [3, 4]
+    RESOLUTION_CACHE.clear()
+    resolve_entity("E")
+    assert _trust_events() == 4
@@ -0,0 +1,44 @@
+import threading
+
+import pytest
+
+from kernel.core.memory_db import connection, transaction
+from kernel.core.trust import get_trust, reward_agent
+
+
+def test_pooled_connection_is_reused_and_tuned(tmp_db) -> None:
+    with connection() as first:
+        pass
+    with connection() as second:
+        assert second is first
+        assert second.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # synchronous=NORMAL
+        assert second.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_each_thread_gets_its_own_connection(tmp_db) -> None:
+    seen = []
+
+    def worker() -> None:
+        with connection() as conn:
+            seen.append(conn)
+
+    with connection() as main_conn:
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+
+    assert seen and seen[0] is not main_conn
+
+
+def test_transaction_rolls_back_on_error(tmp_db) -> None:
+    with pytest.raises(RuntimeError):
+        with transaction():
+            reward_agent("alice", 1.0)
+            raise RuntimeError("boom")
+
+    assert get_trust("alice") == 0.1
+
+    with connection() as conn:
+        events = conn.execute("SELECT COUNT(*) FROM trust_events").fetchone()[0]
+    assert events == 0
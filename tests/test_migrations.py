@@ -0,0 +1,166 @@
+import sqlite3
+
+import pytest
+
+from kernel.core.memory_db import connection
+from kernel.core.migrations import LATEST_VERSION, apply_migrations, get_schema_version
+
+
+# (query, params) pairs run on every request by the ledger / API
+HOT_QUERIES = {
+    "resolve_entity claims": (
+        "SELECT agent, value_hash, confidence, trust FROM claims WHERE entity = ?",
+        ("DB_PORT",),
+    ),
+    "trust timeline events": (
+        "SELECT timestamp, trust_after FROM trust_events "
+        "WHERE agent = ? AND timestamp >= ? AND timestamp <= ? AND trust_after IS NOT NULL "
+        "ORDER BY timestamp, id",
+        ("senior", 0.0, 1e10),
+    ),
+    "trust timeline checkpoints": (
+        "SELECT min_at, trust_min, max_at, trust_max FROM trust_checkpoints "
+        "WHERE agent = ? AND period_start >= ? AND period_start < ? ORDER BY period_start",
+        ("senior", 0.0, 1e10),
+    ),
+    "trust grid events": (
+        "SELECT agent, timestamp, trust_after FROM trust_events "
+        "WHERE agent IN (?, ?) AND timestamp >= ? AND timestamp < ? AND trust_after IS NOT NULL "
+        "ORDER BY agent, timestamp, id",
+        ("senior", "junior", 0.0, 1e10),
+    ),
+    "trust grid checkpoints": (
+        "SELECT agent, last_at, trust_last FROM trust_checkpoints "
+        "WHERE agent IN (?, ?) AND period_start >= ? AND period_start < ? ORDER BY agent, period_start",
+        ("senior", "junior", 0.0, 1e10),
+    ),
+    "trust rollups dashboard": (
+        "SELECT period_start, agent, reason, events, change_sum FROM trust_events_daily "
+        "WHERE period_start >= ? AND period_start <= ? ORDER BY period_start, agent, reason",
+        (0.0, 1e10),
+    ),
+    "event retention batch": (
+        "SELECT id FROM error_penalty_events WHERE timestamp < ? ORDER BY timestamp LIMIT ?",
+        (1e10, 5000),
+    ),
+    "trust leaderboard page": (
+        "SELECT agent, trust, last_updated FROM trust WHERE trust >= ? AND (trust, agent) < (?, ?) "
+        "ORDER BY trust DESC, agent DESC LIMIT ?",
+        (0.1, 0.5, "senior", 51),
+    ),
+    "trust events page": (
+        "SELECT agent, change, reason, timestamp FROM trust_events "
+        "ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+        (50, 0),
+    ),
+    "error reviews page": (
+        "SELECT * FROM error_reviews ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+        (50, 0),
+    ),
+    "error penalty aggregation": (
+        "SELECT target_agent, error_type, COUNT(*), AVG(confidence) "
+        "FROM error_reviews WHERE entity = ? GROUP BY target_agent, error_type",
+        ("DB_PORT",),
+    ),
+    "dirty sweep batch": (
+        "SELECT entity FROM dirty_entities ORDER BY dirtied_at LIMIT ?",
+        (1000,),
+    ),
+    "latest resolution": (
+        "SELECT * FROM resolutions WHERE entity = ? ORDER BY timestamp DESC LIMIT 1",
+        ("DB_PORT",),
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(tmp_db, name) -> None:
+    sql, params = HOT_QUERIES[name]
+
+    with connection() as conn:
+        plan = [row["detail"] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+    # WITHOUT ROWID tables are searched through their primary key
+    assert any("INDEX" in step or "PRIMARY KEY" in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_migrations_are_idempotent(tmp_db) -> None:
+    with connection() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+        assert apply_migrations(conn) == LATEST_VERSION
+
+
+def test_upgrades_legacy_database(tmp_path) -> None:
+    # v0.11 layout: no last_updated column, no indexes, user_version = 0
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    conn.execute("CREATE TABLE trust (agent TEXT PRIMARY KEY, trust REAL NOT NULL)")
+    conn.execute("INSERT INTO trust VALUES ('senior', 0.9)")
+    conn.commit()
+
+    assert apply_migrations(conn) == LATEST_VERSION
+
+    row = conn.execute("SELECT trust, last_updated FROM trust").fetchone()
+    assert row[0] == 0.9
+    assert row[1] is not None
+    conn.close()
+
+
+def test_backfills_trust_after_and_checkpoints(tmp_path) -> None:
+    # v0.11 layout: trust events without trust_after
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    conn.execute("CREATE TABLE trust (agent TEXT PRIMARY KEY, trust REAL NOT NULL)")
+    conn.execute(
+        "CREATE TABLE trust_events (id INTEGER PRIMARY KEY AUTOINCREMENT, agent TEXT NOT NULL, "
+        "change REAL NOT NULL, reason TEXT NOT NULL, confidence REAL, timestamp REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO trust VALUES ('senior', 0.2)")
+    conn.executemany(
+        "INSERT INTO trust_events (agent, change, reason, confidence, timestamp) VALUES (?, ?, 'r', 1.0, ?)",
+        [("senior", 0.05, 10.0), ("senior", 0.05, 20.0), ("senior", -0.05, 20.0), ("senior", 0.05, 7200.0)],
+    )
+    conn.commit()
+
+    assert apply_migrations(conn) == LATEST_VERSION
+
+    after = [r[0] for r in conn.execute("SELECT trust_after FROM trust_events ORDER BY id")]
+    assert after == [0.15, 0.2, 0.15, 0.2]
+    checkpoints = conn.execute(
+        "SELECT period_start, events, trust_min, trust_max, trust_last FROM trust_checkpoints ORDER BY period_start"
+    ).fetchall()
+    assert checkpoints == [(0.0, 3, 0.15, 0.2, 0.15), (7200.0, 1, 0.2, 0.2, 0.2)]
+    conn.close()
+
+
+def test_backfills_event_rollups(tmp_path) -> None:
+    # a v11 database: everything but what v12 adds
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    apply_migrations(conn)
+    conn.execute("PRAGMA user_version = 11")
+    for table in ("trust_events", "error_penalty_events"):
+        conn.execute(f"DROP TABLE IF EXISTS {table}_hourly")
+        conn.execute(f"DROP TABLE IF EXISTS {table}_daily")
+    conn.execute("DROP TABLE event_retention")
+    conn.executemany(
+        "INSERT INTO trust_events (agent, change, reason, confidence, timestamp, trust_after) "
+        "VALUES ('senior', ?, ?, 1.0, ?, 0.5)",
+        [(0.05, "reward", 10.0), (-0.05, "penalty", 20.0), (0.02, "reward", 4000.0)],
+    )
+    conn.execute(
+        "INSERT INTO error_penalty_events (agent, entity, error_type, weight, confidence, "
+        "final_penalty_strength, reason, timestamp) VALUES ('junior', 'E', 'WRONG_VALUE', 1.0, 0.9, 0.9, 'r', 5.0)"
+    )
+    conn.commit()
+
+    assert apply_migrations(conn) == LATEST_VERSION
+
+    hourly = conn.execute(
+        "SELECT period_start, reason, events, change_sum FROM trust_events_hourly ORDER BY period_start, reason"
+    ).fetchall()
+    assert hourly == [(0.0, "penalty", 1, -0.05), (0.0, "reward", 1, 0.05), (3600.0, "reward", 1, 0.02)]
+    daily = conn.execute("SELECT reason, events, change_max FROM trust_events_daily ORDER BY reason").fetchall()
+    assert daily == [("penalty", 1, -0.05), ("reward", 2, 0.05)]
+    assert conn.execute("SELECT agent, error_type, events FROM error_penalty_events_daily").fetchall() == [
+        ("junior", "WRONG_VALUE", 1)
+    ]
+    conn.close()
@@ -0,0 +1,144 @@
+import random
+
+import pytest
+
+from kernel.core import audit
+from kernel.core.claim_values import get_values
+from kernel.core.ledger import add_claim, add_claims_bulk, resolve_entities, resolve_entity
+from kernel.core.memory_db import connection
+from kernel.core.replay import (
+    TrustReplay,
+    audit_history,
+    claims_history,
+    rebuild,
+    replay,
+    trust_adjustments,
+    with_adjustments,
+)
+from kernel.core.trust import get_all_trust, penalize_agent, reward_agent
+from kernel.core.trust_cache import TRUST_CACHE
+
+CHUNK = 40
+
+
+def _live_history(rounds: int = 6, seed: int = 3, tail: bool = True) -> None:
+    """
+    Bulk chunks of CHUNK claims, each followed by one batch resolve of the
+    touched entities (first touch first), plus single-claim / single-resolve calls.
+    """
+    rng = random.Random(seed)
+    for _ in range(rounds):
+        claims = [
+            {
+                "agent": f"agent-{rng.randrange(6)}",
+                "entity": f"E{rng.randrange(12)}",
+                "value": rng.choice(["a", "a", "b", "c"]),
+                "confidence": rng.choice([0.3, 0.7, 0.9, 1.4]),
+            }
+            for _ in range(CHUNK)
+        ]
+        add_claims_bulk(claims)
+        resolve_entities(c["entity"] for c in claims)
+
+    if tail:
+        add_claim("agent-0", "E0", "b", 0.8)
+        resolve_entity("E0")
+
+
+def _state() -> tuple:
+    TRUST_CACHE.flush()
+    with connection() as conn:
+        events = [tuple(r) for r in conn.execute(
+            "SELECT agent, change, reason, confidence FROM trust_events ORDER BY id"
+        )]
+        resolutions = [tuple(r) for r in conn.execute(
+            "SELECT entity, value, status, reason FROM resolutions ORDER BY id"
+        )]
+        watermarks = dict(conn.execute("SELECT entity, last_credited_claim_id FROM learning_watermarks").fetchall())
+    return get_all_trust(), events, resolutions, watermarks
+
+
+def _engine_state(engine: TrustReplay) -> tuple:
+    # claims replays carry value digests
+    texts = get_values(r[1] for r in engine.resolutions if isinstance(r[1], bytes))
+    return (
+        engine.trust,
+        [e[:4] for e in engine.trust_events],
+        [(r[0], texts.get(r[1], r[1]), *r[2:4]) for r in engine.resolutions],
+        engine.watermarks,
+    )
+
+
+@pytest.mark.parametrize("recorded_trust", [True, False])
+def test_audit_replay_matches_live_path(tmp_db, recorded_trust) -> None:
+    _live_history()
+    trust, events, resolutions, watermarks = _state()
+
+    engine = TrustReplay(recorded_trust=recorded_trust).run(audit_history())
+
+    assert _engine_state(engine) == (trust, events, resolutions, watermarks)
+    assert engine.stats["outcomes_changed"] == 0
+
+
+def test_claims_replay_follows_the_resolve_schedule(tmp_db) -> None:
+    _live_history(tail=False)
+
+    engine = TrustReplay().run(claims_history(resolve_every=CHUNK, page_size=7))
+    assert _engine_state(engine) == _state()
+
+    # default schedule: every entity once, after all claims
+    once = TrustReplay().run(claims_history())
+    assert len(once.resolutions) == 12 and once.stats["claims"] == 6 * CHUNK
+
+
+def test_rebuild_restores_trust_and_resolutions(tmp_db) -> None:
+    _live_history()
+    live = _state()
+
+    with connection() as conn:
+        conn.execute("DELETE FROM trust_events")
+        conn.execute("UPDATE trust SET trust = 0.9")
+        conn.execute("DELETE FROM resolutions")
+        conn.execute("DELETE FROM learning_watermarks")
+        conn.commit()
+
+    stats = rebuild(audit_history(audit.AUDIT_LOG_FILE))
+
+    assert stats["trust_events"] == len(live[1])
+    assert _state() == live
+
+
+def test_what_if_parameters_change_outcomes(tmp_db) -> None:
+    _live_history()
+
+    baseline = replay(audit_history(), recorded_trust=False)
+    harsh = replay(audit_history(), recorded_trust=False, base_penalty=0.2, trust_floor=0.0)
+
+    assert baseline.stats["outcomes_changed"] == 0
+    assert harsh.stats["outcomes_changed"] > 0
+    assert min(harsh.trust.values()) < min(baseline.trust.values())
+
+    with pytest.raises(ValueError):
+        rebuild(audit_history(), TrustReplay(recorded_trust=False))
+
+
+def test_rebuild_keeps_trust_changes_outside_consensus(tmp_db) -> None:
+    rng = random.Random(4)
+    for _ in range(4):
+        _live_history(rounds=1, seed=rng.randrange(100), tail=False)
+        reward_agent(f"agent-{rng.randrange(6)}", 0.8, reason="adapter_route_claim")
+        penalize_agent(f"agent-{rng.randrange(6)}", 0.6)  # error review penalty
+    reward_agent("route-only", 0.5, reason="adapter_route_claim")
+    live = _state()
+
+    engine = TrustReplay().run(with_adjustments(audit_history(), trust_adjustments()))
+    assert _engine_state(engine) == live
+    assert engine.stats["adjustments"] == 9
+
+    stats = rebuild(audit_history(audit.AUDIT_LOG_FILE))
+    assert stats["adjustments"] == 9
+    assert _state() == live
+
+    # and again: the rebuilt trust_events still hold them
+    rebuild(audit_history(audit.AUDIT_LOG_FILE))
+    assert _state() == live
@@ -0,0 +1,82 @@
+from kernel.core.governance import clear_override, set_override
+from kernel.core.ledger import add_claim, resolve_entity
+from kernel.core.memory_db import connection
+from kernel.core.resolution_cache import ResolutionCache, RESOLUTION_CACHE
+from kernel.core.trust import get_trust
+
+
+def _resolution_rows(entity: str) -> int:
+    with connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM resolutions WHERE entity = ?", (entity,)
+        ).fetchone()[0]
+
+
+def test_repeated_resolve_is_served_from_cache_without_writes(tmp_db) -> None:
+    add_claim("senior", "DB_PORT", "5432", 1.0)
+
+    first = resolve_entity("DB_PORT")
+    trust_after_first = get_trust("senior")
+    hits = RESOLUTION_CACHE.stats()["hits"]
+
+    assert resolve_entity("DB_PORT") == first
+    assert RESOLUTION_CACHE.stats()["hits"] == hits + 1
+    assert _resolution_rows("DB_PORT") == 1
+    assert get_trust("senior") == trust_after_first
+
+    # a new claim moves the high-water mark → recomputed
+    add_claim("junior", "DB_PORT", "3306", 1.0)
+    resolve_entity("DB_PORT")
+    assert _resolution_rows("DB_PORT") == 2
+
+
+def test_override_changes_invalidate(tmp_db) -> None:
+    add_claim("senior", "DB_HOST", "db.local", 1.0)
+    assert resolve_entity("DB_HOST")["status"] == "resolved"
+
+    set_override("DB_HOST", "db.prod", reason="pinned")
+    try:
+        assert resolve_entity("DB_HOST")["status"] == "human_override"
+    finally:
+        clear_override("DB_HOST")
+
+    assert resolve_entity("DB_HOST")["status"] == "resolved"
+    assert _resolution_rows("DB_HOST") == 3
+
+
+def test_lru_eviction() -> None:
+    cache = ResolutionCache(max_entries=2)
+    for entity in ("a", "b", "c"):
+        cache.put(entity, cache.key(1), {"entity": entity})
+
+    assert cache.get("a", cache.key(1)) is None
+    assert cache.get("c", cache.key(1)) == {"entity": "c"}
+    assert cache.stats()["size"] == 2
+
+
+def test_override_invalidates_only_its_entity_with_bounded_state() -> None:
+    cache = ResolutionCache(max_entries=100)
+    for entity in ("a", "b"):
+        cache.put(entity, cache.key(1), {"entity": entity})
+    stale = cache.key(1)
+
+    cache.invalidate("a")
+    assert cache.get("a", cache.key(1)) is None
+    assert cache.get("b", cache.key(1)) == {"entity": "b"}  # other entities keep their entry
+
+    # a resolve of "a" keyed before the override, stored after it, is dropped
+    cache.put("a", stale, {"entity": "a", "stale": True})
+    assert cache.get("a", cache.key(1)) is None
+    cache.put("b", stale, {"entity": "b"})
+    assert cache.get("b", cache.key(1)) == {"entity": "b"}
+
+    cache.put("a", cache.key(1), {"entity": "a"})
+    assert cache.get("a", cache.key(1)) == {"entity": "a"}
+
+    # many overrides: tracking stays bounded; keys older than what it forgot are not stored
+    for i in range(1000):
+        cache.invalidate(f"entity-{i}")
+    assert cache.stats()["overrides_tracked"] == 100
+    cache.put("c", stale, {"entity": "c"})
+    assert cache.get("c", cache.key(1)) is None
+    assert cache.get("b", cache.key(1)) == {"entity": "b"}
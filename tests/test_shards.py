@@ -0,0 +1,210 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from kernel.core import memory_db, outbox
+from kernel.core.archive import ArchiveJob
+from kernel.core.dirty_entities import dirty_stats, take_dirty
+from kernel.core.error_review import apply_error_penalties, record_error_review
+from kernel.core.ledger import add_claim, add_claims_bulk, resolve_entities, resolve_entity
+from kernel.core.memory_db import on_commit, transaction, use_shard
+from kernel.core.outbox import drain_outbox, drain_outboxes, outbox_stats
+from kernel.core.resolution_cache import RESOLUTION_CACHE
+from kernel.core.sweeper import ResolutionSweeper
+from kernel.core.trust import get_trust
+from kernel.core.trust_cache import TRUST_CACHE
+from kernel.core.writer import WRITER, run_on_shard, shard_writer, stop_writers
+
+SHARDS = 4
+
+
+@pytest.fixture
+def sharded_db(tmp_db, monkeypatch):
+    memory_db.close_connections()
+    monkeypatch.setattr(memory_db, "SHARD_COUNT", SHARDS)
+    memory_db.init_db()
+    yield
+    stop_writers()
+    memory_db.close_connections()
+
+
+def _count(path, table: str) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _strip(record):
+    return {k: v for k, v in record.items() if k != "timestamp"}
+
+
+def test_claims_land_in_their_shard_and_trust_stays_global(sharded_db) -> None:
+    entities = [f"e{i}" for i in range(40)]
+    add_claims_bulk(
+        {"agent": f"agent-{i % 3}", "entity": e, "value": "v", "confidence": 0.9}
+        for i, e in enumerate(entities)
+    )
+    add_claim("agent-0", "e0", "w", 0.2)
+
+    expected = {s: 0 for s in memory_db.shards()}
+    for e in entities:
+        expected[memory_db.shard_of(e)] += 1
+    expected[memory_db.shard_of("e0")] += 1
+
+    assert all(expected.values())
+    for shard, n in expected.items():
+        assert _count(memory_db.shard_path(shard), "claims") == n
+    assert _count(memory_db.DB_PATH, "claims") == 0
+
+    resolve_entities(entities)
+    TRUST_CACHE.flush()
+
+    assert _count(memory_db.DB_PATH, "trust_events") == 41
+    assert _count(memory_db.DB_PATH, "trust") == 3
+    assert all(_count(memory_db.shard_path(s), "trust_events") == 0 for s in memory_db.shards())
+    assert get_trust("agent-0") > 0.1
+
+
+def test_batch_resolution_matches_single_resolution_across_shards(sharded_db) -> None:
+    entities = [f"e{i}" for i in range(12)]
+    add_claims_bulk(
+        {"agent": f"agent-{i % 4}", "entity": entities[i % 12], "value": f"v{i % 3}", "confidence": 0.5 + (i % 5) / 10}
+        for i in range(120)
+    )
+
+    batch = resolve_entities(list(reversed(entities)))
+    assert list(batch) == list(reversed(entities))
+
+    RESOLUTION_CACHE.clear()
+    for entity in entities:
+        assert _strip(resolve_entity(entity)) == _strip(batch[entity])
+
+
+def test_dirty_marks_fan_out_and_sweep_per_shard(sharded_db) -> None:
+    add_claims_bulk(
+        {"agent": "a", "entity": f"e{i}", "value": "v", "confidence": 0.9}
+        for i in range(20)
+    )
+    assert dirty_stats()["dirty"] == 20
+    assert sorted(take_dirty(100)) == sorted(f"e{i}" for i in range(20))
+    assert len(take_dirty(5)) == 5
+
+    calls = []
+
+    def runner(shard, fn, *args):
+        calls.append(shard)
+        return run_on_shard(shard, fn, *args)
+
+    assert ResolutionSweeper(batch_size=100, runner=runner).sweep() == 20
+    assert dirty_stats()["dirty"] == 0
+    assert sorted(calls) == memory_db.shards()
+
+
+def test_error_reviews_are_sharded_and_penalties_global(sharded_db) -> None:
+    for reviewer in ("r1", "r2"):
+        record_error_review(reviewer, "junior", "DB_PORT", "3306", "5432", "WRONG_VALUE", 0.9)
+    apply_error_penalties("DB_PORT")
+
+    shard = memory_db.shard_path(memory_db.shard_of("DB_PORT"))
+    assert _count(shard, "error_reviews") == 2
+    assert _count(memory_db.DB_PATH, "error_reviews") == 0
+    assert _count(memory_db.DB_PATH, "error_penalty_events") == 1
+    assert get_trust("junior") < 0.1
+
+
+def test_archive_job_covers_every_shard(sharded_db) -> None:
+    for i in range(16):
+        add_claim("a", f"e{i}", "v", 0.5)
+
+    progress = ArchiveJob(retention_days=0, batch_size=3, runner=run_on_shard).run()
+
+    assert progress["moved"] == 16
+    assert sum(_count(memory_db.shard_path(s), "claims_archive") for s in memory_db.shards()) == 16
+
+
+def test_api_splits_batches_across_shard_writers(sharded_db) -> None:
+    client = TestClient(app)
+    claims = [{"agent": "a", "entity": f"e{i}", "value": "v", "confidence": 0.9} for i in range(10)]
+    claims.insert(3, {"agent": "a", "entity": "e0", "value": "v"})
+
+    data = client.post("/claims/batch", json={"claims": claims}, headers={"X-Intent": "WRITE"}).json()["data"]
+    assert data["inserted"] == 10 and data["failed"] == 1
+    assert [item["index"] for item in data["items"]] == list(range(11))
+    assert "error" in data["items"][3]
+
+    entities = [f"e{i}" for i in reversed(range(10))]
+    resolved = client.post("/resolve/batch", json={"entities": entities}, headers={"X-Intent": "READ"}).json()["data"]
+    assert list(resolved) == entities
+    assert all(r["value"] == "v" for r in resolved.values())
+
+
+def test_failed_shard_job_credits_no_trust(sharded_db) -> None:
+    add_claim("good", "e1", "v", 0.9)
+    add_claim("bad", "e2", "v", 0.9)
+    assert memory_db.shard_of("e1") != memory_db.shard_of("e2")
+    before = get_trust("bad")
+
+    def resolve_then_fail(entity: str) -> None:
+        resolve_entity(entity)
+        raise RuntimeError("later write of the job failed")
+
+    # e2's job rolls back on its shard writer, its trust credit with it
+    with pytest.raises(RuntimeError):
+        shard_writer(memory_db.shard_of("e2")).run(resolve_then_fail, "e2")
+    run_on_shard(memory_db.shard_of("e1"), resolve_entity, "e1")
+    WRITER.run(drain_outboxes)  # credits are applied by the global writer
+
+    assert get_trust("bad") == before and get_trust("good") > before
+    assert _count(memory_db.DB_PATH, "trust_events") == 1
+    assert _count(memory_db.shard_path(memory_db.shard_of("e2")), "resolutions") == 0
+
+    # nothing was credited, so the next resolve still credits the claim
+    RESOLUTION_CACHE.clear()
+    resolve_entity("e2")
+    assert get_trust("bad") > before
+
+
+def test_failing_post_commit_hook_never_fails_committed_jobs(sharded_db) -> None:
+    shard = memory_db.shard_of("e1")
+
+    def job() -> str:
+        add_claim("a", "e1", "v", 0.9)
+        on_commit(lambda: 1 / 0)
+        return "done"
+
+    writer = shard_writer(shard)
+    assert writer.run(job) == "done"
+    assert _count(memory_db.shard_path(shard), "claims") == 1
+    assert writer.stats()["hook_errors"] == 1
+
+
+def test_outbox_keeps_credit_until_applied_exactly_once(sharded_db, monkeypatch) -> None:
+    add_claim("a", "e1", "v", 0.9)
+    shard = memory_db.shard_of("e1")
+    before = get_trust("a")
+
+    # the global apply fails after the shard committed: the row stays queued
+    apply = outbox.HANDLERS["trust_deltas"]
+    monkeypatch.setitem(outbox.HANDLERS, "trust_deltas", lambda payload: 1 / 0)
+    run_on_shard(shard, resolve_entity, "e1")
+    WRITER.run(lambda: None)
+    assert get_trust("a") == before
+    assert outbox_stats()["shards"][shard] == 1
+
+    monkeypatch.setitem(outbox.HANDLERS, "trust_deltas", apply)
+    assert WRITER.run(drain_outboxes) == 1
+    assert drain_outbox(shard) == 0
+    assert get_trust("a") > before
+    assert _count(memory_db.DB_PATH, "trust_events") == 1
+    assert outbox_stats()["backlog"] == 0
+
+    # a rolled-back shard transaction queues nothing
+    with pytest.raises(RuntimeError):
+        with use_shard(shard), transaction():
+            outbox.on_shard_commit("trust_deltas", {"updates": [{"agent": "a", "correct": True}]})
+            raise RuntimeError("rolled back")
+    assert drain_outboxes() == 0
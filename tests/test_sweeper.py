@@ -0,0 +1,88 @@
+from kernel.core.dirty_entities import dirty_stats, get_clean_resolution
+from kernel.core.governance import clear_override, set_override
+from kernel.core.ledger import add_claim, add_claims_bulk, resolve_entities, score_entities
+from kernel.core.memory_db import connection
+from kernel.core.sweeper import ResolutionSweeper
+from kernel.core.value_scores import rebuild_value_scores
+
+
+def _strip(record):
+    return {k: v for k, v in record.items() if k != "timestamp"}
+
+
+def test_sweeper_resolves_dirty_entities(tmp_db) -> None:
+    add_claims_bulk(
+        {"agent": f"agent-{i % 3}", "entity": f"e{i % 10}", "value": "v", "confidence": 0.9}
+        for i in range(50)
+    )
+    assert dirty_stats()["dirty"] == 10
+    assert get_clean_resolution("e0") is None
+
+    sweeper = ResolutionSweeper(batch_size=4)
+    assert sweeper.sweep() == 10
+    assert dirty_stats() == {"dirty": 0, "lag_seconds": 0.0}
+    assert sweeper.stats()["entities_resolved"] == 10
+
+    served = get_clean_resolution("e0")
+    assert served["status"] == "resolved"
+    assert served["value"] == "v"
+
+    # new claim or override change → stale again until the next sweep
+    add_claim("agent-0", "e0", "w", 0.9)
+    assert get_clean_resolution("e0") is None
+    sweeper.sweep()
+    assert get_clean_resolution("e0")["reason"] == "Trust-weighted consensus"
+
+    set_override("e1", "pinned")
+    assert get_clean_resolution("e1") is None
+    sweeper.sweep()
+    assert get_clean_resolution("e1")["status"] == "human_override"
+    clear_override("e1")
+    sweeper.sweep()
+    assert get_clean_resolution("e1")["value"] == "v"
+
+
+def test_process_pool_sweep(tmp_db) -> None:
+    add_claims_bulk(
+        {"agent": "agent", "entity": f"e{i}", "value": "v", "confidence": 0.5}
+        for i in range(20)
+    )
+
+    sweeper = ResolutionSweeper(workers=2)
+    try:
+        assert sweeper.sweep() == 20
+    finally:
+        sweeper.stop()
+
+    assert dirty_stats()["dirty"] == 0
+    assert get_clean_resolution("e7")["reason"] == "Single claim"
+
+
+def test_stale_precomputed_scores_are_recomputed(tmp_db) -> None:
+    add_claim("a", "E", "x", 0.9)
+    scored = score_entities(["E"])
+
+    add_claim("b", "E", "y", 0.9)  # moves the high-water mark
+    result = resolve_entities(["E"], scored)["E"]
+
+    assert result["status"] == "contested"
+    assert dirty_stats()["dirty"] == 0
+    assert _strip(get_clean_resolution("E")) == _strip(result)
+
+
+def test_value_score_rebuild_makes_stored_resolutions_stale(tmp_db) -> None:
+    add_claim("a", "E", "x", 0.9)
+    add_claim("b", "E", "y", 0.2)
+    sweeper = ResolutionSweeper()
+    sweeper.sweep()
+    assert get_clean_resolution("E")["value"] == "x"
+
+    # claim-trust snapshots corrected, then scores rebuilt: no new claim
+    with connection() as conn:
+        conn.execute("UPDATE claims SET trust = 0.001 WHERE agent = 'a'")
+        conn.commit()
+    rebuild_value_scores()
+
+    assert get_clean_resolution("E") is None
+    sweeper.sweep()
+    assert get_clean_resolution("E")["value"] == "y"
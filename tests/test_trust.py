@@ -0,0 +1,152 @@
+import random
+
+from kernel.core import memory_db, trust
+from kernel.core.memory_db import connection, db_get_all_trust, db_get_trust
+from kernel.core.trust import (
+    apply_trust_deltas,
+    decay_all_agents,
+    get_all_trust,
+    get_trust,
+    get_trust_many,
+    reward_agent,
+    update_trust,
+)
+from kernel.core.trust_cache import FLUSH_INTERVAL_SECONDS, FLUSH_THRESHOLD, TRUST_CACHE
+
+
+def _trust_events():
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT agent, change, reason, confidence FROM trust_events ORDER BY id"
+        ).fetchall()
+    return [tuple(r) for r in rows]
+
+
+def test_apply_trust_deltas_matches_per_claim_updates(tmp_db, tmp_path, monkeypatch) -> None:
+    rng = random.Random(7)
+    updates = [
+        {
+            "agent": f"agent-{rng.randrange(5)}",
+            "correct": rng.random() < 0.6,
+            "confidence": rng.choice([None, 0.0, 0.3, 0.9, 1.0, 1.7]),
+        }
+        for _ in range(300)
+    ]
+
+    for u in updates:
+        update_trust(u["agent"], u["correct"], u["confidence"])
+    expected_trust = get_all_trust()
+    expected_events = _trust_events()
+
+    memory_db.close_connections()
+    monkeypatch.setattr(memory_db, "DB_PATH", tmp_path / "batched.db")
+    memory_db.init_db()
+
+    result = apply_trust_deltas(updates)
+
+    assert result == expected_trust
+    assert get_all_trust() == expected_trust
+    assert _trust_events() == expected_events
+
+
+def test_trust_cache_is_write_behind_and_flushes(tmp_db) -> None:
+    TRUST_CACHE.flush_threshold = 1000
+    TRUST_CACHE.flush_interval = 3600.0
+    try:
+        reward_agent("senior", 1.0)
+        assert get_trust("senior") == 0.15
+        assert db_get_trust("senior") is None  # not flushed yet
+
+        before = TRUST_CACHE.stats()
+        get_trust("senior")
+        assert TRUST_CACHE.stats()["hits"] == before["hits"] + 1
+        assert TRUST_CACHE.stats()["dirty"] == 1
+
+        assert TRUST_CACHE.flush() == 1
+        assert db_get_trust("senior") == 0.15
+        assert TRUST_CACHE.stats()["dirty"] == 0
+    finally:
+        TRUST_CACHE.flush_threshold = FLUSH_THRESHOLD
+        TRUST_CACHE.flush_interval = FLUSH_INTERVAL_SECONDS
+
+
+def test_trust_cache_flushes_on_count_threshold(tmp_db) -> None:
+    TRUST_CACHE.flush_threshold = 2
+    TRUST_CACHE.flush_interval = 3600.0
+    try:
+        reward_agent("a", 1.0)
+        assert db_get_trust("a") is None
+        reward_agent("b", 1.0)
+        assert db_get_all_trust() == {"a": 0.15, "b": 0.15}
+    finally:
+        TRUST_CACHE.flush_threshold = FLUSH_THRESHOLD
+        TRUST_CACHE.flush_interval = FLUSH_INTERVAL_SECONDS
+
+
+def test_trust_cache_evicts_clean_agents_only(tmp_db, monkeypatch) -> None:
+    monkeypatch.setattr(TRUST_CACHE, "max_entries", 3)
+    monkeypatch.setattr(TRUST_CACHE, "flush_threshold", 1000)
+    monkeypatch.setattr(TRUST_CACHE, "flush_interval", 3600.0)
+
+    for agent in ("a", "b", "c", "d"):
+        reward_agent(agent, 1.0)
+    # all dirty: over the cap, nothing evicted (not in SQLite yet)
+    assert TRUST_CACHE.stats()["size"] == 4 and db_get_trust("a") is None
+
+    TRUST_CACHE.flush()
+    evicted = TRUST_CACHE.stats()["evictions"]
+    get_trust("a")                 # a is now the most recently used
+    get_trust_many(["x", "y"])     # misses → evict b, c, d (least recent, clean)
+    stats = TRUST_CACHE.stats()
+    assert stats["size"] == 3 and stats["evictions"] == evicted + 3
+
+    before = TRUST_CACHE.stats()
+    assert get_trust("a") == 0.15 and get_trust("b") == 0.15
+    assert TRUST_CACHE.stats()["hits"] == before["hits"] + 1  # b was reloaded
+
+
+def _age(agent: str, seconds: float) -> None:
+    TRUST_CACHE.clear()
+    with connection() as conn:
+        conn.execute("UPDATE trust SET last_updated = last_updated - ? WHERE agent = ?", (seconds, agent))
+        conn.commit()
+
+
+def test_trust_decays_lazily_toward_default(tmp_db, monkeypatch) -> None:
+    monkeypatch.setattr(trust, "TRUST_DECAY_HALF_LIFE_SECONDS", 1000.0)
+    for _ in range(8):
+        reward_agent("senior", 1.0)      # 0.5
+    for _ in range(3):
+        update_trust("junior", False, 1.0)  # floor 0.05
+    TRUST_CACHE.flush()
+    _age("senior", 1000.0)
+    _age("junior", 2000.0)
+
+    # one half-life: half the distance to DEFAULT_TRUST (0.1) is gone
+    assert get_trust("senior") == 0.3
+    assert get_trust("junior") == 0.0875
+    assert get_all_trust() == {"senior": 0.3, "junior": 0.0875}
+    assert db_get_all_trust() == {"senior": 0.5, "junior": 0.05}  # nothing written by reads
+
+    # a write materializes: the step applies to the decayed value
+    reward_agent("senior", 1.0)
+    assert get_trust("senior") == 0.35
+    TRUST_CACHE.flush()
+    assert db_get_trust("senior") == 0.35
+
+
+def test_decay_compaction_is_one_update_and_invisible_to_reads(tmp_db, monkeypatch) -> None:
+    assert decay_all_agents() == 0  # decay off: nothing to do
+
+    monkeypatch.setattr(trust, "TRUST_DECAY_HALF_LIFE_SECONDS", 1000.0)
+    for agent in ("a", "b", "c"):
+        reward_agent(agent, 1.0)
+    update_trust("b", False, 1.0)  # back to DEFAULT_TRUST: never decays
+    TRUST_CACHE.flush()
+    for agent in ("a", "b", "c"):
+        _age(agent, 2000.0)
+
+    before = get_all_trust()
+    assert decay_all_agents() == 2
+    assert db_get_all_trust() == before == {"a": 0.1125, "b": 0.1, "c": 0.1125}
+    assert get_all_trust() == before
@@ -0,0 +1,209 @@
+import random
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from kernel.core.memory_db import connection
+from kernel.core import trust as trust_module
+from kernel.core.trust import get_all_trust, get_trust, penalize_agent, reward_agent
+from kernel.core.trust_cache import TRUST_CACHE
+from kernel.core.trust_leaderboard import get_trust_leaderboard, get_trust_summary
+
+
+def _seed(n: int = 1000) -> dict:
+    """
+    n agents on 4-decimal trust values with plenty of ties.
+    """
+    rng = random.Random(8)
+    trust = {f"agent-{i:04d}": round(rng.choice([0.05, 0.1, 0.15, 0.5, 1.0, rng.uniform(0.05, 1.0)]), 4)
+             for i in range(n)}
+    with connection() as conn:
+        conn.executemany("INSERT INTO trust (agent, trust, last_updated) VALUES (?, ?, 0)", trust.items())
+        conn.commit()
+    return trust
+
+
+def _pages(**kwargs) -> list:
+    items, cursor = [], None
+    while True:
+        page = get_trust_leaderboard(cursor=cursor, **kwargs)
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def test_keyset_pages_cover_the_ranking_exactly(tmp_db) -> None:
+    trust = _seed()
+    ranked = sorted(trust.items(), key=lambda kv: (kv[1], kv[0]), reverse=True)
+
+    top = get_trust_leaderboard(limit=10)
+    assert [(i["agent"], i["trust"]) for i in top["items"]] == ranked[:10]
+    assert [i["rank"] for i in top["items"]] == list(range(1, 11))
+
+    bottom = get_trust_leaderboard(limit=5, order="asc")
+    assert [(i["agent"], i["trust"]) for i in bottom["items"]] == ranked[::-1][:5]
+
+    items = _pages(limit=37)
+    assert [(i["agent"], i["trust"]) for i in items] == ranked
+    assert [i["rank"] for i in items] == list(range(1, len(ranked) + 1))
+
+    inside = [kv for kv in ranked[::-1] if 0.1 <= kv[1] <= 0.5]
+    items = _pages(limit=50, order="asc", min_trust=0.1, max_trust=0.5)
+    assert [(i["agent"], i["trust"]) for i in items] == inside
+
+    with pytest.raises(ValueError):
+        get_trust_leaderboard(order="sideways")
+    with pytest.raises(ValueError):
+        get_trust_leaderboard(limit=0)
+    with pytest.raises(ValueError):
+        get_trust_leaderboard(cursor="not-a-cursor")
+
+
+def _stored(agent: str):
+    with connection() as conn:
+        row = conn.execute("SELECT trust FROM trust WHERE agent = ?", (agent,)).fetchone()
+    return None if row is None else row[0]
+
+
+def test_reads_overlay_write_behind_trust_without_flushing(tmp_db, monkeypatch) -> None:
+    monkeypatch.setattr(TRUST_CACHE, "flush_interval", 3600.0)
+    trust = _seed(20)
+    # a new agent (no row yet) and a stale stored row, both waiting in the cache
+    reward_agent("newcomer", 0.6)
+    penalize_agent("agent-0003", 1.0)
+    assert _stored("newcomer") is None and _stored("agent-0003") == trust["agent-0003"]
+
+    current = {a: get_trust(a) for a in [*trust, "newcomer"]}
+    ranked = sorted(((v, a) for a, v in current.items()), reverse=True)
+
+    assert [(i["trust"], i["agent"]) for i in _pages(limit=3)] == ranked
+    cap = current["agent-0003"]
+    assert [(i["trust"], i["agent"]) for i in _pages(limit=3, order="asc", max_trust=cap)] == [
+        kv for kv in ranked[::-1] if kv[0] <= cap
+    ]
+
+    summary = get_trust_summary(buckets=19)
+    assert summary["agents"] == 21
+    assert summary["avg"] == round(sum(current.values()) / 21, 4)
+    assert (summary["min"], summary["max"]) == (min(current.values()), max(current.values()))
+    assert sum(b["agents"] for b in summary["histogram"]) == 21
+
+    # reads never wrote: the trust table still has the stale rows
+    assert _stored("newcomer") is None and _stored("agent-0003") == trust["agent-0003"]
+
+
+def test_decay_ranks_on_the_reported_trust(tmp_db, monkeypatch) -> None:
+    monkeypatch.setattr(trust_module, "TRUST_DECAY_HALF_LIFE_SECONDS", 1000.0)
+    now = time.time()
+    with connection() as conn:
+        # stale high trust decays below fresh mid trust
+        conn.executemany(
+            "INSERT INTO trust (agent, trust, last_updated) VALUES (?, ?, ?)",
+            [("stale", 0.9, now - 10_000), ("fresh", 0.6, now), ("mid", 0.4, now - 500)],
+        )
+        conn.commit()
+
+    items = _pages(limit=1)
+    assert [i["agent"] for i in items] == ["fresh", "mid", "stale"]
+    assert [i["trust"] for i in items] == sorted((i["trust"] for i in items), reverse=True)
+    assert [i["agent"] for i in _pages(limit=2, min_trust=0.5)] == ["fresh"]
+
+
+def test_decayed_pages_and_summary_match_get_trust(tmp_db, monkeypatch) -> None:
+    monkeypatch.setattr(TRUST_CACHE, "flush_interval", 3600.0)
+    monkeypatch.setattr(trust_module, "TRUST_DECAY_HALF_LIFE_SECONDS", 1000.0)
+    rng = random.Random(3)
+    now = time.time()
+    agents = [f"agent-{i:03d}" for i in range(300)]
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO trust (agent, trust, last_updated) VALUES (?, ?, ?)",
+            [(a, round(rng.uniform(0.05, 1.0), 4), now - rng.choice([0, 300, 1000, 4000])) for a in agents],
+        )
+        conn.commit()
+    # one clock: decayed values must not cross a rounding step between reads
+    monkeypatch.setattr(time, "time", lambda: now)
+    reward_agent("newcomer", 0.6)     # pending, no row yet
+    penalize_agent("agent-007", 1.0)  # pending, stale row
+
+    current = {a: get_trust(a) for a in [*agents, "newcomer"]}
+    ranked = sorted(current.values(), reverse=True)
+
+    items = _pages(limit=17)
+    assert [i["trust"] for i in items] == ranked
+    assert sorted(i["agent"] for i in items) == sorted(current)
+    assert [i["rank"] for i in items] == list(range(1, 302))
+
+    inside = [v for v in ranked[::-1] if 0.2 <= v <= 0.4]
+    assert [i["trust"] for i in _pages(limit=9, order="asc", min_trust=0.2, max_trust=0.4)] == inside
+
+    summary = get_trust_summary(buckets=10)
+    assert summary["agents"] == 301
+    assert summary["avg"] == round(sum(ranked) / 301, 4)
+    assert (summary["min"], summary["max"]) == (ranked[-1], ranked[0])
+    assert sum(b["agents"] for b in summary["histogram"]) == 301
+    assert _stored("newcomer") is None  # reads never flushed
+
+    # pages are index range scans on the decay key, not full scans
+    column = "cre_decay_key(trust, last_updated, 0.1, 1000.0)"
+    with connection() as conn:
+        plan = conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT agent FROM trust WHERE {column} >= ? ORDER BY {column} DESC, agent DESC",
+            (0.0,),
+        ).fetchall()
+    assert "idx_trust_decay_key" in plan[0]["detail"]
+
+    # another half-life: the index is rebuilt for it
+    monkeypatch.setattr(trust_module, "TRUST_DECAY_HALF_LIFE_SECONDS", 50.0)
+    assert get_trust_leaderboard(limit=1)["items"][0]["trust"] == max(get_trust(a) for a in current)
+    with connection() as conn:
+        ddl = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_trust_decay_key'").fetchone()[0]
+    assert "50.0" in ddl
+
+
+def test_summary_histogram_matches_the_trust_map(tmp_db) -> None:
+    trust = _seed()
+    with connection() as conn:
+        conn.execute("INSERT INTO trust (agent, trust, last_updated) VALUES ('legacy', 0.01, 0)")
+        conn.commit()
+    values = list(get_all_trust().values())
+
+    summary = get_trust_summary(buckets=19)
+    assert summary["agents"] == len(values) == len(trust) + 1
+    assert summary["avg"] == round(sum(values) / len(values), 4)
+    assert (summary["min"], summary["max"]) == (0.01, 1.0)
+
+    width = 0.95 / 19
+    expected = [0] * 19
+    for v in values:
+        if 0.05 <= v <= 1.0:
+            expected[min(int(round((v - 0.05) / width, 9)), 18)] += 1
+    assert [b["agents"] for b in summary["histogram"]] == expected
+    # boundary values (0.1, 0.15, 0.5 are bucket edges) count upward
+    assert summary["histogram"][1]["from"] == 0.1 and summary["histogram"][1]["agents"] >= values.count(0.1)
+
+    with pytest.raises(ValueError):
+        get_trust_summary(buckets=0)
+
+
+def test_api_leaderboard_and_summary(tmp_db) -> None:
+    trust = _seed(100)
+    client = TestClient(app)
+    read = {"X-Intent": "READ"}
+
+    page = client.get("/trust/leaderboard", params={"limit": 60}, headers=read).json()["data"]
+    rest = client.get(
+        "/trust/leaderboard", params={"limit": 60, "cursor": page["next_cursor"]}, headers=read
+    ).json()["data"]
+    assert rest["next_cursor"] is None
+    assert len(page["items"]) + len(rest["items"]) == len(trust)
+    assert rest["items"][0]["rank"] == 61
+
+    summary = client.get("/trust/summary", params={"buckets": 10}, headers=read).json()["data"]
+    assert summary["agents"] == len(trust) and len(summary["histogram"]) == 10
+
+    assert client.get("/trust/leaderboard", params={"cursor": "x"}, headers=read).status_code == 400
+    assert client.get("/trust/summary", params={"buckets": 0}, headers=read).status_code == 400
@@ -0,0 +1,179 @@
+import random
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from kernel.core import trust_timeline
+from kernel.core.memory_db import connection
+from kernel.core.trust import apply_trust_deltas, get_trust, penalize_agent, reward_agent
+from kernel.core.trust_cache import TRUST_CACHE
+from kernel.core.trust_timeline import _downsample, get_trust_grid, get_trust_timeline, rebuild_trust_checkpoints
+
+HOUR = trust_timeline.CHECKPOINT_SECONDS
+
+
+def _checkpoints() -> list:
+    with connection() as conn:
+        return [tuple(r) for r in conn.execute("SELECT * FROM trust_checkpoints ORDER BY agent, period_start")]
+
+
+def _seed_year(n: int = 20_000, seed: int = 4, agent: str = "senior", start: float = 0.0) -> list:
+    """
+    A random walk of n events over a year, written straight to trust_events.
+    """
+    rng = random.Random(seed)
+    trust, rows = 0.5, []
+    for ts in sorted(rng.uniform(start, 365 * 86_400) for _ in range(n)):
+        change = round(rng.choice([0.01, -0.01]), 4)
+        trust = round(min(max(trust + change, 0.05), 1.0), 4)
+        rows.append((agent, change, "r", 1.0, ts, trust))
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO trust_events (agent, change, reason, confidence, timestamp, trust_after) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+    rebuild_trust_checkpoints()
+    return [(r[4], r[5]) for r in rows]
+
+
+def test_events_store_trust_after_and_checkpoints(tmp_db) -> None:
+    reward_agent("senior", 0.8)
+    penalize_agent("senior", 0.2)
+    apply_trust_deltas(
+        [{"agent": "senior", "correct": i % 3 != 0, "confidence": 0.5} for i in range(10)]
+        + [{"agent": "junior", "correct": False}]
+    )
+
+    timeline = get_trust_timeline("senior")
+    assert len(timeline) == 12
+    assert timeline[-1]["trust"] == get_trust("senior")
+
+    # what the old endpoint reconstructed: current trust minus later changes
+    with connection() as conn:
+        changes = [r[0] for r in conn.execute(
+            "SELECT change FROM trust_events WHERE agent = 'senior' ORDER BY timestamp, id"
+        )]
+    expected, current = [], get_trust("senior") - sum(changes)
+    for change in changes:
+        current += change
+        expected.append(round(current, 4))
+    assert [p["trust"] for p in timeline] == expected
+
+    live = _checkpoints()
+    assert [(c[0], c[2]) for c in live] == [("junior", 1), ("senior", 12)]
+    rebuild_trust_checkpoints()
+    assert _checkpoints() == live
+
+
+def test_downsampled_timeline_is_bounded_and_exact_on_period_buckets(tmp_db) -> None:
+    raw = _seed_year()
+
+    full = get_trust_timeline("senior", max_points=0)
+    assert [(p["timestamp"], p["trust"]) for p in full] == raw
+
+    # 100 buckets of 73 periods each: every checkpoint lies in one bucket
+    end = 100 * 73 * HOUR
+    points = get_trust_timeline("senior", 0.0, end, max_points=200)
+    assert len(points) <= 200
+    assert [(p["timestamp"], p["trust"]) for p in points] == _downsample(
+        [p for p in raw if p[0] <= end], 0.0, 73 * HOUR, 100
+    )
+
+    # unaligned range: bounded, ordered, inside the range, extremes kept
+    start, end = 1234.5, 200 * 86_400 + 17.0
+    inside = [t for ts, t in raw if start <= ts <= end]
+    points = get_trust_timeline("senior", start, end, max_points=50)
+    stamps = [p["timestamp"] for p in points]
+    assert len(points) <= 50 and stamps == sorted(stamps)
+    assert start <= stamps[0] and stamps[-1] <= end
+    assert {min(inside), max(inside)} <= {p["trust"] for p in points}
+
+    # short range: raw events when they fit
+    few = get_trust_timeline("senior", raw[10][0], raw[19][0], max_points=50)
+    assert [(p["timestamp"], p["trust"]) for p in few] == raw[10:20]
+
+
+def test_api_timeline_range_and_max_points(tmp_db) -> None:
+    raw = _seed_year(2000)
+    TRUST_CACHE.clear()
+    client = TestClient(app)
+    read = {"X-Intent": "READ"}
+
+    data = client.get("/trust/timeline", params={"agent": "senior", "max_points": 40}, headers=read).json()["data"]
+    assert 0 < len(data) <= 40
+
+    start, end = raw[100][0], raw[199][0]
+    data = client.get(
+        "/trust/timeline",
+        params={"agent": "senior", "from": start, "to": end, "max_points": 0},
+        headers=read,
+    ).json()["data"]
+    assert [(p["timestamp"], p["trust"]) for p in data] == raw[100:200]
+    assert client.get("/trust/timeline", params={"agent": "nobody"}, headers=read).json()["data"] == []
+
+    # max_points is a cap: 2 is the smallest (one bucket's min and max), 1 is rejected
+    assert 0 < len(get_trust_timeline("senior", max_points=2)) <= 2
+    assert len(get_trust_timeline("senior", max_points=3)) <= 3
+    with pytest.raises(ValueError):
+        get_trust_timeline("senior", max_points=1)
+    assert client.get("/trust/timeline", params={"agent": "senior", "max_points": 1}, headers=read).status_code == 400
+
+
+def _closes(raw: list, labels: list, width: float) -> list:
+    # reference: trust after the last event before each bucket ends
+    closes, i, current = [], 0, None
+    for label in labels:
+        while i < len(raw) and raw[i][0] < label + width:
+            current = raw[i][1]
+            i += 1
+        closes.append(current)
+    return closes
+
+
+def test_grid_forward_fills_every_agent_on_shared_buckets(tmp_db) -> None:
+    raws = {
+        "senior": _seed_year(3000, seed=5),
+        "junior": _seed_year(500, seed=6, agent="junior", start=100 * 86_400),
+    }
+
+    # unaligned bucket: raw events; junior is None before its first event
+    width = 86_400 / 7
+    start, end = 50 * 86_400 + 11.0, 300 * 86_400 + 5.0
+    grid = get_trust_grid(["senior", "junior", "nobody"], width, start, end)
+    labels = grid["timestamps"]
+    assert labels[0] <= start < labels[0] + width and labels[-1] <= end < labels[-1] + width
+    for agent, raw in raws.items():
+        assert grid["series"][agent] == _closes(raw, labels, width)
+    assert grid["series"]["junior"][0] is None
+    assert grid["series"]["nobody"] == [None] * len(labels)
+
+    # whole checkpoint periods: read from the checkpoints, same closes
+    whole = get_trust_grid(["junior", "senior"], 6 * HOUR)
+    assert list(whole["series"]) == ["junior", "senior"]
+    for agent, raw in raws.items():
+        assert whole["series"][agent] == _closes(raw, whole["timestamps"], 6 * HOUR)
+    assert whole["series"]["senior"][-1] == raws["senior"][-1][1]
+
+    with pytest.raises(ValueError):
+        get_trust_grid(["senior"], 0)
+    with pytest.raises(ValueError):
+        get_trust_grid(["senior"], 1.0)  # a year of one-second buckets
+
+
+def test_api_timeline_batch(tmp_db) -> None:
+    raw = _seed_year(1000)
+    client = TestClient(app)
+    read = {"X-Intent": "READ"}
+
+    body = {"agents": ["senior"], "bucket_seconds": 86_400, "from": 0.0, "to": 10 * 86_400 - 1}
+    data = client.post("/trust/timeline/batch", json=body, headers=read).json()["data"]
+    assert data["timestamps"] == [i * 86_400.0 for i in range(10)]
+    assert data["series"]["senior"] == _closes(raw, data["timestamps"], 86_400)
+
+    body["bucket_seconds"] = 0.001
+    assert client.post("/trust/timeline/batch", json=body, headers=read).status_code == 400
+    assert client.post("/trust/timeline/batch", json=body).status_code == 403
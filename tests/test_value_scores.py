@@ -0,0 +1,61 @@
+import random
+
+from kernel.core.consensus import (
+    resolve_consensus,
+    resolve_ranked_consensus,
+    resolve_scored_consensus,
+)
+from kernel.core.ledger import add_claim, add_claims_bulk
+from kernel.core.memory_db import connection
+from kernel.core.value_scores import (
+    get_top_value_scores,
+    get_value_scores,
+    rebuild_value_scores,
+)
+
+
+def _raw_claims(entity: str):
+    with connection() as conn:
+        rows = conn.execute(
+            "SELECT value_hash AS value, confidence, trust FROM claims WHERE entity = ? ORDER BY id",
+            (entity,),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def test_incremental_scores_match_raw_consensus_and_rebuild(tmp_db) -> None:
+    rng = random.Random(11)
+    values = ["a", "b", "c"]
+
+    for _ in range(60):
+        add_claim(f"agent-{rng.randrange(6)}", "E", rng.choice(values), rng.random())
+    add_claims_bulk(
+        {"agent": f"agent-{rng.randrange(6)}", "entity": "E",
+         "value": rng.choice(values), "confidence": rng.random()}
+        for _ in range(60)
+    )
+
+    incremental = get_value_scores("E")
+    raw = _raw_claims("E")
+
+    assert sum(count for _, _, count in incremental) == 120
+    assert resolve_scored_consensus(incremental) == resolve_consensus(raw)
+
+    rebuild_value_scores()
+    assert get_value_scores("E") == incremental
+
+
+def test_sql_top_two_matches_full_ranking(tmp_db) -> None:
+    rng = random.Random(3)
+    entities = [f"e{i}" for i in range(50)]
+
+    # equal confidences → exact ties, broken by first appearance
+    add_claims_bulk(
+        {"agent": "agent", "entity": rng.choice(entities),
+         "value": rng.choice("abcdef"), "confidence": rng.choice([0.5, 1.0])}
+        for _ in range(400)
+    )
+
+    for entity in entities + ["missing"]:
+        assert resolve_ranked_consensus(*get_top_value_scores(entity)) == \
+            resolve_scored_consensus(get_value_scores(entity))
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from kernel.core.ledger import add_claim
+from kernel.core.memory_db import connection
+from kernel.core.trust import get_trust, reward_agent
+from kernel.core.writer import SQLiteWriter
+
+
+@pytest.fixture
+def writer():
+    w = SQLiteWriter(max_batch=32, max_latency=0.05)
+    yield w
+    w.stop()
+
+
+def _claim_count() -> int:
+    with connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM claims").fetchone()[0]
+
+
+def test_concurrent_jobs_are_group_committed(tmp_db, writer) -> None:
+    futures = []
+    lock = threading.Lock()
+
+    def caller(n: int) -> None:
+        for i in range(10):
+            f = writer.submit(add_claim, f"agent-{n}", "entity", str(i), 0.9)
+            with lock:
+                futures.append(f)
+
+    threads = [threading.Thread(target=caller, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    ids = {f.result(timeout=5)["id"] for f in futures}
+
+    assert len(ids) == 80
+    assert _claim_count() == 80
+    assert writer.stats()["batches"] < 80
+
+
+def test_failing_job_does_not_abort_its_batch(tmp_db, writer) -> None:
+    def bad_job() -> None:
+        reward_agent("mallory", 1.0)
+        add_claim("mallory", "entity", "x", 0.9)
+        raise RuntimeError("boom")
+
+    ok = writer.submit(add_claim, "alice", "entity", "v", 0.9)
+    bad = writer.submit(bad_job)
+    ok_too = writer.submit(add_claim, "bob", "entity", "v", 0.9)
+
+    assert ok.result(timeout=5)["agent"] == "alice"
+    assert ok_too.result(timeout=5)["agent"] == "bob"
+    with pytest.raises(RuntimeError):
+        bad.result(timeout=5)
+
+    assert _claim_count() == 2
+    # trust-cache write of the failed job was undone with its savepoint
+    assert get_trust("mallory") == 0.1